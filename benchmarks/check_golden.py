@@ -0,0 +1,348 @@
+"""生成シーンが基準出力 (golden) から変わっていないかを確かめる回帰チェック。
+
+使い方:
+    python benchmarks/check_golden.py            # 基準出力と比較
+    python benchmarks/check_golden.py --update   # 基準出力を作り直す
+    python benchmarks/check_golden.py --only dot-ja-short mesh-ja-short
+
+固定の入力 (corpus.py) からシーンを生成して書き出し、読み直したオブジェクト木を
+benchmarks/golden/ の基準と数値の許容誤差つきで比べる。あわせて書き出した bytes の
+SHA-256 も基準と完全一致するかを確かめる。
+
+wildmeshing の三角形分割は同じ入力でも結果が揺れるため、基準を作るときに分割の
+入力と出力を記録し、チェックではそれを再生する。分割の入力は記録と許容誤差つきで
+比べるので、分割より前の処理 (輪郭の平坦化や正規化) の変化も検出できる。分割より
+後の処理 (求解・シーン組み立て・書き出し) はこれで決定的になり、bytes まで比べられる。
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import corpus
+import numpy as np
+import wildmeshing
+from kkloader import HoneycomeSceneData
+
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+MANIFEST_PATH = GOLDEN_DIR / "manifest.json"
+GOLDEN_CASES = (
+    "dot-ja-short",
+    "dot-ja-long",
+    "dot-latin-short",
+    "mesh-ja-short",
+    "mesh-latin-short",
+    "mesh-ja-short-outline",
+    "svg-rects",
+    "svg-use-forward",
+    "svg-rings",
+)
+# シーンごとに作られる乱数の ID を固定し、bytes を比べられるようにする
+GOLDEN_DATA_ID = "00000000-0000-0000-0000-000000000000"
+DEFAULT_RTOL = 1e-6
+DEFAULT_ATOL = 1e-6
+MAX_REPORTED_DIFFS = 10
+
+
+class TriangulationReplay:
+    """wildmeshing.triangulate_data を差し替え、分割結果を記録または再生する。"""
+
+    def __init__(
+        self,
+        original,
+        recorded: list[dict[str, np.ndarray]] | None = None,
+        atol: float = DEFAULT_ATOL,
+    ) -> None:
+        self.original = original
+        self.recorded = recorded
+        self.atol = atol
+        self.calls: list[dict[str, np.ndarray]] = []
+        self.problems: list[str] = []
+
+    def __call__(self, *args: Any, **kwargs: Any):
+        inputs = {
+            "V": np.asarray(kwargs["V"], dtype=np.float64),
+            "E": np.asarray(kwargs["E"], dtype=np.int64),
+            "hole_pts": np.asarray(
+                kwargs.get("hole_pts", np.empty((0, 2))), dtype=np.float64
+            ).reshape(-1, 2),
+        }
+        index = len(self.calls)
+        self.calls.append(inputs)
+        if self.recorded is None:
+            return self.record(inputs, *args, **kwargs)
+
+        if index >= len(self.recorded):
+            self.problems.append(f"triangulation #{index}: 記録より呼び出しが多い")
+            return self.original(*args, **kwargs)
+        expected = self.recorded[index]
+        mismatch = self.compare_inputs(inputs, expected)
+        if mismatch:
+            self.problems.append(f"triangulation #{index}: 入力の {mismatch} が異なる")
+            return self.original(*args, **kwargs)
+        if expected["failed"].item():
+            raise RuntimeError("recorded triangulation failure")
+        return expected["out_V"].copy(), expected["out_F"].copy(), None, None
+
+    def record(self, inputs: dict[str, np.ndarray], *args: Any, **kwargs: Any):
+        entry = {f"in_{name}": value for name, value in inputs.items()}
+        try:
+            result = self.original(*args, **kwargs)
+        except (ValueError, RuntimeError, FloatingPointError):
+            self.calls[-1] = {
+                **entry,
+                "out_V": np.empty((0, 2)),
+                "out_F": np.empty((0, 3), dtype=np.int64),
+                "failed": np.array(True),
+            }
+            raise
+        self.calls[-1] = {
+            **entry,
+            "out_V": np.asarray(result[0], dtype=np.float64),
+            "out_F": np.asarray(result[1], dtype=np.int64),
+            "failed": np.array(False),
+        }
+        return result
+
+    def compare_inputs(
+        self, inputs: dict[str, np.ndarray], expected: dict[str, np.ndarray]
+    ) -> str | None:
+        for name, value in inputs.items():
+            reference = expected[f"in_{name}"]
+            if value.shape != reference.shape:
+                return f"{name} の形 {reference.shape} -> {value.shape}"
+            if name == "E":
+                if not np.array_equal(value, reference):
+                    return name
+            elif not np.allclose(value, reference, rtol=0.0, atol=self.atol):
+                return name
+        return None
+
+    @staticmethod
+    def save(path: Path, calls: list[dict[str, np.ndarray]]) -> None:
+        np.savez_compressed(
+            path,
+            **{
+                f"{index}_{name}": value
+                for index, call in enumerate(calls)
+                for name, value in call.items()
+            },
+        )
+
+    @staticmethod
+    def load(path: Path) -> list[dict[str, np.ndarray]]:
+        calls: dict[int, dict[str, np.ndarray]] = {}
+        with np.load(path) as archive:
+            for key in archive.files:
+                index, name = key.split("_", 1)
+                calls.setdefault(int(index), {})[name] = archive[key]
+        return [calls[index] for index in sorted(calls)]
+
+
+def flatten_value(value: Any, prefix: str, out: dict[str, Any]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            flatten_value(item, f"{prefix}.{key}" if prefix else str(key), out)
+    elif isinstance(value, (list, tuple)):
+        for index, item in enumerate(value):
+            flatten_value(item, f"{prefix}.{index}", out)
+    elif isinstance(value, (bytes, bytearray)):
+        out[prefix] = "sha256:" + hashlib.sha256(value).hexdigest()
+    elif isinstance(value, np.generic):
+        out[prefix] = value.item()
+    else:
+        out[prefix] = value
+
+
+def flatten_scene(scene_bytes: bytes) -> list[dict[str, Any]]:
+    """書き出したシーンを読み直し、オブジェクトごとの平らな辞書の列にする。"""
+    scene = HoneycomeSceneData.load(io.BytesIO(scene_bytes))
+    records = []
+    for _, obj, depth in scene.walk(include_depth=True):
+        record: dict[str, Any] = {"depth": depth, "type": obj["type"]}
+        flatten_value(
+            {key: value for key, value in obj["data"].items() if key != "child"},
+            "",
+            record,
+        )
+        records.append(record)
+    return records
+
+
+def values_match(current: Any, expected: Any, rtol: float, atol: float) -> bool:
+    if isinstance(current, bool) or isinstance(expected, bool):
+        return current == expected
+    if isinstance(current, (int, float)) and isinstance(expected, (int, float)):
+        return abs(current - expected) <= atol + rtol * abs(expected)
+    return current == expected
+
+
+def compare_trees(
+    current: list[dict[str, Any]],
+    expected: list[dict[str, Any]],
+    rtol: float,
+    atol: float,
+) -> list[str]:
+    """オブジェクト木を先頭から順に比べ、許容誤差を超えた差の説明を返す。"""
+    if len(current) != len(expected):
+        return [f"オブジェクト数 {len(expected)} -> {len(current)}"]
+    diffs = []
+    for index, (record, reference) in enumerate(zip(current, expected)):
+        for key in sorted(record.keys() | reference.keys()):
+            if key not in record or key not in reference:
+                diffs.append(f"object #{index}: {key} の有無が異なる")
+            elif not values_match(record[key], reference[key], rtol, atol):
+                diffs.append(
+                    f"object #{index}: {key} {reference[key]!r} -> {record[key]!r}"
+                )
+            if len(diffs) >= MAX_REPORTED_DIFFS:
+                return diffs
+    return diffs
+
+
+def generate_golden_bytes(
+    pages: dict[str, dict[str, Any]], case: str, replay: TriangulationReplay
+) -> bytes:
+    page_name = corpus.case_page_name(case)
+    if page_name not in pages:
+        pages[page_name] = corpus.load_page(page_name)
+    original = wildmeshing.triangulate_data
+    wildmeshing.triangulate_data = replay
+    try:
+        scene, _ = corpus.generate_case_scene(pages[page_name], case)
+    finally:
+        wildmeshing.triangulate_data = original
+    scene.data_id = GOLDEN_DATA_ID
+    return bytes(scene)
+
+
+def update_case(pages: dict[str, dict[str, Any]], case: str) -> dict[str, Any]:
+    replay = TriangulationReplay(wildmeshing.triangulate_data)
+    scene_bytes = generate_golden_bytes(pages, case, replay)
+    tree = flatten_scene(scene_bytes)
+    with gzip.open(GOLDEN_DIR / f"{case}.tree.json.gz", "wt", encoding="utf-8") as f:
+        json.dump(tree, f, ensure_ascii=False, separators=(",", ":"))
+    triangulation_path = GOLDEN_DIR / f"{case}.triangulation.npz"
+    if replay.calls:
+        TriangulationReplay.save(triangulation_path, replay.calls)
+    elif triangulation_path.exists():
+        triangulation_path.unlink()
+    return {
+        "sha256": hashlib.sha256(scene_bytes).hexdigest(),
+        "objects": len(tree),
+        "bytes": len(scene_bytes),
+        "triangulations": len(replay.calls),
+    }
+
+
+def check_case(
+    pages: dict[str, dict[str, Any]],
+    case: str,
+    expected: dict[str, Any],
+    args: argparse.Namespace,
+) -> tuple[list[str], bool]:
+    """1 ケースを比べ、(木の差, bytes が一致したか) を返す。"""
+    triangulation_path = GOLDEN_DIR / f"{case}.triangulation.npz"
+    recorded = (
+        TriangulationReplay.load(triangulation_path)
+        if triangulation_path.exists()
+        else []
+    )
+    replay = TriangulationReplay(wildmeshing.triangulate_data, recorded, args.atol)
+    scene_bytes = generate_golden_bytes(pages, case, replay)
+    problems = list(replay.problems)
+    if len(replay.calls) < len(recorded):
+        problems.append(
+            f"triangulation: 呼び出し回数 {len(recorded)} -> {len(replay.calls)}"
+        )
+    hash_matches = hashlib.sha256(scene_bytes).hexdigest() == expected["sha256"]
+    if not hash_matches:
+        # bytes が一致すれば木も一致するので、読み直しての比較は差があるときだけ行う
+        with gzip.open(
+            GOLDEN_DIR / f"{case}.tree.json.gz", "rt", encoding="utf-8"
+        ) as f:
+            reference_tree = json.load(f)
+        problems += compare_trees(
+            flatten_scene(scene_bytes), reference_tree, args.rtol, args.atol
+        )
+    return problems, hash_matches
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=GOLDEN_CASES)
+    parser.add_argument(
+        "--update", action="store_true", help="比較せず、基準出力を作り直す"
+    )
+    parser.add_argument(
+        "--rtol", type=float, default=DEFAULT_RTOL, help="数値比較の相対許容誤差"
+    )
+    parser.add_argument(
+        "--atol", type=float, default=DEFAULT_ATOL, help="数値比較の絶対許容誤差"
+    )
+    parser.add_argument(
+        "--tolerance-only",
+        action="store_true",
+        help="木が許容誤差内なら、bytes の不一致を失敗にしない",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    cases = args.only or list(GOLDEN_CASES)
+    pages: dict[str, dict[str, Any]] = {}
+
+    if args.update:
+        GOLDEN_DIR.mkdir(exist_ok=True)
+        manifest = (
+            json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+            if MANIFEST_PATH.exists()
+            else {}
+        )
+        for case in cases:
+            manifest[case] = update_case(pages, case)
+            print(f"{case:<24} {manifest[case]['sha256'][:16]} 更新")
+        MANIFEST_PATH.write_text(
+            json.dumps(
+                {case: manifest[case] for case in GOLDEN_CASES if case in manifest},
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        return 0
+
+    manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    failed = False
+    started = time.perf_counter()
+    for case in cases:
+        if case not in manifest:
+            print(f"{case:<24} 基準出力がありません (--update で作成)")
+            failed = True
+            continue
+        case_started = time.perf_counter()
+        problems, hash_matches = check_case(pages, case, manifest[case], args)
+        elapsed = time.perf_counter() - case_started
+        if problems:
+            status = "NG"
+        elif hash_matches:
+            status = "OK"
+        else:
+            status = "OK (許容誤差内)" if args.tolerance_only else "NG (bytes 不一致)"
+        print(f"{case:<24} {status:<18} {elapsed:6.2f}s")
+        for problem in problems:
+            print(f"    {problem}")
+        failed |= status.startswith("NG")
+    print(f"\n合計 {time.perf_counter() - started:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,405 @@
+"""ベンチマークと回帰チェックで共通に使う、固定の入力コーパスと生成ケース。
+
+ページは Streamlit 上で動かさず、runpy で読み込んだ名前空間の関数を直接呼ぶ。
+入力はすべて同梱フォントと乱数シードを固定した合成 SVG から作るため、
+同じ環境なら何度実行しても同じシーンになる。
+"""
+
+import functools
+import inspect
+import io
+import logging
+import math
+import random
+import runpy
+import time
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PAGES_DIR = REPO_ROOT / "pages"
+FONT_DIR = PAGES_DIR / "digital-craft-calligrapher-data"
+
+CALLIGRAPHER_FONTS = {
+    "ja": FONT_DIR / "ZenKakuGothicNew-Regular.ttf",
+    "latin": FONT_DIR / "Oswald-Regular.ttf",
+}
+TEXTS = {
+    "ja-short": ("ja", "永"),
+    "ja-long": ("ja", "文字生成"),
+    "latin-short": ("latin", "B"),
+    "latin-long": ("latin", "Bench"),
+}
+TEXT_HEIGHT = 0.5
+SVG_SIZE = 400
+
+# ケース名 -> (種類, 入力, オプション)。SVG は後ろほど輪郭と曲線が多い
+# (use-forward は <use> の前方参照を確かめるための小さな入力)
+CASES: dict[str, tuple[str, str, dict[str, Any]]] = {
+    **{f"dot-{name}": ("dot", name, {}) for name in TEXTS},
+    **{f"mesh-{name}": ("mesh", name, {}) for name in TEXTS},
+    "mesh-ja-short-outline": ("mesh", "ja-short", {"outline": True}),
+    "svg-rects": ("svg", "rects", {}),
+    "svg-use-forward": ("svg", "use-forward", {}),
+    "svg-circles": ("svg", "circles", {}),
+    "svg-rings": ("svg", "rings", {}),
+    "svg-blobs": ("svg", "blobs", {}),
+}
+
+# ケースごとに呼び出し回数と累積時間を測る、生成の中心になる関数
+HOT_FUNCTIONS = {
+    "calligrapher": (
+        ("DotRenderPipeline", "pixels_to_planes"),
+        ("MeshRenderPipeline", "triangulate_contours"),
+        ("TriangleSolverLMReparam", "solve"),
+    ),
+    "svg": (
+        ("MeshPipeline", "triangulate_contours"),
+        ("TriangleSolverOptimized", "solve"),
+    ),
+}
+
+
+def load_page(name: str) -> dict[str, Any]:
+    """pages/ のページを __main__ 以外の名前で読み込み、その名前空間を返す。"""
+    # キャッシュ関数などがスクリプト実行外で呼ばれたときの警告を抑える
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    return runpy.run_path(str(PAGES_DIR / f"{name}.py"), run_name="kk_benchmark")
+
+
+def svg_document(body: list[str]) -> bytes:
+    header = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_SIZE}" '
+        f'height="{SVG_SIZE}" viewBox="0 0 {SVG_SIZE} {SVG_SIZE}">'
+    )
+    return "\n".join([header, *body, "</svg>"]).encode("utf-8")
+
+
+def random_color(rng: random.Random) -> str:
+    return "#{:02x}{:02x}{:02x}".format(*(rng.randrange(256) for _ in range(3)))
+
+
+def rects_svg() -> bytes:
+    """直線だけの長方形を格子状に並べた、最も軽い SVG。"""
+    rng = random.Random(1)
+    cell = SVG_SIZE / 2
+    size = cell * 0.4
+    return svg_document(
+        [
+            f'<rect x="{(col + 0.3) * cell:.1f}" y="{(row + 0.3) * cell:.1f}" '
+            f'width="{size:.1f}" height="{size:.1f}" '
+            f'fill="{random_color(rng)}"/>'
+            for row in range(2)
+            for col in range(2)
+        ]
+    )
+
+
+def use_forward_svg() -> bytes:
+    """後ろの <defs> で定義した図形を、その前後の <use> から参照する SVG。"""
+    return svg_document(
+        [
+            '<use href="#shape" x="200" fill="#d04040"/>',
+            "<defs>",
+            '<rect id="shape" x="40" y="40" width="120" height="120"/>',
+            '<circle id="dot" cx="100" cy="100" r="40"/>',
+            "</defs>",
+            '<use href="#shape" y="200" fill="#4040d0"/>',
+            '<use xlink:href="#dot" x="200" y="200" fill="#40a040" '
+            'xmlns:xlink="http://www.w3.org/1999/xlink"/>',
+        ]
+    )
+
+
+def circles_svg() -> bytes:
+    """曲線を平坦化する必要がある円を、重なりありで散らした SVG。"""
+    rng = random.Random(2)
+    return svg_document(
+        [
+            f'<circle cx="{rng.uniform(40, SVG_SIZE - 40):.1f}" '
+            f'cy="{rng.uniform(40, SVG_SIZE - 40):.1f}" '
+            f'r="{rng.uniform(10, 25):.1f}" fill="{random_color(rng)}"/>'
+            for _ in range(6)
+        ]
+    )
+
+
+def rings_svg() -> bytes:
+    """偶奇規則の穴を持つ輪を並べた SVG。"""
+    rng = random.Random(3)
+    cell = SVG_SIZE / 3
+    body = []
+    for row in range(3):
+        for col in range(3):
+            cx = (col + 0.5) * cell
+            cy = (row + 0.5) * cell
+            outer = cell * 0.42
+            inner = outer * rng.uniform(0.4, 0.7)
+            body.append(
+                f'<path fill-rule="evenodd" fill="{random_color(rng)}" d="'
+                f"M {cx - outer:.1f} {cy:.1f} a {outer:.1f} {outer:.1f} 0 1 0 "
+                f"{2 * outer:.1f} 0 a {outer:.1f} {outer:.1f} 0 1 0 "
+                f"{-2 * outer:.1f} 0 Z "
+                f"M {cx - inner:.1f} {cy:.1f} a {inner:.1f} {inner:.1f} 0 1 0 "
+                f"{2 * inner:.1f} 0 a {inner:.1f} {inner:.1f} 0 1 0 "
+                f'{-2 * inner:.1f} 0 Z"/>'
+            )
+    return svg_document(body)
+
+
+def blobs_svg() -> bytes:
+    """不規則な3次ベジェ曲線の閉路を重ねた、最も重い SVG。"""
+    rng = random.Random(4)
+    body = []
+    for _ in range(8):
+        cx = rng.uniform(60, SVG_SIZE - 60)
+        cy = rng.uniform(60, SVG_SIZE - 60)
+        count = rng.randint(5, 8)
+        points = []
+        for index in range(count):
+            angle = 2 * math.pi * index / count
+            radius = rng.uniform(25, 55)
+            points.append(
+                (
+                    cx + radius * math.cos(angle),
+                    cy + radius * math.sin(angle),
+                )
+            )
+        commands = [f"M {points[0][0]:.1f} {points[0][1]:.1f}"]
+        for index in range(count):
+            end = points[(index + 1) % count]
+            commands.append(
+                f"C {end[0] + rng.uniform(-20, 20):.1f} "
+                f"{end[1] + rng.uniform(-20, 20):.1f} "
+                f"{end[0] + rng.uniform(-20, 20):.1f} "
+                f"{end[1] + rng.uniform(-20, 20):.1f} "
+                f"{end[0]:.1f} {end[1]:.1f}"
+            )
+        body.append(f'<path fill="{random_color(rng)}" d="{" ".join(commands)} Z"/>')
+    return svg_document(body)
+
+
+SVG_CORPUS = {
+    "rects": rects_svg,
+    "use-forward": use_forward_svg,
+    "circles": circles_svg,
+    "rings": rings_svg,
+    "blobs": blobs_svg,
+}
+
+
+def count_scene_objects(nodes: Any) -> int:
+    """シーンのオブジェクト木に含まれるオブジェクト数を数える。"""
+    items = nodes.values() if isinstance(nodes, dict) else nodes
+    return sum(1 + count_scene_objects(node["data"].get("child", [])) for node in items)
+
+
+def instrument_hot_functions(
+    page: dict[str, Any], owners: tuple[tuple[str, str], ...]
+) -> dict[str, dict[str, float]]:
+    """指定したクラス属性の関数を包み、呼び出し回数と累積時間を数える。"""
+    timings: dict[str, dict[str, float]] = {}
+    for owner_name, attr in owners:
+        owner = page[owner_name]
+        original = inspect.getattr_static(owner, attr)
+        is_static = isinstance(original, staticmethod)
+        func = original.__func__ if is_static else original
+        entry = timings.setdefault(f"{owner_name}.{attr}", {"calls": 0, "wall": 0.0})
+
+        def timed(*args: Any, _func=func, _entry=entry, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return _func(*args, **kwargs)
+            finally:
+                _entry["calls"] += 1
+                _entry["wall"] += time.perf_counter() - started
+
+        functools.update_wrapper(timed, func)
+        setattr(owner, attr, staticmethod(timed) if is_static else timed)
+    return timings
+
+
+def build_templates(page: dict[str, Any], plane_key: str, triangle_key: str):
+    """ページの UI と同じ手順で、平面と三角形のテンプレートを用意する。"""
+    template_scene, plane_template, folder_key, folder_obj = page["load_template"]()
+    templates = []
+    for presets, key in (
+        (page["PLANE_PRESETS"], plane_key),
+        (page["TRIANGLE_PRESETS"], triangle_key),
+    ):
+        templates.append(
+            {
+                **plane_template,
+                "data": {
+                    **plane_template["data"],
+                    "category": presets[key]["category"],
+                    "no": presets[key]["no"],
+                    "light_cancel": 0.0,
+                },
+            }
+        )
+    return template_scene, templates[0], templates[1], folder_key, folder_obj
+
+
+def generate_calligrapher_scene(
+    page: dict[str, Any], kind: str, text_key: str, options: dict[str, Any], mark
+) -> tuple[Any, dict[str, Any]]:
+    """カリグラファーのドット / メッシュ生成を、UI の既定値で実行する。"""
+    font_key, text = TEXTS[text_key]
+    font_path = CALLIGRAPHER_FONTS[font_key]
+    dot_pipeline = page["DotRenderPipeline"]
+    template_scene, plane_template, triangle_template, folder_key, folder_obj = (
+        build_templates(page, "平面(マップ)", "三角形(マップ)")
+    )
+    dot_defaults = dot_pipeline.default_advanced_settings()
+    layout = dot_pipeline.compute_layout(
+        text,
+        dot_defaults["per_char_resolution"],
+        TEXT_HEIGHT,
+        dot_defaults["plane_size_factor"],
+    )
+    color = page["hex_to_color"]("#FFFFFF")
+    common = {
+        "text": text,
+        "template_scene": template_scene,
+        "plane_template": plane_template,
+        "folder_key": folder_key,
+        "folder_obj": folder_obj,
+        "grid_height": layout["grid_height"],
+        "font_size": dot_pipeline.Config.FONT_SIZE,
+        "text_scale": layout["text_scale"],
+        "spacing": layout["spacing"],
+        "color": color,
+        "font_path": font_path,
+        "lang": "ja",
+    }
+    if kind == "dot":
+        mark("generate")
+        scene, _, preview_pixels, plane_count, _, raw_plane_count = (
+            dot_pipeline.generate_scene(
+                **common,
+                threshold=dot_defaults["threshold"],
+                edge_color=page["hex_to_color"](dot_defaults["edge_color_hex"]),
+                antialias=dot_defaults["antialias"],
+                merge_horizontal=dot_defaults["merge_horizontal"],
+                merge_color_threshold=dot_defaults["merge_color_threshold"],
+            )
+        )
+        counts = {"planes": plane_count, "raw_planes": raw_plane_count}
+    else:
+        scene, preview_pixels, counts = generate_calligrapher_mesh_scene(
+            page, common, triangle_template, options, mark
+        )
+
+    # ダウンロード時と同じく、書き出しの直前にサムネイルを埋め込む
+    mark("thumbnail")
+    preview_buf = io.BytesIO()
+    page["build_scene_thumbnail_image"](preview_pixels).save(preview_buf, format="PNG")
+    scene.image = preview_buf.getvalue()
+    return scene, counts
+
+
+def generate_calligrapher_mesh_scene(
+    page: dict[str, Any],
+    common: dict[str, Any],
+    triangle_template: dict[str, Any],
+    options: dict[str, Any],
+    mark,
+):
+    mesh_pipeline = page["MeshRenderPipeline"]
+    defaults = mesh_pipeline.default_advanced_settings()
+    scene, _, preview_pixels, plane_count, _, raw_plane_count, mesh_stats, _, _ = (
+        mesh_pipeline.generate_scene(
+            **common,
+            triangle_template=triangle_template,
+            settings=mesh_pipeline.build_render_settings(
+                flatten_segment_length=defaults["flatten_segment_length"],
+                edge_length_r=defaults["edge_length_r"],
+            ),
+            outline_width=defaults["outline_width"] if options.get("outline") else 0.0,
+            outline_color=page["hex_to_color"](defaults["outline_color_hex"]),
+            progress_callback=lambda stage, current=None, total=None, note="": mark(
+                stage
+            ),
+        )
+    )
+    return (
+        scene,
+        preview_pixels,
+        {
+            "planes": plane_count,
+            "raw_planes": raw_plane_count,
+            "solve_count": int(mesh_stats["solve_count"]),
+            "solver_nfev": int(mesh_stats["solver_nfev"]),
+        },
+    )
+
+
+def generate_svg_scene(
+    page: dict[str, Any], svg_key: str, mark
+) -> tuple[Any, dict[str, Any]]:
+    """SVG ビルダーの読み込みから生成までを、UI の既定値で実行する。"""
+    template_scene, plane_template, triangle_template, folder_key, folder_obj = (
+        build_templates(page, "map", "map")
+    )
+    settings = page["MeshPipeline"].build_mesh_settings(
+        curve_smoothness=page["CURVE_SMOOTHNESS_DEFAULT"]
+    )
+
+    def progress(stage, current=None, total=None, note=""):
+        mark(stage)
+
+    mark("parse")
+    source_contours = page["svg_bytes_to_contours"](
+        svg_bytes=SVG_CORPUS[svg_key](),
+        auto_close_open_paths=True,
+        settings=settings,
+        progress_callback=progress,
+    )
+    result = page["generate_svg_scene"](
+        template_scene=template_scene,
+        plane_template=plane_template,
+        triangle_template=triangle_template,
+        folder_key=folder_key,
+        folder_obj=folder_obj,
+        source_contours=source_contours,
+        source_preview=None,
+        text_height=TEXT_HEIGHT,
+        use_svg_color=True,
+        fallback_color=page["hex_to_color"]("#FFFFFF"),
+        color_alpha=1.0,
+        generation_metadata={},
+        scene_root_name="SVG",
+        lang="ja",
+        progress_callback=progress,
+        settings=settings,
+    )
+    mesh_stats = result["mesh_stats"]
+    return result["scene"], {
+        "planes": result["plane_count"],
+        "raw_planes": result["raw_plane_count"],
+        "solve_count": int(mesh_stats["solve_count"]),
+        "solver_nfev": int(mesh_stats["solver_nfev"]),
+    }
+
+
+def generate_case_scene(
+    page: dict[str, Any], case: str, mark=None
+) -> tuple[Any, dict[str, Any]]:
+    """ケース名に対応するシーンを生成し、シーンと件数を返す。
+
+    mark を渡すと、生成の段階が変わるたびに段階名で呼び出す。
+    """
+    kind, key, options = CASES[case]
+    mark = mark if mark is not None else (lambda stage: None)
+    if kind == "svg":
+        return generate_svg_scene(page, key, mark)
+    return generate_calligrapher_scene(page, kind, key, options, mark)
+
+
+def case_page_name(case: str) -> str:
+    return (
+        "digital-craft-svg-importer"
+        if CASES[case][0] == "svg"
+        else "digital-craft-calligrapher"
+    )
@@ -0,0 +1,306 @@
+"""カリグラファーと SVG ビルダーの生成処理を Streamlit なしで計測する。
+
+使い方:
+    python benchmarks/run_benchmarks.py                   # 計測して基準値と比較
+    python benchmarks/run_benchmarks.py --update-baseline # 基準値を書き換える
+    python benchmarks/run_benchmarks.py --only mesh-ja-short svg-rings
+
+各ケースは別プロセスで実行し、最大常駐メモリがケースごとに分かれるようにする。
+基準値 (baseline.json) は計測したマシンに依存するため、比較は同じマシンで取った
+基準値に対して行う。ドットの件数 (オブジェクト数・平面数など) は 1 件でも変われば
+失敗とする。wildmeshing の三角形分割は同じ入力でも結果がわずかに揺れるため、
+メッシュと SVG の件数は --count-threshold の割合までの差を許す。
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import corpus
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+DEFAULT_TIME_THRESHOLD = 0.25
+DEFAULT_MEMORY_THRESHOLD = 0.20
+DEFAULT_NFEV_THRESHOLD = 0.10
+DEFAULT_MIN_SECONDS = 0.1
+DEFAULT_MIN_MEMORY_MB = 20.0
+DEFAULT_COUNT_THRESHOLD = 0.02
+
+COUNT_KEYS = ("objects", "planes", "raw_planes", "solve_count", "scene_bytes")
+
+
+def run_case(case: str, repeat: int) -> dict[str, Any]:
+    """1 ケースをこのプロセス内で repeat 回実行し、時間は項目ごとの最短値を返す。"""
+    page = corpus.load_page(corpus.case_page_name(case))
+    recorder_class = page["MeshPerformanceRecorder"]
+    kind = corpus.CASES[case][0]
+    owners = corpus.HOT_FUNCTIONS["svg" if kind == "svg" else "calligrapher"]
+    timings = corpus.instrument_hot_functions(page, owners)
+
+    best: dict[str, Any] | None = None
+    for _ in range(repeat):
+        for entry in timings.values():
+            entry["calls"] = 0
+            entry["wall"] = 0.0
+        recorder = recorder_class(case)
+        scene, counts = corpus.generate_case_scene(page, case, mark=recorder.mark)
+        recorder.mark("serialize")
+        scene_bytes = bytes(scene)
+        recorder.finish()
+        report = recorder.report(counts)
+        result = {
+            "kind": kind,
+            "wall": report["wall"],
+            "cpu": report["cpu"],
+            "stages": {entry["stage"]: entry["wall"] for entry in report["stages"]},
+            "functions": {
+                name: {"calls": int(entry["calls"]), "wall": entry["wall"]}
+                for name, entry in timings.items()
+                if entry["calls"]
+            },
+            "counts": {
+                "objects": corpus.count_scene_objects(scene.objects),
+                "planes": int(counts["planes"]),
+                "raw_planes": int(counts["raw_planes"]),
+                "solve_count": int(counts.get("solve_count", 0)),
+                "scene_bytes": len(scene_bytes),
+            },
+            "solver_nfev": int(counts.get("solver_nfev", 0)),
+        }
+        best = result if best is None else keep_fastest(best, result)
+    best["peak_rss_mb"] = recorder_class.peak_rss_mb()
+    return best
+
+
+def keep_fastest(best: dict[str, Any], result: dict[str, Any]) -> dict[str, Any]:
+    """繰り返しの計測値を、時間の項目ごとに短いほうへ寄せる。"""
+    for key in ("wall", "cpu"):
+        result[key] = min(result[key], best[key])
+    for stage, wall in best["stages"].items():
+        result["stages"][stage] = min(result["stages"].get(stage, wall), wall)
+    for name, entry in best["functions"].items():
+        if name in result["functions"]:
+            result["functions"][name]["wall"] = min(
+                result["functions"][name]["wall"], entry["wall"]
+            )
+    return result
+
+
+def run_case_in_subprocess(case: str, repeat: int) -> dict[str, Any]:
+    completed = subprocess.run(
+        [sys.executable, __file__, "--run-case", case, "--repeat", str(repeat)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"{case} の計測に失敗しました (exit {completed.returncode}):\n"
+            f"{completed.stderr.strip()}"
+        )
+    # ページの読み込み時に標準出力へ何か出ても、最後の行だけを結果として読む
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def exceeds(current: float, baseline: float, ratio: float, floor: float) -> bool:
+    """相対しきい値と絶対しきい値の両方を超えたときだけ悪化とみなす。"""
+    return current > baseline * (1.0 + ratio) and current - baseline > floor
+
+
+def compare_case(
+    current: dict[str, Any], baseline: dict[str, Any], args: argparse.Namespace
+) -> list[str]:
+    """基準値と比べて、悪化した項目の説明を返す。空なら合格。"""
+    problems = []
+    count_threshold = 0.0 if current["kind"] == "dot" else args.count_threshold
+    for key in COUNT_KEYS:
+        if key not in baseline["counts"]:
+            continue
+        value = current["counts"][key]
+        reference = baseline["counts"][key]
+        if abs(value - reference) > reference * count_threshold:
+            problems.append(f"{key}: {reference} -> {value}")
+    timed = [("wall", current["wall"], baseline["wall"])]
+    timed += [
+        (f"stage {stage}", wall, baseline["stages"][stage])
+        for stage, wall in current["stages"].items()
+        if stage in baseline["stages"]
+    ]
+    timed += [
+        (f"{name}", entry["wall"], baseline["functions"][name]["wall"])
+        for name, entry in current["functions"].items()
+        if name in baseline["functions"]
+    ]
+    for label, value, reference in timed:
+        if exceeds(value, reference, args.time_threshold, args.min_seconds):
+            problems.append(f"{label}: {reference:.3f}s -> {value:.3f}s")
+    if exceeds(current["solver_nfev"], baseline["solver_nfev"], args.nfev_threshold, 0):
+        problems.append(
+            f"solver_nfev: {baseline['solver_nfev']} -> {current['solver_nfev']}"
+        )
+    if (
+        current["peak_rss_mb"] is not None
+        and baseline["peak_rss_mb"] is not None
+        and exceeds(
+            current["peak_rss_mb"],
+            baseline["peak_rss_mb"],
+            args.memory_threshold,
+            args.min_memory_mb,
+        )
+    ):
+        problems.append(
+            f"peak_rss_mb: {baseline['peak_rss_mb']:.1f} -> "
+            f"{current['peak_rss_mb']:.1f}"
+        )
+    return problems
+
+
+def format_ratio(current: float, baseline: dict[str, Any] | None) -> str:
+    if baseline is None or not baseline["wall"]:
+        return "-"
+    return f"{current / baseline['wall']:.2f}x"
+
+
+def print_case(case: str, result: dict[str, Any], baseline: dict[str, Any] | None):
+    counts = result["counts"]
+    rss = result["peak_rss_mb"]
+    print(
+        f"{case:<24} {result['wall']:>8.3f}s {format_ratio(result['wall'], baseline):>7} "
+        f"{counts['objects']:>7} {counts['solve_count']:>7} "
+        f"{(f'{rss:.0f}' if rss is not None else '-'):>7}"
+    )
+    slowest = sorted(result["stages"].items(), key=lambda item: -item[1])[:3]
+    print(
+        " " * 26
+        + ", ".join(f"{stage} {wall:.3f}s" for stage, wall in slowest if wall > 0)
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--only", nargs="+", choices=sorted(corpus.CASES), help="実行するケース"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="ケースごとの実行回数 (最短を採用)"
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="比較せず、計測結果で基準値を書き換える",
+    )
+    parser.add_argument(
+        "--time-threshold",
+        type=float,
+        default=DEFAULT_TIME_THRESHOLD,
+        help="時間の悪化とみなす増加率 (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=DEFAULT_MEMORY_THRESHOLD,
+        help="最大メモリの悪化とみなす増加率",
+    )
+    parser.add_argument(
+        "--nfev-threshold",
+        type=float,
+        default=DEFAULT_NFEV_THRESHOLD,
+        help="ソルバー評価回数の悪化とみなす増加率",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=DEFAULT_MIN_SECONDS,
+        help="これより小さい時間の増加は無視する",
+    )
+    parser.add_argument(
+        "--min-memory-mb",
+        type=float,
+        default=DEFAULT_MIN_MEMORY_MB,
+        help="これより小さいメモリの増加は無視する",
+    )
+    parser.add_argument(
+        "--count-threshold",
+        type=float,
+        default=DEFAULT_COUNT_THRESHOLD,
+        help="メッシュと SVG の件数で許す差の割合 (ドットは常に完全一致)",
+    )
+    parser.add_argument("--output", type=Path, help="計測結果を JSON で書き出す先")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case, max(1, args.repeat))))
+        return 0
+
+    cases = args.only or list(corpus.CASES)
+    baseline_cases: dict[str, Any] = {}
+    if not args.update_baseline and args.baseline.exists():
+        baseline_cases = json.loads(args.baseline.read_text(encoding="utf-8"))["cases"]
+
+    print(
+        f"{'case':<24} {'wall':>9} {'ratio':>7} {'objects':>7} {'solves':>7} {'rss MB':>7}"
+    )
+    results: dict[str, Any] = {}
+    failures: dict[str, list[str]] = {}
+    for case in cases:
+        result = run_case_in_subprocess(case, args.repeat)
+        results[case] = result
+        baseline = baseline_cases.get(case)
+        print_case(case, result, baseline)
+        if baseline is not None:
+            problems = compare_case(result, baseline, args)
+            if problems:
+                failures[case] = problems
+
+    document = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "cases": results,
+    }
+    if args.output:
+        args.output.write_text(
+            json.dumps(document, indent=2, ensure_ascii=False) + "\n",
+            encoding="utf-8",
+        )
+    if args.update_baseline:
+        if args.only and args.baseline.exists():
+            # 一部のケースだけ計測したときは、残りのケースの基準値を残す
+            previous = json.loads(args.baseline.read_text(encoding="utf-8"))
+            document["cases"] = {**previous["cases"], **results}
+        args.baseline.write_text(
+            json.dumps(document, indent=2, ensure_ascii=False) + "\n",
+            encoding="utf-8",
+        )
+        print(f"基準値を更新しました: {args.baseline}")
+        return 0
+
+    missing = [case for case in cases if case not in baseline_cases]
+    if missing:
+        print(f"基準値が無いケース: {', '.join(missing)}")
+    if failures:
+        print("\n悪化を検出しました:")
+        for case, problems in failures.items():
+            for problem in problems:
+                print(f"  {case}: {problem}")
+        return 1
+    print("\n基準値からの悪化はありません。")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,15 @@
 import copy
+import dataclasses
+import hashlib
 import io
+import json
 import math
+import os
+import sys
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
@@ -14,6 +22,12 @@ from fontTools.ttLib import TTFont
 from kkloader import HoneycomeSceneData
 from PIL import Image, ImageDraw, ImageFont
 from scipy.optimize import least_squares
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+try:
+    import resource
+except ImportError:  # Windows には resource モジュールが無い
+    resource = None
 
 # ========================================
 # i18n対応: 多言語辞書
@@ -110,6 +124,11 @@ TRANSLATIONS = {
         "render_mode_mesh": "メッシュ(三角形)",
         "mesh_flatten_length_label": "曲線の粗さ",
         "mesh_flatten_length_help": "値を大きくすると曲線が粗くなり、三角形の数が減って軽くなります。",
+        "mesh_auto_budget_label": "三角形数から曲線の粗さを自動で決める",
+        "mesh_auto_budget_help": "代表的な文字で試しに三角形分割し、指定した三角形数に収まる範囲で最も細かい曲線の粗さを選びます",
+        "mesh_triangle_budget_label": "三角形数の目安",
+        "mesh_budget_result": "曲線の粗さを {value} に自動調整しました (予測 {predicted:,} 個 / 実際 {actual:,} 個 / 目安 {budget:,} 個)",
+        "mesh_budget_over": "最も粗い設定 {value} でも三角形数が目安を超えます (予測 {predicted:,} 個 / 実際 {actual:,} 個 / 目安 {budget:,} 個)",
         "mesh_edge_length_r_label": "三角形の粗さ",
         "mesh_edge_length_r_help": "大きいほど三角形が少なくなり、小さいほど細かくなります。",
         "mesh_outline_enable_label": "縁取りを有効化",
@@ -123,17 +142,39 @@ TRANSLATIONS = {
         "mesh_reconstruction_info": "再構成誤差 (採用三角形): max={max_err:.3e}, rmse={rmse:.3e}, 閾値={tol:.3e}",
         "mesh_triangulation_title": "三角形分割プレビュー",
         "mesh_triangulation_empty": "分割結果がありません。",
+        "mesh_performance_title": "パフォーマンス",
+        "mesh_performance_wall": "実時間",
+        "mesh_performance_triangles_per_second": "三角形/秒",
+        "mesh_performance_nfev_per_solve": "評価回数/求解",
+        "mesh_performance_peak_memory": "最大メモリ",
+        "mesh_performance_stage": "段階",
+        "mesh_performance_stage_wall": "実時間 (秒)",
+        "mesh_performance_stage_cpu": "CPU時間 (秒)",
+        "mesh_performance_stage_share": "割合 (%)",
+        "mesh_performance_stage_memory": "最大メモリ (MB)",
+        "mesh_performance_help": "各段階は、その段階の最初の進捗報告から次の段階までの時間です。CPU時間は生成スレッドの分だけです。三角形/秒と評価回数/求解は今回新たに解いた三角形だけで数え、キャッシュから再利用した文字は含みません。最大メモリはサーバープロセス全体の最大常駐メモリです。環境変数 KK_MESH_PERF_LOG にファイルパスを設定すると、計測結果を JSON Lines で追記します。",
         "mesh_dependency_error": "メッシュ生成には wildmeshing / fonttools / fontpens / scipy が必要です。",
         "mesh_missing_glyph_error": '文字"{error_moji}"はフォントに未収録のためレンダリングできませんでした',
+        "mesh_stage_queued": "順番待ち中",
         "mesh_stage_prepare": "準備中",
+        "mesh_stage_tune": "三角形数の目安に合わせて調整中",
         "mesh_stage_glyph": "フォント輪郭を抽出中",
         "mesh_stage_triangulate": "輪郭を三角形分割中",
         "mesh_stage_solve": "三角形せん断を計算中",
         "mesh_stage_outline_triangulate": "縁取り輪郭を三角形分割中",
         "mesh_stage_outline_solve": "縁取り三角形せん断を計算中",
+        "mesh_stage_outline": "縁取り輪郭を作成中",
+        "mesh_stage_align": "ドット表示に位置合わせ中",
         "mesh_stage_preview": "分割プレビューを描画中",
         "mesh_stage_scene": "シーンを組み立て中",
         "mesh_stage_done": "完了",
+        "mesh_stage_serialize": "シーンを書き出し",
+        "job_queue_position": "{position}番目",
+        "mesh_job_cancel_button": "生成をキャンセル",
+        "mesh_job_cancelling": "キャンセルしています...",
+        "mesh_job_cancelled": "生成をキャンセルしました",
+        "job_rejected_session_limit": "前回の生成がまだ実行中です。完了してからもう一度お試しください。",
+        "job_rejected_queue_full": "生成の順番待ちが混み合っています。しばらくしてからもう一度お試しください。",
         "light_cancel_label": "ライトの影響度",
         "light_cancel_help": 'アイテム設定の"ライトの影響度"を一括設定します。1ほどライトを反射しやすく、0ほどライトを吸収しやすくなります。',
         "generate_button": "シーンを生成",
@@ -141,6 +182,12 @@ TRANSLATIONS = {
         "generating": "シーンを生成中...",
         "success_generate": "生成完了！ ({count} 個の平面)",
         "dot_plane_limit_error": "推定平面数が上限を超えています。推定 {count:,} 個 / 上限 {limit:,} 個。文字数を減らすか、一文字あたり細かさを下げるか、アンチエイリアスをOFFにして平面結合をONにしてください。",
+        "auto_resolution_label": "平面数から細かさを自動で決める",
+        "auto_resolution_help": "指定した平面数に収まる範囲で、一文字あたり細かさをできるだけ大きく自動調整します",
+        "plane_budget_label": "平面数の目安",
+        "plane_budget_help": "自動調整で目指す平面数の上限です",
+        "auto_resolution_result": "細かさを {resolution} に自動調整しました (推定 {count:,} 個 / 目安 {budget:,} 個)",
+        "auto_resolution_over_budget": "最小の細かさ {resolution} でも平面数が目安を超えます (推定 {count:,} 個 / 目安 {budget:,} 個)",
         "preview_title": "文字生成イメージ",
         "original_image": "元のテキスト画像",
         "pixel_data": "ピクセルデータ ({width}×{height})",
@@ -246,6 +293,11 @@ I wrote a blog post explaining it [here](https://qiita.com/tropical-362827/items
         "render_mode_mesh": "Mesh (Triangles)",
         "mesh_flatten_length_label": "Curve coarseness",
         "mesh_flatten_length_help": "Higher values make curves coarser and reduce triangle count.",
+        "mesh_auto_budget_label": "Pick curve coarseness from a triangle budget",
+        "mesh_auto_budget_help": "Test-triangulates representative characters and picks the finest curve setting that stays within the budget",
+        "mesh_triangle_budget_label": "Triangle budget",
+        "mesh_budget_result": "Curve coarseness set to {value} (predicted {predicted:,} / actual {actual:,} / budget {budget:,})",
+        "mesh_budget_over": "Even the coarsest setting {value} exceeds the budget (predicted {predicted:,} / actual {actual:,} / budget {budget:,})",
         "mesh_edge_length_r_label": "Triangle coarseness",
         "mesh_edge_length_r_help": "Higher values create fewer triangles; lower values create finer triangles.",
         "mesh_outline_enable_label": "Enable outline",
@@ -259,17 +311,39 @@ I wrote a blog post explaining it [here](https://qiita.com/tropical-362827/items
         "mesh_reconstruction_info": "Reconstruction error (accepted triangles): max={max_err:.3e}, rmse={rmse:.3e}, threshold={tol:.3e}",
         "mesh_triangulation_title": "Triangulation Preview",
         "mesh_triangulation_empty": "No triangulation result.",
+        "mesh_performance_title": "Performance",
+        "mesh_performance_wall": "Wall time",
+        "mesh_performance_triangles_per_second": "Triangles/s",
+        "mesh_performance_nfev_per_solve": "Evaluations/solve",
+        "mesh_performance_peak_memory": "Peak memory",
+        "mesh_performance_stage": "Stage",
+        "mesh_performance_stage_wall": "Wall (s)",
+        "mesh_performance_stage_cpu": "CPU (s)",
+        "mesh_performance_stage_share": "Share (%)",
+        "mesh_performance_stage_memory": "Peak memory (MB)",
+        "mesh_performance_help": "Each stage runs from its first progress report until the next stage starts. CPU time covers the generation thread only. Triangles/s and evaluations/solve count only triangles solved in this run, not characters reused from the cache. Peak memory is the maximum resident memory of the whole server process. Set the KK_MESH_PERF_LOG environment variable to a file path to append each measurement as JSON Lines.",
         "mesh_dependency_error": "Mesh mode requires wildmeshing / fonttools / fontpens / scipy.",
         "mesh_missing_glyph_error": 'Character "{error_moji}" is not available in the selected font and could not be rendered.',
+        "mesh_stage_queued": "Waiting in queue",
         "mesh_stage_prepare": "Preparing",
+        "mesh_stage_tune": "Tuning for the triangle budget",
         "mesh_stage_glyph": "Extracting glyph outlines",
         "mesh_stage_triangulate": "Triangulating contours",
         "mesh_stage_solve": "Solving triangle shears",
         "mesh_stage_outline_triangulate": "Triangulating outline contours",
         "mesh_stage_outline_solve": "Solving outline triangle shears",
+        "mesh_stage_outline": "Building outline contours",
+        "mesh_stage_align": "Aligning to the dot layout",
         "mesh_stage_preview": "Rendering triangulation preview",
         "mesh_stage_scene": "Building scene",
         "mesh_stage_done": "Done",
+        "mesh_stage_serialize": "Writing scene",
+        "job_queue_position": "position {position}",
+        "mesh_job_cancel_button": "Cancel generation",
+        "mesh_job_cancelling": "Cancelling...",
+        "mesh_job_cancelled": "Generation was cancelled.",
+        "job_rejected_session_limit": "Your previous generation is still running. Please try again after it finishes.",
+        "job_rejected_queue_full": "The generation queue is full. Please try again in a moment.",
         "light_cancel_label": "Light influence",
         "light_cancel_help": 'Sets item "Light influence" setting. Higher values reflect light more, lower values absorb light more.',
         "generate_button": "Generate Scene",
@@ -277,6 +351,12 @@ I wrote a blog post explaining it [here](https://qiita.com/tropical-362827/items
         "generating": "Generating scene...",
         "success_generate": "Generation complete! ({count} planes)",
         "dot_plane_limit_error": "Estimated plane count exceeds the limit. Estimated {count:,} / limit {limit:,}. Reduce the text length or resolution, or turn antialiasing off and enable plane merging.",
+        "auto_resolution_label": "Pick resolution from a plane budget",
+        "auto_resolution_help": "Automatically uses the highest resolution per character that stays within the plane budget",
+        "plane_budget_label": "Plane budget",
+        "plane_budget_help": "Maximum plane count targeted by the automatic resolution",
+        "auto_resolution_result": "Resolution set to {resolution} (estimated {count:,} / budget {budget:,})",
+        "auto_resolution_over_budget": "Even the lowest resolution {resolution} exceeds the budget (estimated {count:,} / budget {budget:,})",
         "preview_title": "Text generation preview",
         "original_image": "Original text image",
         "pixel_data": "Pixel data ({width}×{height})",
@@ -311,7 +391,11 @@ class DotRenderConfig:
     FONT_SIZE = 200
     CHAR_CANVAS_PADDING = 5
     DEFAULT_RESOLUTION = 100
+    MIN_RESOLUTION = 10
+    MAX_RESOLUTION = 200
+    RESOLUTION_STEP = 5
     MAX_PLANE_COUNT = 60_000
+    DEFAULT_PLANE_BUDGET = 20_000
 
 
 class MeshRenderConfig:
@@ -328,9 +412,30 @@ class MeshRenderConfig:
     SOLVER_LM_REG_WEIGHT = 1e-6
     SOLVER_REFERENCE_TEXT_HEIGHT = 1.0
     FLATTEN_SEGMENT_LENGTH_DEFAULT = 50.0
+    FLATTEN_SEGMENT_LENGTH_MIN = 2.0
+    FLATTEN_SEGMENT_LENGTH_MAX = 100.0
+    # 三角形数の目安から曲線の細かさを探すときの候補(粗い順)
+    BUDGET_FLATTEN_CANDIDATES = (
+        100.0,
+        70.0,
+        50.0,
+        35.0,
+        25.0,
+        18.0,
+        12.0,
+        8.0,
+        5.0,
+        3.0,
+        2.0,
+    )
+    BUDGET_SAMPLE_SIZE = 3
+    TRIANGLE_BUDGET_DEFAULT = 2_000
+    TRIANGLE_BUDGET_MAX = 20_000
     OUTLINE_WIDTH_DEFAULT = 0.0
     OUTLINE_COLOR_HEX_DEFAULT = "#000000"
     OUTLINE_Y_OFFSET_DEFAULT = -0.001
+    # 三角形分割プレビューで枠線を描く三角形の上限 (超えたら間引いて描く)
+    PREVIEW_TRIANGLE_LIMIT = 20_000
     # wildmeshing の分割設定。triwild.ipynb の使用例に合わせる。
     TRIWILD_STOP_QUALITY = 20.0
     TRIWILD_MAX_ITS = 80
@@ -345,6 +450,42 @@ class MeshRenderConfig:
     TRIWILD_MUTE_LOG = True
 
 
+@dataclasses.dataclass(frozen=True)
+class MeshRenderSettings:
+    """1回のメッシュ生成で使う設定値。
+
+    MeshRenderConfig のクラス属性を書き換えると同時に生成している他セッションへ
+    波及するため、ユーザー指定値はこのオブジェクトに閉じ込めて各処理へ引き回す。
+    """
+
+    flatten_segment_length: float = MeshRenderConfig.FLATTEN_SEGMENT_LENGTH_DEFAULT
+    triwild_stop_quality: float = MeshRenderConfig.TRIWILD_STOP_QUALITY
+    triwild_max_its: int = MeshRenderConfig.TRIWILD_MAX_ITS
+    triwild_stage: int = MeshRenderConfig.TRIWILD_STAGE
+    triwild_epsilon: float = MeshRenderConfig.TRIWILD_EPSILON
+    triwild_feature_epsilon: float = MeshRenderConfig.TRIWILD_FEATURE_EPSILON
+    triwild_target_edge_len: float = MeshRenderConfig.TRIWILD_TARGET_EDGE_LEN
+    triwild_edge_length_r: float = MeshRenderConfig.TRIWILD_EDGE_LENGTH_R
+    triwild_flat_feature_angle: float = MeshRenderConfig.TRIWILD_FLAT_FEATURE_ANGLE
+    triwild_cut_outside: bool = MeshRenderConfig.TRIWILD_CUT_OUTSIDE
+    triwild_skip_eps: bool = MeshRenderConfig.TRIWILD_SKIP_EPS
+    triwild_mute_log: bool = MeshRenderConfig.TRIWILD_MUTE_LOG
+    solver_reachable_residual_tol: float = (
+        MeshRenderConfig.SOLVER_REACHABLE_RESIDUAL_TOL
+    )
+    solver_early_break_residual_tol: float = (
+        MeshRenderConfig.SOLVER_EARLY_BREAK_RESIDUAL_TOL
+    )
+    solver_max_nfev: int = MeshRenderConfig.SOLVER_MAX_NFEV
+    solver_sx_min: float = MeshRenderConfig.SOLVER_SX_MIN
+    solver_sx_max: float = MeshRenderConfig.SOLVER_SX_MAX
+    solver_child_scale_min: float = MeshRenderConfig.SOLVER_CHILD_SCALE_MIN
+    solver_lm_reg_weight: float = MeshRenderConfig.SOLVER_LM_REG_WEIGHT
+
+
+DEFAULT_MESH_RENDER_SETTINGS = MeshRenderSettings()
+
+
 class MissingGlyphError(ValueError):
     def __init__(self, error_moji):
         self.error_moji = error_moji
@@ -666,17 +807,23 @@ def load_template():
 
 
 # 関数定義
+@st.cache_resource(show_spinner=False)
+def load_truetype_font(font_path, font_size):
+    """フォントをパスとサイズごとにプロセスで1回だけ読み込む"""
+    return ImageFont.truetype(str(font_path), font_size)
+
+
 def load_font(font_size, font_path=None):
     font = None
     if font_path is not None:
         try:
-            font = ImageFont.truetype(str(font_path), font_size)
+            font = load_truetype_font(str(font_path), font_size)
         except OSError:
             font = None
     if font is None:
         for candidate in list_available_fonts():
             try:
-                font = ImageFont.truetype(str(candidate), font_size)
+                font = load_truetype_font(str(candidate), font_size)
                 break
             except OSError:
                 font = None
@@ -751,10 +898,11 @@ def create_plane(template, x, y, z, color, scale=1.0):
 class TriangleSolverLMReparam:
     """sx/cx/cz を再パラメータ化して LM で解くソルバ。"""
 
-    def __init__(self, source_xz):
+    def __init__(self, source_xz, settings=DEFAULT_MESH_RENDER_SETTINGS):
         source = np.asarray(source_xz, dtype=np.float64)
         if source.shape != (3, 2):
             raise ValueError("TriangleSolverLMReparam requires source_xz shape (3, 2)")
+        self.settings = settings
         self.source_xz = source
         self.src0 = source[0]
 
@@ -894,10 +1042,11 @@ class TriangleSolverLMReparam:
         if target.shape != (3, 2):
             raise ValueError("target_xz must be shape (3, 2)")
 
-        sx_min = float(MeshRenderConfig.SOLVER_SX_MIN)
-        sx_max = float(MeshRenderConfig.SOLVER_SX_MAX)
-        c_min = float(MeshRenderConfig.SOLVER_CHILD_SCALE_MIN)
-        reg_weight = float(MeshRenderConfig.SOLVER_LM_REG_WEIGHT)
+        settings = self.settings
+        sx_min = float(settings.solver_sx_min)
+        sx_max = float(settings.solver_sx_max)
+        c_min = float(settings.solver_child_scale_min)
+        reg_weight = float(settings.solver_lm_reg_weight)
         if not (0.0 < sx_min < sx_max < 1.0):
             return {"reachable": False, "residual": float("inf")}
         sx_span = sx_max - sx_min
@@ -977,6 +1126,7 @@ class TriangleSolverLMReparam:
 
         best_params = None
         best_residual = float("inf")
+        nfev = 0
         for initial in candidates:
             equations = make_equations(initial)
             try:
@@ -984,7 +1134,7 @@ class TriangleSolverLMReparam:
                     equations,
                     x0=initial,
                     method="lm",
-                    max_nfev=MeshRenderConfig.SOLVER_MAX_NFEV,
+                    max_nfev=settings.solver_max_nfev,
                     ftol=1e-12,
                     xtol=1e-12,
                     gtol=1e-12,
@@ -992,16 +1142,17 @@ class TriangleSolverLMReparam:
             except (ValueError, RuntimeError, FloatingPointError):
                 continue
 
+            nfev += int(optimized.nfev)
             geom = equations(optimized.x)[:4]
             residual = float(np.sum(geom**2))
             if residual < best_residual:
                 best_residual = residual
                 best_params = optimized.x
-            if residual < MeshRenderConfig.SOLVER_EARLY_BREAK_RESIDUAL_TOL:
+            if residual < settings.solver_early_break_residual_tol:
                 break
 
         if best_params is None:
-            return {"reachable": False, "residual": float("inf")}
+            return {"reachable": False, "residual": float("inf"), "nfev": nfev}
 
         alpha, u, theta, v, w = best_params
         sx, sz, cx, cz = self._from_unconstrained(
@@ -1009,7 +1160,7 @@ class TriangleSolverLMReparam:
         )
         eff_x, eff_z = self.effective_scale(sx, sz, theta)
         if eff_x <= 1e-12 or eff_z <= 1e-12:
-            return {"reachable": False, "residual": float("inf")}
+            return {"reachable": False, "residual": float("inf"), "nfev": nfev}
 
         result = {
             "px": float(translation[0]),
@@ -1024,7 +1175,8 @@ class TriangleSolverLMReparam:
             "child_sx": float(cx / eff_x),
             "child_sz": float(cz / eff_z),
             "residual": best_residual,
-            "reachable": best_residual < MeshRenderConfig.SOLVER_REACHABLE_RESIDUAL_TOL,
+            "reachable": best_residual < settings.solver_reachable_residual_tol,
+            "nfev": nfev,
         }
         return result
 
@@ -1055,6 +1207,350 @@ def build_metadata_folder(folder_obj, metadata: dict, lang="ja"):
     return info_folder
 
 
+def collect_color_slots(objects, channel):
+    """オブジェクト木から色の差し替え対象を (data, 色の種類, 固定アルファ) で列挙する。"""
+    slots = []
+    for obj in objects:
+        data = obj["data"]
+        if obj["type"] == HoneycomeSceneData.FOLDER:
+            slots.extend(collect_color_slots(data["child"], channel))
+        elif data.get("child"):
+            # せん断用の親平面は透明、子の三角形は不透明で色を持つ
+            slots.append((data, channel, 0.0))
+            for child in data["child"]:
+                slots.append((child["data"], channel, 1.0))
+        else:
+            slots.append((data, channel, None))
+    return slots
+
+
+def stamp_color_slots(color_slots, colors):
+    """色スロットへ現在の色を書き込む。同じ色は1つの辞書を共有させる。"""
+    stamped_colors = {}
+    for data, channel, alpha in color_slots:
+        stamp_key = (channel, alpha)
+        if stamp_key not in stamped_colors:
+            stamped = dict(colors[channel])
+            if alpha is not None:
+                stamped["a"] = alpha
+            stamped_colors[stamp_key] = stamped
+        data["colors"][0] = stamped_colors[stamp_key]
+
+
+def restamp_cached_result(
+    result, folder_key, folder_obj, colors, generation_metadata, lang="ja"
+):
+    """解いた形状はそのままに、色と情報フォルダだけを書き換えた生成結果を返す。"""
+    stamp_color_slots(result["color_slots"], colors)
+
+    if generation_metadata:
+        root_children = result["scene"].objects[folder_key]["data"]["child"]
+        root_children[0] = build_metadata_folder(folder_obj, generation_metadata, lang)
+    return result
+
+
+def find_cached_geometry(geometry_key):
+    """同じ形状入力で生成済みの結果があれば返す。"""
+    cached = st.session_state.get("calligrapher_geometry_cache")
+    if cached is None or cached["key"] != geometry_key:
+        return None
+    return cached["result"]
+
+
+def store_cached_geometry(geometry_key, result):
+    st.session_state.calligrapher_geometry_cache = {
+        "key": geometry_key,
+        "result": result,
+    }
+
+
+class CharResultCache:
+    """文字ごとの生成結果(ピクセル・平面や三角形分割・求解結果)を保持するキャッシュ。
+
+    直前の生成で使った文字の結果だけを残すため、取得・登録した結果は
+    いったん ``pending`` に集め、生成が最後まで終わった時点で ``commit`` する。
+    途中でキャンセル・失敗した生成の ``pending`` は ``reset_pending`` で捨てる。
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.pending = {}
+
+    def get(self, key):
+        entry = self.pending.get(key)
+        if entry is None:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.pending[key] = entry
+        return entry
+
+    def put(self, key, entry):
+        self.pending[key] = entry
+
+    def commit(self):
+        """今回の生成で使った結果だけを残し、それ以外を捨てる。"""
+        self.entries = self.pending
+        self.pending = {}
+
+    def reset_pending(self):
+        """確定前の結果を捨てる。確定済みの ``entries`` はそのまま残す。"""
+        self.pending = {}
+
+
+def get_char_result_cache(cache_name):
+    """セッションごとの文字単位キャッシュを取得する(なければ作る)。"""
+    if cache_name not in st.session_state:
+        st.session_state[cache_name] = CharResultCache()
+    return st.session_state[cache_name]
+
+
+class MeshJobCancelledError(RuntimeError):
+    pass
+
+
+@st.cache_resource
+def get_perf_log_lock():
+    """計測ログへの追記を直列化するロック。
+
+    再実行やページをまたいでも同じロックを使うため ``st.cache_resource`` で共有する。
+    両ページで同じソースにしておくことで、キャッシュも同じものになる。
+    """
+    return threading.Lock()
+
+
+class MeshPerformanceRecorder:
+    """メッシュ生成ジョブの段階ごとの実時間・CPU時間・最大メモリを記録する。
+
+    進捗報告の段階名を区切りに使い、ある段階の最初の報告から次の段階の最初の報告
+    までをその段階の時間とする。CPU時間はジョブを実行するスレッドの分だけを数える。
+    """
+
+    LOG_PATH_ENV = "KK_MESH_PERF_LOG"
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.started_at = time.time()
+        self.stages = {}
+        self.current_stage = None
+        self.stage_started = (0.0, 0.0)
+        self.finished = False
+
+    @staticmethod
+    def peak_rss_mb():
+        """プロセスの最大常駐メモリ (MB) を返す。取得できない環境では None。"""
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux は KB、macOS はバイト単位で返る
+        return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+    def close_stage(self, now):
+        if self.current_stage is None:
+            return
+        entry = self.stages.setdefault(self.current_stage, {"wall": 0.0, "cpu": 0.0})
+        entry["wall"] += now[0] - self.stage_started[0]
+        entry["cpu"] += now[1] - self.stage_started[1]
+        entry["peak_rss_mb"] = self.peak_rss_mb()
+
+    def mark(self, stage):
+        """段階が変わったら直前の段階を締め、次の段階の計測を始める。"""
+        if stage == self.current_stage or self.finished:
+            return
+        now = (time.perf_counter(), time.thread_time())
+        self.close_stage(now)
+        self.current_stage = stage
+        self.stage_started = now
+
+    def finish(self):
+        """最後の段階を締める。CPU時間を正しく数えるためジョブのスレッドから呼ぶ。"""
+        if not self.finished:
+            self.close_stage((time.perf_counter(), time.thread_time()))
+            self.finished = True
+
+    def report(self, mesh_stats):
+        """段階ごとの計測値に、求解件数から求めた三角形/秒と評価回数/求解を添える。"""
+        solve_wall = sum(
+            values["wall"]
+            for stage, values in self.stages.items()
+            if stage.startswith("solve")
+        )
+        solve_count = int(mesh_stats.get("solve_count", 0))
+        solver_nfev = int(mesh_stats.get("solver_nfev", 0))
+        return {
+            "job_id": self.job_id,
+            "started_at": self.started_at,
+            "wall": sum(values["wall"] for values in self.stages.values()),
+            "cpu": sum(values["cpu"] for values in self.stages.values()),
+            "peak_rss_mb": self.peak_rss_mb(),
+            "solve_count": solve_count,
+            "solver_nfev": solver_nfev,
+            "triangles_per_second": solve_count / solve_wall
+            if solve_count > 0 and solve_wall > 0
+            else None,
+            "nfev_per_solve": solver_nfev / solve_count if solve_count > 0 else None,
+            "stages": [
+                {"stage": stage, **values} for stage, values in self.stages.items()
+            ],
+        }
+
+    @staticmethod
+    def append_log(record):
+        """環境変数 KK_MESH_PERF_LOG にパスがあれば、記録を JSON Lines で追記する。"""
+        log_path = os.environ.get(MeshPerformanceRecorder.LOG_PATH_ENV)
+        if not log_path:
+            return
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        try:
+            with (
+                get_perf_log_lock(),
+                open(log_path, "a", encoding="utf-8") as log_file,
+            ):
+                log_file.write(line + "\n")
+        except OSError:
+            # 計測ログが書けなくても生成結果の表示やダウンロードは止めない
+            pass
+
+    @staticmethod
+    def serialize_scene(scene, performance, page):
+        """シーンを bytes へ書き出し、その時間を計測結果とログへ加える。"""
+        started = time.perf_counter()
+        data = bytes(scene)
+        performance["serialize"] = {
+            "wall": time.perf_counter() - started,
+            "bytes": len(data),
+        }
+        MeshPerformanceRecorder.append_log(
+            {
+                "event": "serialize",
+                "page": page,
+                "job_id": performance["job_id"],
+                **performance["serialize"],
+            }
+        )
+        return data
+
+
+class MeshJob:
+    """スケジューラに投入されたメッシュ生成ジョブ1件分の状態。"""
+
+    def __init__(self, job_id, session_id):
+        self.job_id = job_id
+        self.session_id = session_id
+        self.future = None
+        self.progress = ("prepare", None, None, "")
+        self.cancel_event = threading.Event()
+        self.performance = MeshPerformanceRecorder(job_id)
+
+    def report_progress(self, stage, current=None, total=None, note=""):
+        # 進捗報告は文字・三角形チャンクの区切りで呼ばれるため、協調的なキャンセル地点を兼ねる。
+        # ワーカースレッドでは最新の進捗を記録するだけにし、描画はセッション側で行う
+        if self.cancel_event.is_set():
+            raise MeshJobCancelledError(self.job_id)
+        self.performance.mark(stage)
+        self.progress = (stage, current, total, note)
+
+
+class MeshJobScheduler:
+    """重いメッシュ生成を上限付きワーカープールでバックグラウンド実行する。
+
+    ページ関数は __main__ 上に定義されプロセスへ渡せないため、スレッドプールで
+    同時実行数を絞り、セッションごとの投入数と待ち行列長で受付を制限する。
+    ジョブはスクリプトの再実行をまたいで継続し、結果は Future 経由で受け取る。
+    """
+
+    MAX_WORKERS = 2
+    MAX_PENDING_JOBS = 8
+    MAX_JOBS_PER_SESSION = 1
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, max_workers, max_pending_jobs, max_jobs_per_session):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="mesh-job"
+        )
+        self.max_pending_jobs = max_pending_jobs
+        self.max_jobs_per_session = max_jobs_per_session
+        self.lock = threading.Lock()
+        self.pending_job_ids = []
+        self.active_jobs = {}
+
+    @staticmethod
+    def current_session_id():
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx is not None else "bare"
+
+    def submit(self, session_id, fn, **kwargs):
+        """ジョブを待ち行列へ追加し、(ジョブ, 受付できなかった理由) を返す。
+
+        スケジューラは最初に作ったページ実行のものが使い回され、再実行ごとに
+        作り直される例外クラスとは一致しないため、拒否は例外でなく理由の文字列
+        ("session_limit" / "queue_full") で返す。受付できた場合の理由は None。
+        """
+        with self.lock:
+            session_job_count = sum(
+                1 for job in self.active_jobs.values() if job.session_id == session_id
+            )
+            if session_job_count >= self.max_jobs_per_session:
+                return None, "session_limit"
+            if len(self.pending_job_ids) >= self.max_pending_jobs:
+                return None, "queue_full"
+            job = MeshJob(uuid.uuid4().hex, session_id)
+            self.active_jobs[job.job_id] = job
+            self.pending_job_ids.append(job.job_id)
+            job.future = self.executor.submit(self.run_job, job, fn, kwargs)
+        return job, None
+
+    def run_job(self, job, fn, kwargs):
+        with self.lock:
+            self.pending_job_ids.remove(job.job_id)
+        try:
+            return fn(progress_callback=job.report_progress, **kwargs)
+        finally:
+            job.performance.finish()
+            with self.lock:
+                self.active_jobs.pop(job.job_id, None)
+
+    def queue_position(self, job):
+        """待機中なら1始まりの順番、実行開始後は0を返す。"""
+        with self.lock:
+            if job.job_id in self.pending_job_ids:
+                return self.pending_job_ids.index(job.job_id) + 1
+        return 0
+
+    def cancel(self, job):
+        """ジョブへキャンセルを要求し、まだ実行前であればその場で取り消す。"""
+        job.cancel_event.set()
+        if job.future.cancel():
+            with self.lock:
+                if job.job_id in self.pending_job_ids:
+                    self.pending_job_ids.remove(job.job_id)
+                self.active_jobs.pop(job.job_id, None)
+
+    def report_status(self, job, progress_callback, lang="ja"):
+        """待ち順または最新の進捗を進捗表示へ反映する。"""
+        position = self.queue_position(job)
+        if position > 0:
+            progress_callback(
+                "queued",
+                note=get_text("job_queue_position", lang).format(position=position),
+            )
+        else:
+            progress_callback(*job.progress)
+
+
+@st.cache_resource
+def get_mesh_job_scheduler():
+    """プロセス全体で共有するメッシュ生成スケジューラを返す。
+
+    カリグラファーと SVG ビルダーは同一ソースのこの関数を持つため、
+    キャッシュキーが一致し同じワーカープールを共有する。
+    """
+    return MeshJobScheduler(
+        max_workers=MeshJobScheduler.MAX_WORKERS,
+        max_pending_jobs=MeshJobScheduler.MAX_PENDING_JOBS,
+        max_jobs_per_session=MeshJobScheduler.MAX_JOBS_PER_SESSION,
+    )
+
+
 class DotRenderPipeline:
     """ドット(平面)レンダリング関連の設定と処理入口を集約する。"""
 
@@ -1174,58 +1670,117 @@ class DotRenderPipeline:
         return char_pixels_list, char_center_cols, raw_plane_count
 
     @staticmethod
-    def build_char_folders(
+    def build_char_entries(
         text,
-        char_pixels_list,
-        char_center_cols,
-        desired_centers,
+        font,
+        font_size,
+        per_char_resolution,
+        canvas_width,
+        canvas_height,
+        effective_threshold,
         plane_template,
-        folder_obj,
-        grid_width,
         spacing,
         threshold,
         color,
         edge_color,
         antialias,
         plane_scale,
-        global_start_x,
         global_start_z,
-        per_char_resolution,
         merge_horizontal,
         merge_color_threshold,
+        font_path=None,
+        char_cache=None,
+    ):
+        """文字ごとのピクセルと平面を求める。キャッシュ済みの文字は再利用する。"""
+        cache_key_base = (
+            "dot",
+            str(font_path),
+            font_size,
+            per_char_resolution,
+            canvas_width,
+            canvas_height,
+            effective_threshold,
+            spacing,
+            threshold,
+            antialias,
+            plane_scale,
+            global_start_z,
+            merge_horizontal,
+            merge_color_threshold,
+            repr(plane_template),
+        )
+        if antialias:
+            # アンチエイリアス時は色の混ざり方で平面の結合が変わるため色もキーに含める
+            cache_key_base += (repr(color), repr(edge_color))
+
+        char_entries = []
+        for char in text:
+            cache_key = (char, *cache_key_base)
+            entry = char_cache.get(cache_key) if char_cache is not None else None
+            if entry is None:
+                (
+                    char_pixels_list,
+                    char_center_cols,
+                    raw_plane_count,
+                ) = DotRenderPipeline.build_char_pixels(
+                    char,
+                    font,
+                    font_size,
+                    per_char_resolution,
+                    canvas_width,
+                    canvas_height,
+                    effective_threshold,
+                )
+                # 文字の見た目中心を原点にしたローカル座標で平面を作り、
+                # 文字の並び位置に依存せず再利用できるようにする。
+                planes, planes_horizontal = DotRenderPipeline.pixels_to_planes(
+                    np.fliplr(char_pixels_list[0]),
+                    plane_template,
+                    spacing=spacing,
+                    threshold=threshold,
+                    color=color,
+                    edge_color=edge_color,
+                    antialias=antialias,
+                    scale=plane_scale,
+                    start_x=-char_center_cols[0] * spacing,
+                    start_z=global_start_z,
+                    merge_horizontal=merge_horizontal,
+                    merge_color_threshold=merge_color_threshold,
+                )
+                entry = {
+                    "raw_plane_count": raw_plane_count,
+                    "planes": planes,
+                    "planes_horizontal": planes_horizontal,
+                }
+            elif not antialias:
+                # 色はキーに含めていないため、再利用した平面へ現在の色を塗り直す
+                stamp_color_slots(
+                    collect_color_slots(entry["planes"], "fill"), {"fill": color}
+                )
+            if char_cache is not None:
+                char_cache.put(cache_key, entry)
+            char_entries.append(entry)
+        return char_entries
+
+    @staticmethod
+    def build_char_folders(
+        text,
+        char_entries,
+        desired_centers,
+        folder_obj,
+        grid_width,
+        spacing,
+        global_start_x,
     ):
-        """文字ごとの平面とフォルダを生成し、中心比率に沿って配置する。"""
+        """文字ごとの平面をフォルダにまとめ、中心比率に沿って配置する。"""
         char_folders = []
         plane_count = 0
         plane_count_horizontal = 0
 
         for index, char in enumerate(text):
-            # 左右反転を補正し、座標系の向きに合わせる。
-            char_pixels = np.fliplr(char_pixels_list[index])
-            center_col = char_center_cols[index]
-
-            # 文字画像の左端位置（X）を、文字ごとの解像度に基づいて配置する。
-            char_start_x = global_start_x + index * per_char_resolution * spacing
-            center_x = char_start_x + center_col * spacing
-            planes, planes_horizontal = DotRenderPipeline.pixels_to_planes(
-                char_pixels,
-                plane_template,
-                spacing=spacing,
-                threshold=threshold,
-                color=color,
-                edge_color=edge_color,
-                antialias=antialias,
-                scale=plane_scale,
-                start_x=char_start_x,
-                start_z=global_start_z,
-                merge_horizontal=merge_horizontal,
-                merge_color_threshold=merge_color_threshold,
-            )
-            # ローカル中心に合わせて平面をオフセットする。
-            for plane in planes:
-                plane["data"]["position"]["x"] -= center_x
+            planes = char_entries[index]["planes"]
             plane_count += len(planes)
-            plane_count_horizontal += planes_horizontal
+            plane_count_horizontal += char_entries[index]["planes_horizontal"]
 
             # PIL上の中心比率を、シーンのX座標へ変換する。
             desired_center_x = global_start_x + (grid_width - 1) * spacing * (
@@ -1236,7 +1791,8 @@ class DotRenderPipeline:
             char_label = char if char.strip() else "空白"
             char_folder["data"]["name"] = f"文字_{index + 1}_{char_label}"
             char_folder["data"]["position"]["x"] = desired_center_x
-            char_folder["data"]["child"] = planes
+            # 同じ文字が複数あってもフォルダごとに別のリストを持たせる
+            char_folder["data"]["child"] = list(planes)
             char_folder["data"]["treeState"] = 1
             char_folders.append(char_folder)
 
@@ -1532,23 +2088,54 @@ class DotRenderPipeline:
     ):
         """ドットモード生成前に最終平面数を見積もる。"""
         font = load_font(font_size, font_path)
-        canvas_width, canvas_height = DotRenderPipeline.compute_canvas_size(
-            text, font, DotRenderConfig.CHAR_CANVAS_PADDING
-        )
-        effective_threshold = 1 if antialias else 128
-        char_pixels_list, _, raw_plane_count = DotRenderPipeline.build_char_pixels(
+        glyph_images = DotRenderPipeline.render_char_glyphs(text, font, font_size)
+        return DotRenderPipeline.count_planes_for_resolution(
             text,
-            font,
-            font_size,
+            glyph_images,
             per_char_resolution,
-            canvas_width,
-            canvas_height,
-            effective_threshold,
+            color=color,
+            edge_color=edge_color,
+            antialias=antialias,
+            merge_horizontal=merge_horizontal,
+            merge_color_threshold=merge_color_threshold,
         )
 
-        plane_count = 0
-        plane_count_horizontal = 0
-        for char_pixels in char_pixels_list:
+    @staticmethod
+    def render_char_glyphs(text, font, font_size):
+        """文字ごとの描画画像を返す。細かさに依存しないので見積もりで使い回せる。"""
+        canvas_width, canvas_height = DotRenderPipeline.compute_canvas_size(
+            text, font, DotRenderConfig.CHAR_CANVAS_PADDING
+        )
+        glyph_images = {}
+        for char in text:
+            if char not in glyph_images:
+                glyph_images[char] = text_to_image(
+                    char,
+                    font_size=font_size,
+                    font=font,
+                    canvas_width=canvas_width,
+                    canvas_height=canvas_height,
+                )
+        return glyph_images
+
+    @staticmethod
+    def count_planes_for_resolution(
+        text,
+        glyph_images,
+        per_char_resolution,
+        color=None,
+        edge_color=None,
+        antialias=True,
+        merge_horizontal=False,
+        merge_color_threshold=0.05,
+    ):
+        """描画済みの文字画像から、指定の細かさでの平面数を数える。"""
+        effective_threshold = 1 if antialias else 128
+        char_counts = {}
+        for char, glyph_image in glyph_images.items():
+            char_pixels = resample_image(
+                glyph_image, per_char_resolution, per_char_resolution
+            )
             char_plane_count, char_horizontal_count = (
                 DotRenderPipeline.count_planes_from_pixels(
                     np.fliplr(char_pixels),
@@ -1559,8 +2146,21 @@ class DotRenderPipeline:
                     merge_color_threshold=merge_color_threshold,
                 )
             )
+            char_counts[char] = (
+                char_plane_count,
+                char_horizontal_count,
+                int(np.sum(char_pixels >= effective_threshold)),
+            )
+
+        # 同じ文字は一度だけ数え、出現回数分を合計する。
+        plane_count = 0
+        plane_count_horizontal = 0
+        raw_plane_count = 0
+        for char in text:
+            char_plane_count, char_horizontal_count, char_raw_count = char_counts[char]
             plane_count += char_plane_count
             plane_count_horizontal += char_horizontal_count
+            raw_plane_count += char_raw_count
 
         return {
             "plane_count": plane_count,
@@ -1568,6 +2168,67 @@ class DotRenderPipeline:
             "raw_plane_count": raw_plane_count,
         }
 
+    @staticmethod
+    def tune_resolution_for_budget(
+        text,
+        font_size,
+        plane_budget,
+        color=None,
+        edge_color=None,
+        antialias=True,
+        font_path=None,
+        merge_horizontal=False,
+        merge_color_threshold=0.05,
+    ):
+        """平面数が予算に収まる最大の細かさを二分探索で求める。
+
+        文字画像は一度だけ描画し、各候補の細かさでは縮小と数え上げだけを行う。
+        """
+        font = load_font(font_size, font_path)
+        glyph_images = DotRenderPipeline.render_char_glyphs(text, font, font_size)
+        candidates = list(
+            range(
+                DotRenderConfig.MIN_RESOLUTION,
+                DotRenderConfig.MAX_RESOLUTION + 1,
+                DotRenderConfig.RESOLUTION_STEP,
+            )
+        )
+        estimates = {}
+
+        def probe(resolution):
+            if resolution not in estimates:
+                estimates[resolution] = DotRenderPipeline.count_planes_for_resolution(
+                    text,
+                    glyph_images,
+                    resolution,
+                    color=color,
+                    edge_color=edge_color,
+                    antialias=antialias,
+                    merge_horizontal=merge_horizontal,
+                    merge_color_threshold=merge_color_threshold,
+                )
+            return estimates[resolution]
+
+        # 平面数は細かさに対してほぼ単調に増えるので、収まる最大の候補を二分探索する。
+        low = 0
+        high = len(candidates) - 1
+        best_index = None
+        while low <= high:
+            mid = (low + high) // 2
+            if probe(candidates[mid])["plane_count"] <= plane_budget:
+                best_index = mid
+                low = mid + 1
+            else:
+                high = mid - 1
+
+        resolution = candidates[best_index if best_index is not None else 0]
+        return {
+            "resolution": resolution,
+            "fits": best_index is not None,
+            "probe_count": len(estimates),
+            **probe(resolution),
+        }
+
     @staticmethod
     def generate_text_scene(
         text,
@@ -1588,6 +2249,7 @@ class DotRenderPipeline:
         merge_color_threshold=0.05,
         generation_metadata=None,
         lang="ja",
+        char_cache=None,
     ):
         """テキストから3Dシーンを生成"""
         # spacing = scale × 0.2 の関係を利用
@@ -1615,45 +2277,52 @@ class DotRenderPipeline:
         desired_centers = DotRenderPipeline.compute_text_center_ratios(
             text, font, img.width
         )
-        (
-            char_pixels_list,
-            char_center_cols,
-            raw_plane_count,
-        ) = DotRenderPipeline.build_char_pixels(
-            text,
-            font,
-            font_size,
-            per_char_resolution,
-            canvas_width,
-            canvas_height,
-            effective_threshold,
-        )
-        # プレビューは元画像をグリッドサイズに合わせて縮小する。
-        preview_pixels = build_preview_from_image(img, grid_width, grid_height)
-
-        # 文字ごとの平面を構築し、フォルダにまとめる。
-        char_folders, plane_count, plane_count_horizontal = (
-            DotRenderPipeline.build_char_folders(
+        if char_cache is not None:
+            char_cache.reset_pending()
+        try:
+            char_entries = DotRenderPipeline.build_char_entries(
                 text,
-                char_pixels_list,
-                char_center_cols,
-                desired_centers,
+                font,
+                font_size,
+                per_char_resolution,
+                canvas_width,
+                canvas_height,
+                effective_threshold,
                 plane_template,
-                folder_obj,
-                grid_width,
                 spacing,
                 threshold,
                 color,
                 edge_color,
                 antialias,
                 plane_scale,
-                global_start_x,
                 global_start_z,
-                per_char_resolution,
                 merge_horizontal,
                 merge_color_threshold,
+                font_path=font_path,
+                char_cache=char_cache,
+            )
+        except Exception:
+            if char_cache is not None:
+                char_cache.reset_pending()
+            raise
+        raw_plane_count = sum(entry["raw_plane_count"] for entry in char_entries)
+        # プレビューは元画像をグリッドサイズに合わせて縮小する。
+        preview_pixels = build_preview_from_image(img, grid_width, grid_height)
+
+        # 文字ごとの平面をフォルダにまとめ、全体の配置だけを毎回計算し直す。
+        char_folders, plane_count, plane_count_horizontal = (
+            DotRenderPipeline.build_char_folders(
+                text,
+                char_entries,
+                desired_centers,
+                folder_obj,
+                grid_width,
+                spacing,
+                global_start_x,
             )
         )
+        if char_cache is not None:
+            char_cache.commit()
 
         # 3. シーンを作成
         scene = HoneycomeSceneData()
@@ -1714,23 +2383,40 @@ class DotRenderPipeline:
             "merge_horizontal": False,
             "merge_color_threshold": 0.0,
             "plane_size_factor": 1.0,
+            "auto_resolution": False,
+            "plane_budget": DotRenderConfig.DEFAULT_PLANE_BUDGET,
         }
 
     @staticmethod
     def render_advanced_settings(lang):
         settings = DotRenderPipeline.default_advanced_settings()
         col1, col2 = st.columns(2)
+        with col2:
+            settings["threshold"] = 1
+            settings["auto_resolution"] = st.checkbox(
+                get_text("auto_resolution_label", lang),
+                value=False,
+                help=get_text("auto_resolution_help", lang),
+            )
+            if settings["auto_resolution"]:
+                settings["plane_budget"] = st.number_input(
+                    get_text("plane_budget_label", lang),
+                    min_value=1_000,
+                    max_value=DotRenderConfig.MAX_PLANE_COUNT,
+                    value=DotRenderConfig.DEFAULT_PLANE_BUDGET,
+                    step=1_000,
+                    help=get_text("plane_budget_help", lang),
+                )
         with col1:
             settings["per_char_resolution"] = st.slider(
                 get_text("resolution_label", lang),
-                min_value=10,
-                max_value=200,
+                min_value=DotRenderConfig.MIN_RESOLUTION,
+                max_value=DotRenderConfig.MAX_RESOLUTION,
                 value=DotRenderConfig.DEFAULT_RESOLUTION,
-                step=5,
+                step=DotRenderConfig.RESOLUTION_STEP,
                 help=get_text("resolution_help", lang),
+                disabled=settings["auto_resolution"],
             )
-        with col2:
-            settings["threshold"] = 1
         settings["antialias"] = st.checkbox(
             get_text("antialias_label", lang), value=False
         )
@@ -1752,6 +2438,51 @@ class DotRenderPipeline:
         )
         return settings
 
+    @staticmethod
+    def apply_auto_resolution(
+        *, text_input, font_size, color, selected_font, dot_settings, lang
+    ):
+        """自動調整が有効なら、平面数の目安に収まる細かさへ置き換えた設定を返す。"""
+        if not dot_settings["auto_resolution"]:
+            return dot_settings
+        tuned = DotRenderPipeline.tune_resolution_for_budget(
+            text=text_input,
+            font_size=font_size,
+            plane_budget=dot_settings["plane_budget"],
+            color=color,
+            edge_color=hex_to_color(dot_settings["edge_color_hex"]),
+            antialias=dot_settings["antialias"],
+            font_path=selected_font,
+            merge_horizontal=dot_settings["merge_horizontal"],
+            merge_color_threshold=dot_settings["merge_color_threshold"],
+        )
+        message = get_text(
+            "auto_resolution_result"
+            if tuned["fits"]
+            else "auto_resolution_over_budget",
+            lang,
+        ).format(
+            resolution=tuned["resolution"],
+            count=tuned["plane_count"],
+            budget=dot_settings["plane_budget"],
+        )
+        if tuned["fits"]:
+            st.info(message)
+        else:
+            st.warning(message)
+        return {**dot_settings, "per_char_resolution": tuned["resolution"]}
+
+    @staticmethod
+    def build_geometry_key(dot_settings, color_hex, color_alpha):
+        """色替えだけで再利用できる生成結果を識別するキーを作る。"""
+        settings = dict(dot_settings)
+        if settings["antialias"]:
+            # アンチエイリアス時は色の混ざり方で平面の結合が変わるため色もキーに含める
+            settings["color"] = (color_hex, color_alpha)
+        else:
+            settings.pop("edge_color_hex")
+        return tuple(sorted(settings.items()))
+
     @staticmethod
     def build_generation_metadata(
         *,
@@ -1850,6 +2581,7 @@ class DotRenderPipeline:
                 merge_color_threshold=dot_settings["merge_color_threshold"],
                 generation_metadata=generation_metadata,
                 lang=lang,
+                char_cache=get_char_result_cache("calligrapher_dot_char_cache"),
             )
         return {
             "scene": scene,
@@ -1860,6 +2592,9 @@ class DotRenderPipeline:
             "raw_plane_count": raw_plane_count,
             "mesh_stats": None,
             "triangulation_preview": None,
+            "color_slots": collect_color_slots(
+                scene.objects[folder_key]["data"]["child"], "fill"
+            ),
         }
 
     generate_scene = generate_text_scene
@@ -1871,6 +2606,23 @@ class MeshRenderPipeline:
     Config = MeshRenderConfig
     Solver = TriangleSolverLMReparam
 
+    @staticmethod
+    def resolve_mesh_font_path(font_path):
+        """メッシュ化に使うフォントファイルを返す。未指定なら最初の利用可能フォント。"""
+        if font_path is not None:
+            return font_path
+        available_fonts = list_available_fonts()
+        if not available_fonts:
+            raise RuntimeError("No font file found for mesh generation")
+        return available_fonts[0]
+
+    @staticmethod
+    def check_missing_glyphs(text, font_path):
+        """フォントに未収録の文字があれば最初の1文字で MissingGlyphError を送出する。"""
+        missing_glyphs = MeshRenderPipeline.find_missing_glyphs(text, font_path)
+        if missing_glyphs:
+            raise MissingGlyphError(missing_glyphs[0])
+
     @staticmethod
     def find_missing_glyphs(text, font_path):
         """フォント cmap に存在しない文字(空白類は除外)を返す。"""
@@ -1902,9 +2654,15 @@ class MeshRenderPipeline:
         triangulate_stage="triangulate",
         solve_stage="solve",
         progress_callback=None,
+        settings=DEFAULT_MESH_RENDER_SETTINGS,
+        char_cache=None,
     ):
-        """文字輪郭を wildmeshing で三角形分割し、親平面+子三角形で表現する。"""
-        solver = TriangleSolverLMReparam(MeshRenderConfig.SOURCE_TRIANGLE)
+        """文字輪郭を wildmeshing で三角形分割し、親平面+子三角形で表現する。
+
+        ``char_cache`` を渡すと、同じ輪郭の文字は三角形分割と求解の結果を再利用し、
+        オブジェクトだけを現在のテンプレートと色で組み立て直す。
+        """
+        solver = TriangleSolverLMReparam(MeshRenderConfig.SOURCE_TRIANGLE, settings)
         char_folders = []
         triangle_count = 0
         raw_triangle_count = 0
@@ -1915,11 +2673,28 @@ class MeshRenderPipeline:
         triangle_status_records = []
         triangles_per_char = []
         char_count = len(text)
+        solve_count = 0
+        solver_nfev = 0
+
+        char_cache_keys = []
+        run_triangles = {}
 
         for index, char in enumerate(text):
             char_data = char_mesh_data[index]
             contours = char_data["contours"]
-            triangles = MeshRenderPipeline.triangulate_contours(contours)
+            cache_key = MeshRenderPipeline.build_char_cache_key(
+                contours, settings, reconstruction_max_abs_tol
+            )
+            char_cache_keys.append(cache_key)
+            cached = char_cache.get(cache_key) if char_cache is not None else None
+            if cached is not None:
+                triangles = cached["triangles"]
+            elif cache_key in run_triangles:
+                # 同じ文字が繰り返し出てくる場合は今回の分割結果を使い回す
+                triangles = run_triangles[cache_key]
+            else:
+                triangles = MeshRenderPipeline.triangulate_contours(contours, settings)
+                run_triangles[cache_key] = triangles
             triangles_per_char.append(triangles)
             raw_triangle_count += len(triangles)
 
@@ -1936,13 +2711,19 @@ class MeshRenderPipeline:
         solve_progress_step = (
             max(1, total_triangles // 250) if total_triangles > 0 else 1
         )
+        run_solves = {}
 
         for index, char in enumerate(text):
             char_data = char_mesh_data[index]
             triangles = triangles_per_char[index]
             triangle_objects = []
             folder_x = char_data["folder_x"]
-            for triangle in triangles:
+            cache_key = char_cache_keys[index]
+            cached = char_cache.get(cache_key) if char_cache is not None else None
+            if cached is None:
+                cached = run_solves.get(cache_key)
+            solves = cached["solves"] if cached is not None else []
+            for triangle_index, triangle in enumerate(triangles):
                 processed_triangles += 1
                 if progress_callback is not None and (
                     processed_triangles == 1
@@ -1956,18 +2737,18 @@ class MeshRenderPipeline:
                         note=f"{char}",
                     )
 
-                triangle_object, solved = MeshRenderPipeline.create_sheared_triangle(
-                    plane_template,
-                    triangle_template,
-                    triangle,
-                    color,
-                    solver,
-                    y_offset=y_offset,
-                    reconstruction_max_abs_tol=reconstruction_max_abs_tol,
-                )
+                if cached is not None:
+                    solved = solves[triangle_index]
+                else:
+                    solved = MeshRenderPipeline.solve_sheared_triangle(
+                        triangle, solver, reconstruction_max_abs_tol
+                    )
+                    solves.append(solved)
+                    solve_count += 1
+                    solver_nfev += solved.get("nfev", 0)
                 shifted_triangle = triangle.copy()
                 shifted_triangle[:, 0] += folder_x
-                if triangle_object is None:
+                if "rejected_reason" in solved:
                     rejected_reason = solved.get(
                         "rejected_reason", "solve_not_converged"
                     )
@@ -2004,8 +2785,20 @@ class MeshRenderPipeline:
                         "folder_x": folder_x,
                     }
                 )
-                triangle_objects.append(triangle_object)
+                triangle_objects.append(
+                    MeshRenderPipeline.build_sheared_triangle_object(
+                        plane_template,
+                        triangle_template,
+                        solved,
+                        color,
+                        y_offset=y_offset,
+                    )
+                )
 
+            entry = {"triangles": triangles, "solves": solves}
+            run_solves[cache_key] = entry
+            if char_cache is not None:
+                char_cache.put(cache_key, entry)
             triangle_count += len(triangle_objects)
 
             char_folder = copy.deepcopy(folder_obj)
@@ -2017,6 +2810,8 @@ class MeshRenderPipeline:
             char_folders.append(char_folder)
 
         mesh_stats = {
+            "solve_count": solve_count,
+            "solver_nfev": solver_nfev,
             "solve_failed_count": solve_failed_count,
             "reconstruction_failed_count": reconstruction_failed_count,
             "reconstruction_tol": reconstruction_max_abs_tol,
@@ -2035,6 +2830,124 @@ class MeshRenderPipeline:
             triangle_status_records,
         )
 
+    @staticmethod
+    def build_char_cache_key(contours, settings, reconstruction_max_abs_tol):
+        """文字輪郭の形状と設定から、分割・求解結果を再利用するためのキーを作る。"""
+        digest = hashlib.blake2b(digest_size=16)
+        for contour in contours:
+            # 文字位置による浮動小数点の端数で外れないよう丸め、-0.0 も 0.0 に揃える
+            rounded = np.round(np.asarray(contour, dtype=np.float64), 9) + 0.0
+            digest.update(rounded.tobytes())
+            digest.update(b"|")
+        return (digest.hexdigest(), settings, reconstruction_max_abs_tol)
+
+    @staticmethod
+    def ring_next_indices(lengths):
+        """連結した閉路の頂点配列で、各頂点の次の頂点 (末尾は先頭へ戻る) の添字を返す。"""
+        ring_lengths = np.asarray(lengths, dtype=np.int64)
+        ring_ends = np.cumsum(ring_lengths)
+        next_indices = np.arange(int(ring_ends[-1]) if len(ring_ends) else 0) + 1
+        next_indices[ring_ends[ring_lengths > 0] - 1] = (ring_ends - ring_lengths)[
+            ring_lengths > 0
+        ]
+        return next_indices
+
+    @staticmethod
+    def scanline_fill_mask(starts, ends, polygon_ids, shape):
+        """辺の集合を走査線で塗りつぶした (高さ, 幅) の真偽マスクを返す。
+
+        同じ polygon_ids を持つ辺どうしは偶奇規則で組にし、異なる id の多角形は
+        重ねて塗る。ピクセル中心が内側にあるピクセルを塗る。
+        """
+        height, width = shape
+        mask = np.zeros((height, width), dtype=bool)
+        if len(starts) == 0 or height <= 0 or width <= 0:
+            return mask
+        x0, y0 = starts[:, 0], starts[:, 1]
+        x1, y1 = ends[:, 0], ends[:, 1]
+        # 辺が横切る走査線 (ピクセル中心 row + 0.5 が [下端, 上端) に入る行)
+        row_first = np.maximum(np.ceil(np.minimum(y0, y1) - 0.5), 0).astype(np.int64)
+        row_last = np.minimum(np.ceil(np.maximum(y0, y1) - 0.5) - 1, height - 1).astype(
+            np.int64
+        )
+        counts = np.maximum(row_last - row_first + 1, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return mask
+
+        edge_index = np.repeat(np.arange(len(starts)), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = row_first[edge_index] + offsets
+        t = (rows + 0.5 - y0[edge_index]) / (y1[edge_index] - y0[edge_index])
+        xs = x0[edge_index] + t * (x1[edge_index] - x0[edge_index])
+        ids = np.asarray(polygon_ids)[edge_index]
+
+        # (多角形, 行, x) の順を1つの実数キーにまとめて並べる。x は画像の外側を
+        # 丸めても列へ切り詰めた結果が変わらないので、キーの桁が揃う範囲に収める
+        xs = np.clip(xs, -1.0, width + 1.0)
+        order = np.argsort((ids * height + rows) * (width + 3.0) + (xs + 1.0))
+        rows = rows[order]
+        xs = xs[order]
+        ids = ids[order]
+        # 多角形と行が同じ交点を左から2つずつ組にして区間にする
+        group_start = np.ones(total, dtype=bool)
+        group_start[1:] = (ids[1:] != ids[:-1]) | (rows[1:] != rows[:-1])
+        start_index = np.flatnonzero(group_start)
+        position = np.arange(total) - np.repeat(
+            start_index, np.diff(np.append(start_index, total))
+        )
+        left = np.flatnonzero(position % 2 == 0)
+        left = left[left + 1 < total]
+        left = left[~group_start[left + 1]]
+
+        span_rows = rows[left]
+        col_start = np.clip(np.ceil(xs[left] - 0.5), 0, width).astype(np.int64)
+        col_end = np.clip(np.ceil(xs[left + 1] - 0.5), 0, width).astype(np.int64)
+        valid = col_end > col_start
+        if not valid.any():
+            return mask
+        # 区間の始まりで +1、終わりで -1 して行方向に累積すると塗る範囲になる
+        stride = width + 1
+        size = height * stride
+        diff = np.bincount(
+            span_rows[valid] * stride + col_start[valid], minlength=size
+        ) - np.bincount(span_rows[valid] * stride + col_end[valid], minlength=size)
+        return np.cumsum(diff.reshape(height, stride)[:, :width], axis=1) > 0
+
+    @staticmethod
+    def rasterize_line_mask(starts, ends, shape):
+        """線分の集合を幅1ピクセルで描いた (高さ, 幅) の真偽マスクを返す。"""
+        height, width = shape
+        mask = np.zeros((height, width), dtype=bool)
+        if len(starts) == 0:
+            return mask
+        delta = ends - starts
+        counts = np.ceil(np.abs(delta).max(axis=1)).astype(np.int64) + 1
+        total = int(counts.sum())
+        edge_index = np.repeat(np.arange(len(starts)), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        t = offsets / np.maximum(counts[edge_index] - 1, 1)
+        points = starts[edge_index] + delta[edge_index] * t[:, None]
+        cols = np.floor(points[:, 0]).astype(np.int64)
+        rows = np.floor(points[:, 1]).astype(np.int64)
+        inside = (cols >= 0) & (cols < width) & (rows >= 0) & (rows < height)
+        mask[rows[inside], cols[inside]] = True
+        return mask
+
+    @staticmethod
+    def select_preview_triangles(priorities, limit):
+        """枠線を描く三角形を、失敗したものを優先しつつ上限まで間引いて選ぶ。"""
+        if len(priorities) <= limit:
+            return np.arange(len(priorities))
+        failed = np.flatnonzero(priorities > 0)[:limit]
+        accepted = np.flatnonzero(priorities == 0)
+        remaining = limit - len(failed)
+        if remaining <= 0 or len(accepted) == 0:
+            return failed
+        # 文字の並び順に等間隔で拾い、文字全体にまんべんなく散らす
+        picks = np.linspace(0, len(accepted) - 1, remaining).astype(np.int64)
+        return np.sort(np.concatenate([failed, accepted[np.unique(picks)]]))
+
     @staticmethod
     def build_mesh_triangulation_preview(
         char_mesh_data, triangle_status_records, width=900, height=360, padding=24
@@ -2054,12 +2967,12 @@ class MeshRenderPipeline:
         if not global_contours and not global_triangles:
             return None
 
-        points = []
-        for contour in global_contours:
-            points.append(contour)
-        for record in global_triangles:
-            points.append(record["triangle"])
-        all_points = np.vstack(points)
+        triangles = (
+            np.stack([record["triangle"] for record in global_triangles])
+            if global_triangles
+            else np.zeros((0, 3, 2), dtype=np.float64)
+        )
+        all_points = np.vstack([*global_contours, triangles.reshape(-1, 2)])
         min_x = float(np.min(all_points[:, 0]))
         max_x = float(np.max(all_points[:, 0]))
         min_y = float(np.min(all_points[:, 1]))
@@ -2086,15 +2999,20 @@ class MeshRenderPipeline:
         plot_offset_x = plot_left + (plot_width - scaled_width) * 0.5
         plot_offset_y = plot_top + (plot_height - scaled_height) * 0.5
 
-        def project(point):
+        def project(points):
             # グリフ座標をシーンXZへ正規化する際に反転が入るため、
             # プレビュー側はX/Yを反転して見た目を元の文字方向に合わせる。
-            x = plot_offset_x + (max_x - point[0]) * scale
-            y = (plot_offset_y + scaled_height) - (max_y - point[1]) * scale
-            return float(x), float(y)
-
-        image = Image.new("RGBA", (width, height), (18, 20, 24, 255))
-        draw = ImageDraw.Draw(image, "RGBA")
+            projected = np.empty(points.shape, dtype=np.float64)
+            projected[..., 0] = plot_offset_x + (max_x - points[..., 0]) * scale
+            projected[..., 1] = (plot_offset_y + scaled_height) - (
+                max_y - points[..., 1]
+            ) * scale
+            return projected
+
+        # ImageDraw の塗りと同じく、色は合成せずにそのまま置き換える
+        shape = (height, width)
+        canvas = np.empty((height, width, 4), dtype=np.uint8)
+        canvas[:] = (18, 20, 24, 255)
 
         status_style = {
             "accepted": {
@@ -2117,28 +3035,61 @@ class MeshRenderPipeline:
             },
         }
 
-        sorted_records = sorted(
-            global_triangles,
-            key=lambda record: status_style.get(
-                record["status"], status_style["accepted"]
-            )["priority"],
-        )
-        for record in sorted_records:
-            style = status_style.get(record["status"], status_style["accepted"])
-            projected = [project(vertex) for vertex in record["triangle"]]
-            draw.polygon(projected, fill=style["fill"], outline=style["outline"])
-
-        for contour in global_contours:
-            projected = [project(vertex) for vertex in contour]
-            if len(projected) >= 2:
-                draw.line(
-                    projected + [projected[0]], fill=(220, 220, 220, 220), width=1
-                )
+        priorities = np.array(
+            [
+                status_style.get(record["status"], status_style["accepted"])["priority"]
+                for record in global_triangles
+            ],
+            dtype=np.int64,
+        )
+        projected_triangles = project(triangles)
+        # 塗りは全三角形をまとめて走査線で描き、枠線は上限までに間引いて描く
+        outlined = np.zeros(len(triangles), dtype=bool)
+        outlined[
+            MeshRenderPipeline.select_preview_triangles(
+                priorities, MeshRenderConfig.PREVIEW_TRIANGLE_LIMIT
+            )
+        ] = True
+        for style in sorted(status_style.values(), key=lambda item: item["priority"]):
+            selected = priorities == style["priority"]
+            if not selected.any():
+                continue
+            fill_mask = MeshRenderPipeline.scanline_fill_mask(
+                projected_triangles[selected].reshape(-1, 2),
+                np.roll(projected_triangles[selected], -1, axis=1).reshape(-1, 2),
+                np.repeat(np.arange(int(selected.sum())), 3),
+                shape,
+            )
+            canvas[fill_mask] = style["fill"]
+            outline_triangles = projected_triangles[selected & outlined]
+            outline_mask = MeshRenderPipeline.rasterize_line_mask(
+                outline_triangles.reshape(-1, 2),
+                np.roll(outline_triangles, -1, axis=1).reshape(-1, 2),
+                shape,
+            )
+            canvas[outline_mask] = style["outline"]
+
+        if global_contours:
+            projected_contours = project(np.vstack(global_contours))
+            contour_mask = MeshRenderPipeline.rasterize_line_mask(
+                projected_contours,
+                projected_contours[
+                    MeshRenderPipeline.ring_next_indices(
+                        [len(contour) for contour in global_contours]
+                    )
+                ],
+                shape,
+            )
+            canvas[contour_mask] = (220, 220, 220, 220)
+
+        image = Image.fromarray(canvas, mode="RGBA")
+        draw = ImageDraw.Draw(image, "RGBA")
 
         legend_x = int(plot_right + legend_gap)
         legend_y = padding
         legend_w = max(120, width - legend_x - padding)
-        legend_h = 64
+        outline_count = int(outlined.sum())
+        legend_h = 64 if outline_count == len(triangles) else 82
         draw.rectangle(
             [(legend_x, legend_y), (legend_x + legend_w, legend_y + legend_h)],
             fill=(10, 10, 10, 180),
@@ -2157,6 +3108,12 @@ class MeshRenderPipeline:
                 outline=(230, 230, 230, 230),
             )
             draw.text((legend_x + 28, top - 1), label, fill=(235, 235, 235, 240))
+        if outline_count != len(triangles):
+            draw.text(
+                (legend_x + 8, legend_y + 62),
+                f"outlines: {outline_count:,} / {len(triangles):,}",
+                fill=(200, 200, 200, 240),
+            )
 
         return image
 
@@ -2457,7 +3414,7 @@ class MeshRenderPipeline:
         return ordered_indices
 
     @staticmethod
-    def triangulate_contours(contours):
+    def triangulate_contours(contours, settings=DEFAULT_MESH_RENDER_SETTINGS):
         """輪郭群を三角形分割し、有効三角形を返す。"""
         valid_contours = MeshRenderPipeline.normalize_contours_for_triangulation(
             contours
@@ -2516,18 +3473,18 @@ class MeshRenderPipeline:
                     V=tri_vertices_input,
                     E=tri_segments_input,
                     feature_info=None,
-                    stop_quality=MeshRenderConfig.TRIWILD_STOP_QUALITY,
-                    max_its=MeshRenderConfig.TRIWILD_MAX_ITS,
-                    stage=MeshRenderConfig.TRIWILD_STAGE,
-                    epsilon=MeshRenderConfig.TRIWILD_EPSILON,
-                    feature_epsilon=MeshRenderConfig.TRIWILD_FEATURE_EPSILON,
-                    target_edge_len=MeshRenderConfig.TRIWILD_TARGET_EDGE_LEN,
-                    edge_length_r=MeshRenderConfig.TRIWILD_EDGE_LENGTH_R,
-                    flat_feature_angle=MeshRenderConfig.TRIWILD_FLAT_FEATURE_ANGLE,
-                    cut_outside=MeshRenderConfig.TRIWILD_CUT_OUTSIDE,
-                    skip_eps=MeshRenderConfig.TRIWILD_SKIP_EPS,
+                    stop_quality=settings.triwild_stop_quality,
+                    max_its=settings.triwild_max_its,
+                    stage=settings.triwild_stage,
+                    epsilon=settings.triwild_epsilon,
+                    feature_epsilon=settings.triwild_feature_epsilon,
+                    target_edge_len=settings.triwild_target_edge_len,
+                    edge_length_r=settings.triwild_edge_length_r,
+                    flat_feature_angle=settings.triwild_flat_feature_angle,
+                    cut_outside=settings.triwild_cut_outside,
+                    skip_eps=settings.triwild_skip_eps,
                     hole_pts=tri_holes_input,
-                    mute_log=MeshRenderConfig.TRIWILD_MUTE_LOG,
+                    mute_log=settings.triwild_mute_log,
                 )
             except (ValueError, RuntimeError, FloatingPointError):
                 continue
@@ -3084,32 +4041,38 @@ class MeshRenderPipeline:
         }
 
     @staticmethod
-    def create_sheared_triangle(
-        plane_template,
-        triangle_template,
+    def solve_sheared_triangle(
         target_triangle,
-        color,
         solver,
-        child_y_scale=0.01,
-        y_offset=0.0,
         reconstruction_max_abs_tol=MeshRenderConfig.RECONSTRUCTION_MAX_ABS_TOL,
     ):
+        """三角形を親平面+子三角形のパラメータへ解き、採否の理由も記録する。"""
         solved = solver.solve(target_triangle)
         residual = solved.get("residual", float("inf"))
         if not np.isfinite(residual):
             solved["rejected_reason"] = "solve_non_finite"
-            return None, solved
+            return solved
         if not solved.get("reachable", False):
             solved["rejected_reason"] = "solve_not_converged"
-            return None, solved
+            return solved
 
         reconstruction = solver.reconstruction_error(target_triangle, solved)
         solved["reconstruction_max_abs"] = reconstruction["max_abs"]
         solved["reconstruction_rmse"] = reconstruction["rmse"]
         if reconstruction["max_abs"] > reconstruction_max_abs_tol:
             solved["rejected_reason"] = "reconstruction_error"
-            return None, solved
+        return solved
 
+    @staticmethod
+    def build_sheared_triangle_object(
+        plane_template,
+        triangle_template,
+        solved,
+        color,
+        child_y_scale=0.01,
+        y_offset=0.0,
+    ):
+        """求解済みのパラメータから親平面+子三角形のオブジェクトを組み立てる。"""
         parent = create_plane(
             plane_template,
             x=solved["px"],
@@ -3148,7 +4111,146 @@ class MeshRenderPipeline:
         child["data"]["child"] = []
 
         parent["data"]["child"] = [child]
-        return parent, solved
+        return parent
+
+    @staticmethod
+    def select_budget_samples(element_keys, weights, sample_size):
+        """三角形数の見積もりに使う代表要素を、複雑さ(頂点数)が散らばるように選ぶ。"""
+        first_index = {}
+        for index, key in enumerate(element_keys):
+            if weights[index] > 0 and key not in first_index:
+                first_index[key] = index
+        ordered = sorted(first_index, key=lambda key: weights[first_index[key]])
+        if len(ordered) <= sample_size:
+            return ordered
+        if sample_size <= 1:
+            return [ordered[len(ordered) // 2]]
+        step = (len(ordered) - 1) / (sample_size - 1)
+        return [ordered[round(position * step)] for position in range(sample_size)]
+
+    @staticmethod
+    def predict_triangle_total(element_keys, weights, measured):
+        """代表要素の実測三角形数と、頂点数の比から全体の三角形数を見積もる。"""
+        sample_weight = 0.0
+        sample_total = 0
+        for key, count in measured.items():
+            sample_weight += weights[element_keys.index(key)]
+            sample_total += count
+        if sample_weight <= 0.0:
+            return sample_total
+        triangles_per_weight = sample_total / sample_weight
+        predicted = 0.0
+        for index, key in enumerate(element_keys):
+            if key in measured:
+                predicted += measured[key]
+            else:
+                predicted += weights[index] * triangles_per_weight
+        return round(predicted)
+
+    @staticmethod
+    def tune_flatten_length_for_budget(
+        text,
+        font_path,
+        text_height,
+        target_height,
+        settings,
+        triangle_budget,
+        outline_width=0.0,
+        progress_callback=None,
+    ):
+        """三角形数の目安に収まる、最も細かい曲線分割長を探す。
+
+        輪郭の平坦化は候補ごとに一度だけ行い、三角形分割は代表文字だけで試す。
+        三角形数は分割長に対してほぼ単調に増えるので、候補を二分探索する。
+        """
+        candidates = MeshRenderConfig.BUDGET_FLATTEN_CANDIDATES
+        element_keys = list(text)
+        predictions = {}
+        sample_keys = None
+
+        def predict(flatten_segment_length):
+            nonlocal sample_keys
+            if flatten_segment_length in predictions:
+                return predictions[flatten_segment_length]
+            char_mesh_data = MeshRenderPipeline.build_text_mesh_characters(
+                text,
+                font_path,
+                text_height=text_height,
+                flatten_segment_length=flatten_segment_length,
+            )
+            weights = [
+                sum(len(contour) for contour in char_data["contours"])
+                for char_data in char_mesh_data
+            ]
+            if sample_keys is None:
+                sample_keys = MeshRenderPipeline.select_budget_samples(
+                    element_keys, weights, MeshRenderConfig.BUDGET_SAMPLE_SIZE
+                )
+            probe_settings = dataclasses.replace(
+                settings, flatten_segment_length=flatten_segment_length
+            )
+            sample_data = [
+                char_mesh_data[element_keys.index(key)] for key in sample_keys
+            ]
+            if outline_width > 0.0:
+                source_height = MeshRenderPipeline.compute_char_mesh_height(
+                    char_mesh_data
+                )
+                scale_factor = (
+                    target_height / source_height if source_height > 1e-9 else 1.0
+                )
+                outline_data = MeshRenderPipeline.build_outline_char_mesh_data(
+                    sample_data, outline_width / max(scale_factor, 1e-9)
+                )
+            else:
+                outline_data = [{"contours": []} for _ in sample_data]
+
+            measured = {}
+            for key, char_data, outline_char_data in zip(
+                sample_keys, sample_data, outline_data
+            ):
+                measured[key] = len(
+                    MeshRenderPipeline.triangulate_contours(
+                        char_data["contours"], probe_settings
+                    )
+                ) + len(
+                    MeshRenderPipeline.triangulate_contours(
+                        outline_char_data["contours"], probe_settings
+                    )
+                )
+            predictions[flatten_segment_length] = (
+                MeshRenderPipeline.predict_triangle_total(
+                    element_keys, weights, measured
+                )
+            )
+            if progress_callback is not None:
+                progress_callback(
+                    stage="tune",
+                    current=len(predictions),
+                    total=math.ceil(math.log2(len(candidates) + 1)),
+                    note=f"{flatten_segment_length:g}",
+                )
+            return predictions[flatten_segment_length]
+
+        low = 0
+        high = len(candidates) - 1
+        best_index = None
+        while low <= high:
+            mid = (low + high) // 2
+            if predict(candidates[mid]) <= triangle_budget:
+                best_index = mid
+                low = mid + 1
+            else:
+                high = mid - 1
+
+        value = candidates[best_index if best_index is not None else 0]
+        return {
+            "value": value,
+            "predicted": predict(value),
+            "fits": best_index is not None,
+            "budget": triangle_budget,
+            "probe_count": len(predictions),
+        }
 
     @staticmethod
     def generate_text_scene_mesh(
@@ -3164,15 +4266,20 @@ class MeshRenderPipeline:
         spacing=None,
         color=None,
         font_path=None,
-        flatten_segment_length=MeshRenderConfig.FLATTEN_SEGMENT_LENGTH_DEFAULT,
+        settings=DEFAULT_MESH_RENDER_SETTINGS,
         outline_width=MeshRenderConfig.OUTLINE_WIDTH_DEFAULT,
         outline_color=None,
         outline_y_offset=MeshRenderConfig.OUTLINE_Y_OFFSET_DEFAULT,
         generation_metadata=None,
         lang="ja",
         progress_callback=None,
+        char_cache=None,
+        triangle_budget=None,
     ):
-        """文字輪郭を三角形メッシュ化して3Dシーンを生成する。"""
+        """文字輪郭を三角形メッシュ化して3Dシーンを生成する。
+
+        ``triangle_budget`` を渡すと、先に曲線の分割長を目安に合わせて決めてから生成する。
+        """
         if spacing is None:
             spacing = text_scale * DotRenderConfig.SPACING_RATIO
 
@@ -3184,17 +4291,10 @@ class MeshRenderPipeline:
         grid_width = compute_grid_width_from_image(img, grid_height)
         preview_pixels = build_preview_from_image(img, grid_width, grid_height)
 
-        if font_path is None:
-            available_fonts = list_available_fonts()
-            if not available_fonts:
-                raise RuntimeError("No font file found for mesh generation")
-            mesh_font_path = available_fonts[0]
-        else:
-            mesh_font_path = font_path
-
-        missing_glyphs = MeshRenderPipeline.find_missing_glyphs(text, mesh_font_path)
-        if missing_glyphs:
-            raise MissingGlyphError(missing_glyphs[0])
+        mesh_font_path = MeshRenderPipeline.resolve_mesh_font_path(font_path)
+        MeshRenderPipeline.check_missing_glyphs(text, mesh_font_path)
+        if char_cache is not None:
+            char_cache.reset_pending()
 
         mesh_height = max(1e-5, spacing * grid_height)
         solve_mesh_height = max(
@@ -3209,11 +4309,31 @@ class MeshRenderPipeline:
             grid_height=grid_height,
             spacing=spacing,
         )
+        budget_tuning = None
+        if triangle_budget is not None:
+            budget_tuning = MeshRenderPipeline.tune_flatten_length_for_budget(
+                text,
+                mesh_font_path,
+                text_height=solve_mesh_height,
+                target_height=dot_alignment_targets["target_height"],
+                settings=settings,
+                triangle_budget=triangle_budget,
+                outline_width=max(0.0, float(outline_width)),
+                progress_callback=progress_callback,
+            )
+            settings = dataclasses.replace(
+                settings, flatten_segment_length=budget_tuning["value"]
+            )
+            if generation_metadata:
+                generation_metadata = {
+                    **generation_metadata,
+                    get_text("meta_mesh_flatten_length", lang): budget_tuning["value"],
+                }
         char_mesh_data = MeshRenderPipeline.build_text_mesh_characters(
             text,
             mesh_font_path,
             text_height=solve_mesh_height,
-            flatten_segment_length=flatten_segment_length,
+            flatten_segment_length=settings.flatten_segment_length,
             progress_callback=progress_callback,
         )
         source_mesh_height = MeshRenderPipeline.compute_char_mesh_height(char_mesh_data)
@@ -3238,11 +4358,15 @@ class MeshRenderPipeline:
             folder_obj,
             color,
             progress_callback=progress_callback,
+            settings=settings,
+            char_cache=char_cache,
         )
         outline_effective_width = max(0.0, float(outline_width))
         outline_plane_count = 0
         outline_raw_plane_count = 0
         outline_mesh_stats = {
+            "solve_count": 0,
+            "solver_nfev": 0,
             "solve_failed_count": 0,
             "reconstruction_failed_count": 0,
             "reconstruction_tol": MeshRenderConfig.RECONSTRUCTION_MAX_ABS_TOL,
@@ -3259,6 +4383,8 @@ class MeshRenderPipeline:
                 )
             else:
                 outline_reference_width = outline_effective_width
+            if progress_callback is not None:
+                progress_callback(stage="outline", current=0, total=1, note="")
             outline_char_mesh_data = MeshRenderPipeline.build_outline_char_mesh_data(
                 char_mesh_data, outline_reference_width
             )
@@ -3279,12 +4405,20 @@ class MeshRenderPipeline:
                 triangulate_stage="triangulate_outline",
                 solve_stage="solve_outline",
                 progress_callback=progress_callback,
+                settings=settings,
+                char_cache=char_cache,
             )
         else:
             outline_char_mesh_data = []
             outline_char_folders = []
         outline_group_folder = None
 
+        if char_cache is not None:
+            char_cache.commit()
+
+        if progress_callback is not None:
+            progress_callback(stage="align", current=0, total=1, note="")
+        # 位置合わせは文字列全体に依存するため、再利用した文字も含めて毎回やり直す
         alignment_info = MeshRenderPipeline.align_mesh_output_to_dot(
             char_mesh_data,
             char_folders,
@@ -3320,6 +4454,10 @@ class MeshRenderPipeline:
                 + outline_mesh_stats["accepted_rmse"] * accepted_outline
             ) / total_accepted
         mesh_stats = {
+            "solve_count": mesh_stats["solve_count"]
+            + outline_mesh_stats["solve_count"],
+            "solver_nfev": mesh_stats["solver_nfev"]
+            + outline_mesh_stats["solver_nfev"],
             "solve_failed_count": mesh_stats["solve_failed_count"]
             + outline_mesh_stats["solve_failed_count"],
             "reconstruction_failed_count": mesh_stats["reconstruction_failed_count"]
@@ -3339,6 +4477,8 @@ class MeshRenderPipeline:
         mesh_stats["solve_mesh_height"] = solve_mesh_height
         mesh_stats["requested_mesh_height"] = mesh_height
         mesh_stats["outline_width"] = outline_effective_width
+        if budget_tuning is not None:
+            mesh_stats["budget_tuning"] = {**budget_tuning, "actual": plane_count}
 
         if progress_callback is not None:
             progress_callback(stage="preview", current=1, total=1, note="")
@@ -3390,6 +4530,9 @@ class MeshRenderPipeline:
             new_folder["data"]["child"] = scene_children
 
         scene.objects = {folder_key: new_folder}
+        color_slots = collect_color_slots(char_folders, "fill")
+        if outline_group_folder is not None:
+            color_slots.extend(collect_color_slots([outline_group_folder], "outline"))
 
         if progress_callback is not None:
             progress_callback(stage="done", current=1, total=1, note="")
@@ -3403,6 +4546,7 @@ class MeshRenderPipeline:
             raw_plane_count,
             mesh_stats,
             triangulation_preview,
+            color_slots,
         )
 
     @staticmethod
@@ -3415,18 +4559,36 @@ class MeshRenderPipeline:
             "outline_width": float(MeshRenderConfig.OUTLINE_WIDTH_DEFAULT),
             "outline_color_hex": MeshRenderConfig.OUTLINE_COLOR_HEX_DEFAULT,
             "edge_length_r": float(MeshRenderConfig.TRIWILD_EDGE_LENGTH_R),
+            "auto_budget": False,
+            "triangle_budget": MeshRenderConfig.TRIANGLE_BUDGET_DEFAULT,
         }
 
     @staticmethod
     def render_advanced_settings(lang):
         settings = {}
+        settings["auto_budget"] = st.checkbox(
+            get_text("mesh_auto_budget_label", lang),
+            value=False,
+            help=get_text("mesh_auto_budget_help", lang),
+        )
+        if settings["auto_budget"]:
+            settings["triangle_budget"] = st.number_input(
+                get_text("mesh_triangle_budget_label", lang),
+                min_value=100,
+                max_value=MeshRenderConfig.TRIANGLE_BUDGET_MAX,
+                value=MeshRenderConfig.TRIANGLE_BUDGET_DEFAULT,
+                step=100,
+            )
+        else:
+            settings["triangle_budget"] = MeshRenderConfig.TRIANGLE_BUDGET_DEFAULT
         settings["flatten_segment_length"] = st.slider(
             get_text("mesh_flatten_length_label", lang),
-            min_value=2.0,
-            max_value=100.0,
+            min_value=MeshRenderConfig.FLATTEN_SEGMENT_LENGTH_MIN,
+            max_value=MeshRenderConfig.FLATTEN_SEGMENT_LENGTH_MAX,
             value=float(MeshRenderConfig.FLATTEN_SEGMENT_LENGTH_DEFAULT),
             step=1.0,
             help=get_text("mesh_flatten_length_help", lang),
+            disabled=settings["auto_budget"],
         )
         settings["outline_enabled"] = st.checkbox(
             get_text("mesh_outline_enable_label", lang),
@@ -3461,10 +4623,22 @@ class MeshRenderPipeline:
         return settings
 
     @staticmethod
-    def apply_triwild_settings(*, edge_length_r):
-        MeshRenderConfig.TRIWILD_STOP_QUALITY = 20.0
-        MeshRenderConfig.TRIWILD_EDGE_LENGTH_R = float(edge_length_r)
-        MeshRenderConfig.TRIWILD_TARGET_EDGE_LEN = -1.0
+    def build_render_settings(*, flatten_segment_length, edge_length_r):
+        """UI の入力値から、この生成専用の不変なメッシュ設定を作る。"""
+        return dataclasses.replace(
+            DEFAULT_MESH_RENDER_SETTINGS,
+            flatten_segment_length=float(flatten_segment_length),
+            triwild_stop_quality=20.0,
+            triwild_edge_length_r=float(edge_length_r),
+            triwild_target_edge_len=-1.0,
+        )
+
+    @staticmethod
+    def build_geometry_key(mesh_settings):
+        """色替えだけで再利用できる生成結果を識別するキーを作る。"""
+        settings = dict(mesh_settings)
+        settings.pop("outline_color_hex")
+        return tuple(sorted(settings.items()))
 
     @staticmethod
     def build_generation_metadata(
@@ -3507,24 +4681,39 @@ class MeshRenderPipeline:
         }
 
     @staticmethod
-    def build_progress_callback(lang):
-        progress_bar = st.progress(0, text=f"{get_text('generating', lang)} 0%")
-        progress_status = st.empty()
-        progress_state = {"percent": -1, "status": ""}
-        stage_labels = {
+    def stage_labels(lang):
+        """進捗の段階名から表示用ラベルへの対応を返す。"""
+        return {
+            "queued": get_text("mesh_stage_queued", lang),
+            "tune": get_text("mesh_stage_tune", lang),
             "prepare": get_text("mesh_stage_prepare", lang),
             "glyph": get_text("mesh_stage_glyph", lang),
             "triangulate": get_text("mesh_stage_triangulate", lang),
             "solve": get_text("mesh_stage_solve", lang),
+            "outline": get_text("mesh_stage_outline", lang),
             "triangulate_outline": get_text("mesh_stage_outline_triangulate", lang),
             "solve_outline": get_text("mesh_stage_outline_solve", lang),
+            "align": get_text("mesh_stage_align", lang),
             "preview": get_text("mesh_stage_preview", lang),
             "scene": get_text("mesh_stage_scene", lang),
             "done": get_text("mesh_stage_done", lang),
+            "serialize": get_text("mesh_stage_serialize", lang),
         }
 
+    @staticmethod
+    def build_progress_callback(lang):
+        progress_bar = st.progress(0, text=f"{get_text('generating', lang)} 0%")
+        progress_status = st.empty()
+        progress_state = {"percent": -1, "status": ""}
+        stage_labels = MeshRenderPipeline.stage_labels(lang)
+
         def mesh_progress_callback(stage, current=None, total=None, note=""):
-            if stage == "prepare":
+            if stage == "tune":
+                ratio = 0.0
+                if total and total > 0 and current is not None:
+                    ratio = min(1.0, max(0.0, float(current) / float(total)))
+                percent = round(5 * ratio)
+            elif stage == "prepare":
                 percent = 5
             elif stage == "glyph":
                 ratio = 0.0
@@ -3584,7 +4773,7 @@ class MeshRenderPipeline:
         return mesh_progress_callback
 
     @staticmethod
-    def generate_for_main(
+    def submit_for_main(
         *,
         text_input,
         template_scene,
@@ -3602,22 +4791,21 @@ class MeshRenderPipeline:
         outline_color_hex,
         generation_metadata,
         lang,
+        triangle_budget=None,
     ):
-        MeshRenderPipeline.apply_triwild_settings(
+        render_settings = MeshRenderPipeline.build_render_settings(
+            flatten_segment_length=flatten_segment_length,
             edge_length_r=edge_length_r,
         )
-        progress_callback = MeshRenderPipeline.build_progress_callback(lang)
         outline_color = hex_to_color(outline_color_hex)
-        (
-            scene,
-            original_img,
-            preview_pixels,
-            plane_count,
-            plane_count_horizontal,
-            raw_plane_count,
-            mesh_stats,
-            triangulation_preview,
-        ) = MeshRenderPipeline.generate_scene(
+        # 未収録文字はジョブを積む前にここで検出する。ジョブ側で送出された例外は
+        # 後の再実行で受け取るため、その時点の MissingGlyphError とクラスが一致しない
+        MeshRenderPipeline.check_missing_glyphs(
+            text_input, MeshRenderPipeline.resolve_mesh_font_path(selected_font)
+        )
+        return get_mesh_job_scheduler().submit(
+            MeshJobScheduler.current_session_id(),
+            MeshRenderPipeline.generate_scene,
             text=text_input,
             template_scene=template_scene,
             plane_template=plane_template,
@@ -3630,12 +4818,31 @@ class MeshRenderPipeline:
             spacing=layout["spacing"],
             color=color,
             font_path=selected_font,
-            flatten_segment_length=flatten_segment_length,
+            settings=render_settings,
             outline_width=outline_width,
             outline_color=outline_color,
             generation_metadata=generation_metadata,
             lang=lang,
-            progress_callback=progress_callback,
+            char_cache=get_char_result_cache("calligrapher_mesh_char_cache"),
+            triangle_budget=triangle_budget,
+        )
+
+    @staticmethod
+    def collect_job_result(job):
+        (
+            scene,
+            original_img,
+            preview_pixels,
+            plane_count,
+            plane_count_horizontal,
+            raw_plane_count,
+            mesh_stats,
+            triangulation_preview,
+            color_slots,
+        ) = job.future.result()
+        performance = job.performance.report(mesh_stats)
+        MeshPerformanceRecorder.append_log(
+            {"event": "generate", "page": "calligrapher", **performance}
         )
         return {
             "scene": scene,
@@ -3646,12 +4853,90 @@ class MeshRenderPipeline:
             "raw_plane_count": raw_plane_count,
             "mesh_stats": mesh_stats,
             "triangulation_preview": triangulation_preview,
+            "color_slots": color_slots,
+            "performance": performance,
         }
 
+    @staticmethod
+    @st.fragment(run_every=MeshJobScheduler.POLL_INTERVAL)
+    def render_job_progress(lang):
+        """バックグラウンドのメッシュ生成の進捗とキャンセルボタンを定期更新で描画する。"""
+        job = st.session_state.get("mesh_job")
+        if job is None:
+            return
+        if job.future.done():
+            # 完了したらページ全体を再実行して結果を表示する
+            st.rerun()
+
+        progress_callback = MeshRenderPipeline.build_progress_callback(lang)
+        get_mesh_job_scheduler().report_status(job, progress_callback, lang)
+        if job.cancel_event.is_set():
+            st.caption(get_text("mesh_job_cancelling", lang))
+        elif st.button(f"⏹️ {get_text('mesh_job_cancel_button', lang)}"):
+            get_mesh_job_scheduler().cancel(job)
+            st.caption(get_text("mesh_job_cancelling", lang))
+
+    @staticmethod
+    def render_job_for_main(lang):
+        """セッションに紐づくメッシュ生成ジョブの進捗、または完了した結果を表示する。"""
+        job = st.session_state.get("mesh_job")
+        if job is None:
+            return
+        if not job.future.done():
+            MeshRenderPipeline.render_job_progress(lang)
+            return
+
+        st.session_state.mesh_job = None
+        if job.cancel_event.is_set():
+            # キャンセル後に完了していても途中までの結果は使わない
+            get_char_result_cache("calligrapher_mesh_char_cache").reset_pending()
+            st.info(get_text("mesh_job_cancelled", lang))
+            return
+        # 例外はジョブを積んだ実行のクラスで作られているため、型ではなく属性で判別する
+        error = job.future.exception()
+        if error is not None:
+            get_char_result_cache("calligrapher_mesh_char_cache").reset_pending()
+            error_moji = getattr(error, "error_moji", None)
+            if error_moji is not None:
+                st.error(
+                    get_text("mesh_missing_glyph_error", lang).format(
+                        error_moji=error_moji
+                    )
+                )
+            else:
+                st.error(f"{get_text('error_occurred', lang)} {error!s}")
+                st.exception(error)
+            return
+        result = MeshRenderPipeline.collect_job_result(job)
+        store_cached_geometry(st.session_state.mesh_job_geometry_key, result)
+        MeshRenderPipeline.render_generation_feedback(result["mesh_stats"], lang)
+        render_generation_result(
+            result,
+            text_input=st.session_state.mesh_job_text,
+            render_mode_key="mesh",
+            grid_height=None,
+            lang=lang,
+        )
+
     @staticmethod
     def render_generation_feedback(mesh_stats, lang):
         if not mesh_stats:
             return
+        budget_tuning = mesh_stats.get("budget_tuning")
+        if budget_tuning is not None:
+            message = get_text(
+                "mesh_budget_result" if budget_tuning["fits"] else "mesh_budget_over",
+                lang,
+            ).format(
+                value=budget_tuning["value"],
+                predicted=budget_tuning["predicted"],
+                actual=budget_tuning["actual"],
+                budget=budget_tuning["budget"],
+            )
+            if budget_tuning["fits"]:
+                st.info(message)
+            else:
+                st.warning(message)
         if mesh_stats["solve_failed_count"] > 0:
             st.warning(
                 get_text("mesh_solver_skip_warn", lang).format(
@@ -3680,10 +4965,142 @@ class MeshRenderPipeline:
         else:
             st.image(triangulation_preview, width="stretch")
 
+    @staticmethod
+    def render_performance_section(performance, lang):
+        """生成ジョブの段階別の計測結果を折りたたみパネルに表示する。"""
+        if performance is None:
+            return
+        stage_labels = MeshRenderPipeline.stage_labels(lang)
+        stages = list(performance["stages"])
+        if "serialize" in performance:
+            stages.append(
+                {"stage": "serialize", "cpu": None, **performance["serialize"]}
+            )
+        total_wall = max(float(performance["wall"]), 1e-9)
+        with st.expander(
+            f"⏱️ {get_text('mesh_performance_title', lang)}", expanded=False
+        ):
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric(
+                    get_text("mesh_performance_wall", lang),
+                    f"{performance['wall']:.2f} s",
+                )
+            with col2:
+                st.metric(
+                    get_text("mesh_performance_triangles_per_second", lang),
+                    "-"
+                    if performance["triangles_per_second"] is None
+                    else f"{performance['triangles_per_second']:,.0f}",
+                )
+            with col3:
+                st.metric(
+                    get_text("mesh_performance_nfev_per_solve", lang),
+                    "-"
+                    if performance["nfev_per_solve"] is None
+                    else f"{performance['nfev_per_solve']:.1f}",
+                )
+            with col4:
+                st.metric(
+                    get_text("mesh_performance_peak_memory", lang),
+                    "-"
+                    if performance["peak_rss_mb"] is None
+                    else f"{performance['peak_rss_mb']:,.0f} MB",
+                )
+            st.dataframe(
+                [
+                    {
+                        get_text("mesh_performance_stage", lang): stage_labels.get(
+                            entry["stage"], entry["stage"]
+                        ),
+                        get_text("mesh_performance_stage_wall", lang): round(
+                            entry["wall"], 3
+                        ),
+                        get_text("mesh_performance_stage_cpu", lang): None
+                        if entry["cpu"] is None
+                        else round(entry["cpu"], 3),
+                        get_text("mesh_performance_stage_share", lang): round(
+                            100.0 * entry["wall"] / total_wall, 1
+                        ),
+                        get_text("mesh_performance_stage_memory", lang): None
+                        if entry.get("peak_rss_mb") is None
+                        else round(entry["peak_rss_mb"], 1),
+                    }
+                    for entry in stages
+                ],
+                hide_index=True,
+                width="stretch",
+            )
+            st.caption(get_text("mesh_performance_help", lang))
+
     build_triangulation_preview = build_mesh_triangulation_preview
     generate_scene = generate_text_scene_mesh
 
 
+def render_generation_result(result, *, text_input, render_mode_key, grid_height, lang):
+    """生成結果のプレビュー・シーン情報・ダウンロードボタンを表示する。"""
+    scene = result["scene"]
+    original_img = result["original_img"]
+    preview_pixels = result["preview_pixels"]
+    plane_count = result["plane_count"]
+    plane_count_horizontal = result["plane_count_horizontal"]
+    raw_plane_count = result["raw_plane_count"]
+    mesh_stats = result["mesh_stats"]
+    triangulation_preview = result["triangulation_preview"]
+
+    st.success(f"✅ {get_text('success_generate', lang).format(count=plane_count)}")
+
+    match render_mode_key:
+        case "dot":
+            render_preview(
+                original_img,
+                preview_pixels,
+                preview_pixels.shape[1],
+                grid_height,
+                lang,
+            )
+    render_scene_info(
+        scene,
+        plane_count,
+        plane_count_horizontal,
+        raw_plane_count,
+        lang,
+        is_mesh_mode=render_mode_key == "mesh",
+        mesh_stats=mesh_stats,
+    )
+    match render_mode_key:
+        case "mesh":
+            MeshRenderPipeline.render_triangulation_section(triangulation_preview, lang)
+            MeshRenderPipeline.render_performance_section(
+                result.get("performance"), lang
+            )
+
+    # ダウンロードボタン
+    filename = build_scene_filename(text_input, render_mode_key)
+
+    preview_buf = io.BytesIO()
+    build_scene_thumbnail_image(preview_pixels).save(preview_buf, format="PNG")
+    scene.image = preview_buf.getvalue()
+
+    # 色替えだけの再生成を即座に返せるよう、シリアライズはダウンロード時まで遅らせる
+    performance = result.get("performance")
+    st.download_button(
+        label=f"💾 {get_text('download_button', lang)}",
+        data=lambda: (
+            bytes(scene)
+            if performance is None
+            else MeshPerformanceRecorder.serialize_scene(
+                scene, performance, "calligrapher"
+            )
+        ),
+        file_name=filename,
+        mime="image/png",
+        type="primary",
+        width="stretch",
+        on_click="ignore",
+    )
+
+
 def main():
     # メイン UI
     try:
@@ -3855,6 +5272,35 @@ def main():
                         },
                     }
 
+                    if render_mode_key == "dot":
+                        dot_settings = DotRenderPipeline.apply_auto_resolution(
+                            text_input=text_input,
+                            font_size=font_size,
+                            color=color,
+                            selected_font=selected_font,
+                            dot_settings=dot_settings,
+                            lang=lang,
+                        )
+                        layout = DotRenderPipeline.compute_layout(
+                            text_input,
+                            dot_settings["per_char_resolution"],
+                            text_height,
+                            plane_size_factor_for_layout,
+                        )
+
+                    # 色以外の入力が前回と同じなら、解いた形状を再利用して色だけ塗り替える
+                    common_geometry_key = (
+                        render_mode_key,
+                        text_input,
+                        str(selected_font),
+                        font_size,
+                        layout["grid_height"],
+                        layout["text_scale"],
+                        layout["spacing"],
+                        plane_preset_key,
+                        light_cancel,
+                        lang,
+                    )
                     match render_mode_key:
                         case "mesh":
                             generation_metadata = (
@@ -3877,37 +5323,83 @@ def main():
                                     ],
                                 )
                             )
-                            result = MeshRenderPipeline.generate_for_main(
-                                text_input=text_input,
-                                template_scene=template_scene,
-                                plane_template=resolved_plane_template,
-                                triangle_template={
-                                    **plane_template,
-                                    "data": {
-                                        **plane_template["data"],
-                                        "category": triangle_settings["category"],
-                                        "no": triangle_settings["no"],
-                                        "light_cancel": 1.0 - light_cancel,
-                                    },
-                                },
-                                folder_key=folder_key,
-                                folder_obj=folder_obj,
-                                layout=layout,
-                                font_size=font_size,
-                                color=color,
-                                selected_font=selected_font,
-                                flatten_segment_length=mesh_settings[
-                                    "flatten_segment_length"
-                                ],
-                                edge_length_r=mesh_settings["edge_length_r"],
-                                outline_width=mesh_settings["outline_width"],
-                                outline_color_hex=mesh_settings["outline_color_hex"],
-                                generation_metadata=generation_metadata,
-                                lang=lang,
-                            )
-                            MeshRenderPipeline.render_generation_feedback(
-                                result["mesh_stats"], lang
+                            geometry_key = (
+                                common_geometry_key,
+                                MeshRenderPipeline.build_geometry_key(mesh_settings),
                             )
+                            cached_result = find_cached_geometry(geometry_key)
+                            if cached_result is not None:
+                                outline_color = hex_to_color(
+                                    mesh_settings["outline_color_hex"]
+                                )
+                                result = restamp_cached_result(
+                                    cached_result,
+                                    folder_key,
+                                    folder_obj,
+                                    {"fill": color, "outline": outline_color},
+                                    generation_metadata,
+                                    lang,
+                                )
+                                MeshRenderPipeline.render_generation_feedback(
+                                    result["mesh_stats"], lang
+                                )
+                                render_generation_result(
+                                    result,
+                                    text_input=text_input,
+                                    render_mode_key=render_mode_key,
+                                    grid_height=layout["grid_height"],
+                                    lang=lang,
+                                )
+                            else:
+                                submission = MeshRenderPipeline.submit_for_main(
+                                    text_input=text_input,
+                                    template_scene=template_scene,
+                                    plane_template=resolved_plane_template,
+                                    triangle_template={
+                                        **plane_template,
+                                        "data": {
+                                            **plane_template["data"],
+                                            "category": triangle_settings["category"],
+                                            "no": triangle_settings["no"],
+                                            "light_cancel": 1.0 - light_cancel,
+                                        },
+                                    },
+                                    folder_key=folder_key,
+                                    folder_obj=folder_obj,
+                                    layout=layout,
+                                    font_size=font_size,
+                                    color=color,
+                                    selected_font=selected_font,
+                                    flatten_segment_length=mesh_settings[
+                                        "flatten_segment_length"
+                                    ],
+                                    edge_length_r=mesh_settings["edge_length_r"],
+                                    outline_width=mesh_settings["outline_width"],
+                                    outline_color_hex=mesh_settings[
+                                        "outline_color_hex"
+                                    ],
+                                    generation_metadata=generation_metadata,
+                                    lang=lang,
+                                    triangle_budget=(
+                                        mesh_settings["triangle_budget"]
+                                        if mesh_settings["auto_budget"]
+                                        else None
+                                    ),
+                                )
+                                mesh_job, rejected_reason = submission
+                                if rejected_reason is not None:
+                                    # 実行中のジョブの進捗表示は下の render_job_for_main で続ける
+                                    st.warning(
+                                        get_text(
+                                            f"job_rejected_{rejected_reason}", lang
+                                        )
+                                    )
+                                else:
+                                    st.session_state.mesh_job = mesh_job
+                                    st.session_state.mesh_job_text = text_input
+                                    st.session_state.mesh_job_geometry_key = (
+                                        geometry_key
+                                    )
                         case "dot":
                             generation_metadata = (
                                 DotRenderPipeline.build_generation_metadata(
@@ -3921,78 +5413,47 @@ def main():
                                     dot_settings=dot_settings,
                                 )
                             )
-                            result = DotRenderPipeline.generate_for_main(
-                                text_input=text_input,
-                                template_scene=template_scene,
-                                plane_template=resolved_plane_template,
-                                folder_key=folder_key,
-                                folder_obj=folder_obj,
-                                layout=layout,
-                                font_size=font_size,
-                                color=color,
-                                selected_font=selected_font,
-                                dot_settings=dot_settings,
-                                generation_metadata=generation_metadata,
-                                lang=lang,
+                            geometry_key = (
+                                common_geometry_key,
+                                DotRenderPipeline.build_geometry_key(
+                                    dot_settings, color_hex, color_alpha
+                                ),
                             )
+                            cached_result = find_cached_geometry(geometry_key)
+                            if cached_result is not None:
+                                result = restamp_cached_result(
+                                    cached_result,
+                                    folder_key,
+                                    folder_obj,
+                                    {"fill": color},
+                                    generation_metadata,
+                                    lang,
+                                )
+                            else:
+                                result = DotRenderPipeline.generate_for_main(
+                                    text_input=text_input,
+                                    template_scene=template_scene,
+                                    plane_template=resolved_plane_template,
+                                    folder_key=folder_key,
+                                    folder_obj=folder_obj,
+                                    layout=layout,
+                                    font_size=font_size,
+                                    color=color,
+                                    selected_font=selected_font,
+                                    dot_settings=dot_settings,
+                                    generation_metadata=generation_metadata,
+                                    lang=lang,
+                                )
+                                store_cached_geometry(geometry_key, result)
 
-                    scene = result["scene"]
-                    original_img = result["original_img"]
-                    preview_pixels = result["preview_pixels"]
-                    plane_count = result["plane_count"]
-                    plane_count_horizontal = result["plane_count_horizontal"]
-                    raw_plane_count = result["raw_plane_count"]
-                    mesh_stats = result["mesh_stats"]
-                    triangulation_preview = result["triangulation_preview"]
-
-                    st.success(
-                        f"✅ {get_text('success_generate', lang).format(count=plane_count)}"
-                    )
-
-                    match render_mode_key:
-                        case "dot":
-                            render_preview(
-                                original_img,
-                                preview_pixels,
-                                preview_pixels.shape[1],
-                                layout["grid_height"],
-                                lang,
-                            )
-                    render_scene_info(
-                        scene,
-                        plane_count,
-                        plane_count_horizontal,
-                        raw_plane_count,
-                        lang,
-                        is_mesh_mode=render_mode_key == "mesh",
-                        mesh_stats=mesh_stats,
-                    )
-                    match render_mode_key:
-                        case "mesh":
-                            MeshRenderPipeline.render_triangulation_section(
-                                triangulation_preview, lang
+                            render_generation_result(
+                                result,
+                                text_input=text_input,
+                                render_mode_key=render_mode_key,
+                                grid_height=layout["grid_height"],
+                                lang=lang,
                             )
 
-                    # ダウンロードボタン
-                    filename = build_scene_filename(text_input, render_mode_key)
-
-                    preview_buf = io.BytesIO()
-                    build_scene_thumbnail_image(preview_pixels).save(
-                        preview_buf, format="PNG"
-                    )
-                    scene.image = preview_buf.getvalue()
-
-                    scene_bytes = bytes(scene)
-
-                    st.download_button(
-                        label=f"💾 {get_text('download_button', lang)}",
-                        data=scene_bytes,
-                        file_name=filename,
-                        mime="image/png",
-                        type="primary",
-                        width="stretch",
-                    )
-
                 except MissingGlyphError as e:
                     st.error(
                         get_text("mesh_missing_glyph_error", lang).format(
@@ -4003,6 +5464,9 @@ def main():
                     st.error(f"{get_text('error_occurred', lang)} {str(e)}")
                     st.exception(e)
 
+        # バックグラウンドで実行中・完了したメッシュ生成
+        MeshRenderPipeline.render_job_for_main(lang)
+
     except Exception as e:
         st.error(f"{get_text('error_init', lang)} {str(e)}")
         st.exception(e)
@@ -1,5 +1,8 @@
 import copy
+import hashlib
 import io
+import pickle
+import threading
 from collections import Counter
 from typing import Any, Literal
 
@@ -10,6 +13,7 @@ from kkloader import (
     HoneycomeSceneData,
     SummerVacationCharaData,
 )
+from kkloader.HoneycomeSceneObjectLoader import HoneycomeSceneObjectLoader
 from kkloader.KoikatuCharaData import BlockData
 
 # ========================================
@@ -291,6 +295,9 @@ DEFAULT_ACCCESORY_AC = {
 DEFAULT_GAMEINFO_SV = {}
 DEFAULT_GAMEINFO_AC = {"version": "0.0.0"}
 
+# 読み込み済みシーンを保持する件数。古いものから捨てる
+SCENE_CACHE_MAX_ENTRIES = 4
+
 
 def decode_header(chara: Any) -> str:
     """キャラクターのヘッダーをUTF-8文字列として取得する。"""
@@ -645,6 +652,90 @@ def convert_character_to_target(
     raise ValueError(f"Unsupported character header: {header}")
 
 
+# 名前の表示に使うため、遅延読み込みでも最初から解析しておくブロック
+EAGER_CHARACTER_BLOCKS = ("Parameter",)
+
+
+class DeferredCharaLoader:
+    """キャラクターのブロックデータを解析せず、元のバイト列のまま読み込むローダー。
+
+    ヘッダーと画像は通常どおり読み、EAGER_CHARACTER_BLOCKS 以外のブロックは
+    UnknownBlockData として持つ。保存時は元のバイト列がそのまま書き出される。
+
+    EAGER_CHARACTER_BLOCKS から load_scene_deferred までは data-viewer /
+    item-converter / character-converter の3ページに同じ内容で置いている。
+    変更するときは3ページとも揃えること。
+    """
+
+    def __init__(self, chara_class):
+        self.chara_class = chara_class
+
+    def load(self, data_stream, contains_png=True):
+        chara = self.chara_class()
+        chara.original_file_path = None
+        chara._load_header(data_stream, contains_image=contains_png)
+        # modules を空にすると、すべてのブロックが UnknownBlockData として読まれる
+        modules = chara.modules
+        chara.modules = {}
+        try:
+            chara._load_blockdata(data_stream)
+        finally:
+            chara.modules = modules
+        return decode_deferred_blocks(chara, EAGER_CHARACTER_BLOCKS)
+
+
+def decode_deferred_blocks(chara, names=None):
+    """遅延していたブロックを本来のクラスで解析する。names を省略するとすべて。"""
+    for name in list(getattr(chara, "unknown_blockdata", [])):
+        if name not in chara.modules or (names is not None and name not in names):
+            continue
+        block = getattr(chara, name)
+        setattr(chara, name, chara.modules[name](block.data, block.version))
+        chara.unknown_blockdata.remove(name)
+    return chara
+
+
+@st.cache_resource
+def get_scene_load_lock():
+    """キャラクターのローダーを差し替えている間、他の読み込みを待たせるロック。"""
+    return threading.Lock()
+
+
+def load_scene_deferred(file_like):
+    """キャラクターのブロックデータを遅延させてシーンを読み込む。
+
+    kkloader はヘッダーからキャラクターのクラスを引くため、その対応表を
+    読み込みの間だけ DeferredCharaLoader に差し替える。
+    """
+    with get_scene_load_lock():
+        dispatch = HoneycomeSceneObjectLoader._CHARA_DATA_DISPATCH
+        HoneycomeSceneObjectLoader._CHARA_DATA_DISPATCH = {
+            header: DeferredCharaLoader(chara_class)
+            for header, chara_class in dispatch.items()
+        }
+        try:
+            return HoneycomeSceneData.load(file_like)
+        finally:
+            HoneycomeSceneObjectLoader._CHARA_DATA_DISPATCH = dispatch
+
+
+@st.cache_resource(max_entries=SCENE_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_scene_snapshot(scene_sha256, _file_bytes):
+    """アップロードされたシーンを SHA-256 ごとに1回だけ読み込み、pickle して返す。
+
+    データビューア・アイテム変換・キャラ統一は同一ソースのこの関数を持つため、
+    キャッシュキーが一致し、どのページで読み込んだシーンも共有される。
+    """
+    scene = load_scene_deferred(io.BytesIO(_file_bytes))
+    return pickle.dumps(scene, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_scene(file_bytes: bytes) -> HoneycomeSceneData:
+    """キャッシュ済みのシーンから、書き換えてもキャッシュに影響しない複製を返す。"""
+    scene_sha256 = hashlib.sha256(file_bytes).hexdigest()
+    return pickle.loads(load_scene_snapshot(scene_sha256, file_bytes))
+
+
 def count_character_headers(scene: HoneycomeSceneData) -> tuple[Counter[str], int]:
     """シーン内キャラクターのヘッダー内訳と総数を集計する。"""
     headers: Counter[str] = Counter()
@@ -680,6 +771,8 @@ def unify_scene_characters(
         before_headers[old_header] += 1
 
         try:
+            # 読み込み時に遅延させたブロックを、変換の前にすべて解析する
+            decode_deferred_blocks(chara)
             converted_chara, changed = convert_character_to_target(chara, target)
             set_character_image(
                 converted_chara, name=name, scene_title=scene.title or ""
@@ -742,7 +835,7 @@ def main() -> None:
     if uploaded_file is not None:
         try:
             file_bytes = uploaded_file.getvalue()
-            hs = HoneycomeSceneData.load(io.BytesIO(file_bytes))
+            hs = load_scene(file_bytes)
             st.success(get_text("success_load", lang))
 
             headers_before, total_characters = count_character_headers(hs)
@@ -764,8 +857,8 @@ def main() -> None:
             )
 
             if st.button(get_text("execute_button", lang), type="primary"):
-                hs_converted = HoneycomeSceneData.load(io.BytesIO(file_bytes))
-                result = unify_scene_characters(hs_converted, target)
+                # hs はこのページ専用の複製なので、読み込み直さずそのまま書き換える
+                result = unify_scene_characters(hs, target)
 
                 st.success(
                     get_text("success_convert", lang).format(
@@ -785,7 +878,7 @@ def main() -> None:
                         st.dataframe(result["failed"], width="stretch")
 
                 output = io.BytesIO()
-                hs_converted.save(output)
+                hs.save(output)
                 output.seek(0)
 
                 original_name = uploaded_file.name.rsplit(".", 1)[0]
@@ -1,11 +1,20 @@
 import copy
+import hashlib
 import io
+import os
+import pickle
+import threading
+import zipfile
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from kkloader import HoneycomeSceneData
+from kkloader.HoneycomeSceneObjectLoader import HoneycomeSceneObjectLoader
 from kkloader.KoikatuCharaData import BlockData
 from PIL import Image, ImageDraw, ImageFont
 
@@ -49,6 +58,7 @@ TRANSLATIONS = {
         "character_header": "ヘッダー",
         "character_anime": "アニメ",
         "character_download": "DL",
+        "character_download_all": "全キャラクターをZIPでダウンロード",
         "no_characters": "キャラクターが含まれていません",
         "hierarchy_info_title": "階層構造情報",
         "max_depth": "最大階層の深さ",
@@ -108,6 +118,7 @@ A tool to display and aggregate information contained in Digital Craft/Honey Com
         "character_header": "Header",
         "character_anime": "Anime",
         "character_download": "DL",
+        "character_download_all": "Download all characters as ZIP",
         "no_characters": "No characters found",
         "hierarchy_info_title": "Hierarchy Information",
         "max_depth": "Maximum Hierarchy Depth",
@@ -154,47 +165,104 @@ ITEMS_PARQUET_PATH = (
     Path(__file__).parent / "digital-craft-data-viewer-data" / "items.parquet"
 )
 
+# 複合キーで各 ID に割り当てるビット数。4つ並べても int64 に収まる
+KEY_FIELD_BITS = 15
 
-@st.cache_data
+
+def pack_keys(*columns):
+    """整数 ID の列 (title, group, category, no など) を1本の int64 キーにまとめる。
+
+    どれかの ID が 0〜2^KEY_FIELD_BITS-1 の範囲外なら、どの表にも無いキー -1 にする。
+    """
+    arrays = [np.asarray(column, dtype=np.int64) for column in columns]
+    packed = np.zeros(len(arrays[0]), dtype=np.int64)
+    valid = np.ones(len(arrays[0]), dtype=bool)
+    for array in arrays:
+        valid &= (array >= 0) & (array < (1 << KEY_FIELD_BITS))
+        packed = (packed << KEY_FIELD_BITS) | (array & ((1 << KEY_FIELD_BITS) - 1))
+    return np.where(valid, packed, -1)
+
+
+def build_lookup(df, key_columns, value_columns, keep):
+    """df を複合キーで昇順に並べた検索表にする。キーの重複は keep 側を残す。"""
+    df = df.drop_duplicates(key_columns, keep=keep)
+    keys = pack_keys(*(df[column] for column in key_columns))
+    order = np.argsort(keys, kind="stable")
+    table = {"keys": keys[order]}
+    for column in value_columns:
+        table[column] = df[column].to_numpy(dtype=object)[order]
+    return table
+
+
+def lookup(table, keys):
+    """検索表から keys を二分探索し、(行番号, 見つかったか) を返す。"""
+    sorted_keys = table["keys"]
+    if len(sorted_keys) == 0:
+        return np.zeros(len(keys), dtype=np.int64), np.zeros(len(keys), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    return positions, sorted_keys[positions] == keys
+
+
+def take(table, column, positions, found):
+    """lookup の結果から column の値を取り出す。見つからなかった行は None。"""
+    values = np.full(len(positions), None, dtype=object)
+    values[found] = table[column][positions[found]]
+    return values
+
+
+@st.cache_resource(show_spinner=False)
 def load_items_data():
-    """items.parquetを読み込んで辞書として返す"""
+    """items.parquetを読み込み、アイテムとカテゴリの検索表を返す
+
+    読み取り専用の表なので、呼び出しごとに複製しない cache_resource に置く。
+    """
+    columns = ["title", "group", "category", "no"]
     if not ITEMS_PARQUET_PATH.exists():
-        return {}, {}
-    df = pd.read_parquet(ITEMS_PARQUET_PATH)
-    # (title, group, category, no) -> アイテム情報 の辞書を作成
-    items_dict = {}
-    # (title, group, category) -> カテゴリ名 の辞書を作成
-    category_dict = {}
-    for _, row in df.iterrows():
-        key = (row["title"], row["group"], row["category"], row["no"])
-        category_name = (
-            f"{row['title_name']} -> {row['group_name']} -> {row['category_name']}"
+        df = pd.DataFrame(columns=columns + ["category_name", "item_name"])
+    else:
+        df = pd.read_parquet(ITEMS_PARQUET_PATH)
+        df["category_name"] = (
+            df["title_name"] + " -> " + df["group_name"] + " -> " + df["category_name"]
         )
-        item_info = {
-            "category_name": category_name,
-            "item_name": row["item_name"],
-            "full_name": f"{category_name} -> {row['item_name']}",
-        }
-        items_dict[key] = item_info
-        # カテゴリ名の辞書も構築
-        cat_key = (row["title"], row["group"], row["category"])
-        if cat_key not in category_dict:
-            category_dict[cat_key] = category_name
-    return items_dict, category_dict
-
+    # 同じキーが重複したときは、アイテムは後の行、カテゴリは先の行を使う
+    items = build_lookup(df, columns, ["category_name", "item_name"], keep="last")
+    categories = build_lookup(df, columns[:3], ["category_name"], keep="first")
+    return items, categories
 
-def get_item_category_name(title, group, category):
-    """(title, group, category) から分類名を取得"""
-    _, category_dict = load_items_data()
-    key = (title, group, category)
-    return category_dict.get(key, f"不明 ({title}, {group}, {category})")
 
+def build_item_table(item_counts, lang="ja"):
+    """シーン内アイテムの (group, category, no, title) ごとの個数に、名前を付けた表を返す
 
-def get_item_info(title, group, category, no):
-    """(title, group, category, no) からアイテム情報を取得"""
-    items_dict, _ = load_items_data()
-    key = (title, group, category, no)
-    return items_dict.get(key)
+    アイテム辞書との突き合わせは複合キーの二分探索でまとめて行う。
+    """
+    items, categories = load_items_data()
+    title = item_counts["title"].to_numpy()
+    group = item_counts["group"].to_numpy()
+    category = item_counts["category"].to_numpy()
+    no = item_counts["no"].to_numpy()
+
+    item_pos, item_found = lookup(items, pack_keys(title, group, category, no))
+    category_pos, category_found = lookup(categories, pack_keys(title, group, category))
+
+    category_names = take(items, "category_name", item_pos, item_found)
+    item_names = take(items, "item_name", item_pos, item_found)
+    # アイテムが辞書に無いときはカテゴリ名だけでも引く
+    category_names[~item_found] = take(
+        categories, "category_name", category_pos, category_found
+    )[~item_found]
+    # どちらにも無いものだけ、個別に「不明」の表記を作る
+    for i in np.flatnonzero(~item_found):
+        item_names[i] = f"不明 ({no[i]})"
+        if category_names[i] is None:
+            category_names[i] = f"不明 ({title[i]}, {group[i]}, {category[i]})"
+
+    return pd.DataFrame(
+        {
+            get_text("item_category_col", lang): category_names,
+            get_text("item_name_col", lang): item_names,
+            get_text("item_count_col", lang): item_counts["count"].to_numpy(),
+        }
+    )
 
 
 # ========================================
@@ -206,32 +274,55 @@ MOTIONS_PARQUET_PATH = (
 )
 
 
-@st.cache_data
+@st.cache_resource(show_spinner=False)
 def load_motions_data():
-    """motions.parquetを読み込んで辞書として返す"""
+    """motions.parquetを読み込み、(title, group, category, no) の検索表を返す"""
+    columns = ["title", "group", "category", "no"]
     if not MOTIONS_PARQUET_PATH.exists():
-        return {}
-    df = pd.read_parquet(MOTIONS_PARQUET_PATH)
-    # (title, group, category, no) -> 表示名 の辞書を作成
-    motions_dict = {}
-    for _, row in df.iterrows():
-        key = (row["title"], row["group"], row["category"], row["no"])
-        display_name = f"{row['title_name']} -> {row['group_name']} -> {row['category_name']} -> {row['anime_name']}"
-        motions_dict[key] = display_name
-    return motions_dict
-
-
-def get_anime_display_name(anime_info):
-    """anime_info辞書からアニメの表示名を取得"""
-    if not anime_info:
-        return None
-    title = anime_info.get("title", -1)
-    group = anime_info.get("group", -1)
-    category = anime_info.get("category", -1)
-    no = anime_info.get("no", -1)
-    key = (title, group, category, no)
-    motions_dict = load_motions_data()
-    return motions_dict.get(key, f"不明 ({title}, {group}, {category}, {no})")
+        df = pd.DataFrame(columns=columns + ["display_name"])
+    else:
+        df = pd.read_parquet(MOTIONS_PARQUET_PATH)
+        df["display_name"] = (
+            df["title_name"]
+            + " -> "
+            + df["group_name"]
+            + " -> "
+            + df["category_name"]
+            + " -> "
+            + df["anime_name"]
+        )
+    return build_lookup(df, columns, ["display_name"], keep="last")
+
+
+def get_anime_display_names(anime_infos):
+    """anime_info辞書のリストから、アニメの表示名をまとめて引く
+
+    anime_info が無いものは None、辞書に無いものは「不明」の表記になる。
+    """
+    ids = [
+        [info.get(name, -1) for name in ("title", "group", "category", "no")]
+        for info in anime_infos
+        if info
+    ]
+    motions = load_motions_data()
+    positions, found = lookup(
+        motions, pack_keys(*np.array(ids, dtype=np.int64).reshape(-1, 4).T)
+    )
+    display_names = iter(take(motions, "display_name", positions, found))
+
+    names = []
+    for info in anime_infos:
+        if not info:
+            names.append(None)
+            continue
+        name = next(display_names)
+        if name is None:
+            title, group, category, no = (
+                info.get(key, -1) for key in ("title", "group", "category", "no")
+            )
+            name = f"不明 ({title}, {group}, {category}, {no})"
+        names.append(name)
+    return names
 
 
 # ========================================
@@ -283,7 +374,34 @@ DEFAULT_GAMEINFO_AC = {"version": "0.0.0"}
 
 FONT_PATH = "pages/digital-craft-calligrapher-data/MPLUSRounded1c-Regular.ttf"
 
+# 読み込み済みシーンを保持する件数。古いものから捨てる
+SCENE_CACHE_MAX_ENTRIES = 4
+
+# バイト化したキャラクターカードを保持する件数と、ZIP 作成時の並列数
+CHARACTER_CACHE_MAX_ENTRIES = 256
+CHARACTER_EXPORT_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+# プレースホルダー画像を保持する件数と PNG の圧縮レベル。
+# 使い捨てのサムネイルなので、圧縮率より書き出しの速さを優先する
+PLACEHOLDER_CACHE_MAX_ENTRIES = 256
+PLACEHOLDER_PNG_COMPRESS_LEVEL = 1
+
+
+@st.cache_resource(show_spinner=False)
+def load_truetype_font(font_path, font_size):
+    """フォントをパスとサイズごとにプロセスで1回だけ読み込む"""
+    return ImageFont.truetype(str(font_path), font_size)
 
+
+def load_placeholder_fonts():
+    """プレースホルダー画像用のフォント (大・中・小) を返す"""
+    try:
+        return tuple(load_truetype_font(FONT_PATH, size) for size in (32, 20, 14))
+    except OSError:
+        return (ImageFont.load_default(),) * 3
+
+
+@st.cache_data(max_entries=PLACEHOLDER_CACHE_MAX_ENTRIES, show_spinner=False)
 def create_placeholder_image(
     game_type="", name="", scene_title="", width=252, height=352
 ):
@@ -299,14 +417,7 @@ def create_placeholder_image(
     img = Image.new("RGB", (width, height), color=(128, 128, 128))
     draw = ImageDraw.Draw(img)
 
-    try:
-        font_large = ImageFont.truetype(FONT_PATH, 32)
-        font_small = ImageFont.truetype(FONT_PATH, 20)
-        font_tiny = ImageFont.truetype(FONT_PATH, 14)
-    except (OSError, IOError):
-        font_large = ImageFont.load_default()
-        font_small = ImageFont.load_default()
-        font_tiny = ImageFont.load_default()
+    font_large, font_small, font_tiny = load_placeholder_fonts()
 
     # ゲームタイプを中央上部に描画
     if game_type:
@@ -345,7 +456,7 @@ def create_placeholder_image(
         draw.text((x, height - 40), source_text, fill=(200, 200, 200), font=font_tiny)
 
     buffer = io.BytesIO()
-    img.save(buffer, format="PNG")
+    img.save(buffer, format="PNG", compress_level=PLACEHOLDER_PNG_COMPRESS_LEVEL)
     return buffer.getvalue()
 
 
@@ -363,6 +474,9 @@ def set_character_image(chara, name="", scene_title=""):
         except UnicodeDecodeError:
             raise ValueError("corrupted_header")
 
+    # 遅延読み込みのブロックは書き換えられないため、ここで触るものだけ解析する
+    decode_deferred_blocks(chara, ("GameParameter_SV", "GameParameter_AC"))
+
     # 接尾辞なしの GameParameter と GameInfo を削除
     for block_name in ["GameParameter", "GameInfo"]:
         if hasattr(chara, block_name):
@@ -412,8 +526,207 @@ def set_character_image(chara, name="", scene_title=""):
         chara.original_lstinfo_order = chara.blockdata
 
 
-def analyze_scene(hs):
-    """シーンデータを分析して統計情報を返す
+# 名前の表示に使うため、遅延読み込みでも最初から解析しておくブロック
+EAGER_CHARACTER_BLOCKS = ("Parameter",)
+
+
+class DeferredCharaLoader:
+    """キャラクターのブロックデータを解析せず、元のバイト列のまま読み込むローダー。
+
+    ヘッダーと画像は通常どおり読み、EAGER_CHARACTER_BLOCKS 以外のブロックは
+    UnknownBlockData として持つ。保存時は元のバイト列がそのまま書き出される。
+
+    EAGER_CHARACTER_BLOCKS から load_scene_deferred までは data-viewer /
+    item-converter / character-converter の3ページに同じ内容で置いている。
+    変更するときは3ページとも揃えること。
+    """
+
+    def __init__(self, chara_class):
+        self.chara_class = chara_class
+
+    def load(self, data_stream, contains_png=True):
+        chara = self.chara_class()
+        chara.original_file_path = None
+        chara._load_header(data_stream, contains_image=contains_png)
+        # modules を空にすると、すべてのブロックが UnknownBlockData として読まれる
+        modules = chara.modules
+        chara.modules = {}
+        try:
+            chara._load_blockdata(data_stream)
+        finally:
+            chara.modules = modules
+        return decode_deferred_blocks(chara, EAGER_CHARACTER_BLOCKS)
+
+
+def decode_deferred_blocks(chara, names=None):
+    """遅延していたブロックを本来のクラスで解析する。names を省略するとすべて。"""
+    for name in list(getattr(chara, "unknown_blockdata", [])):
+        if name not in chara.modules or (names is not None and name not in names):
+            continue
+        block = getattr(chara, name)
+        setattr(chara, name, chara.modules[name](block.data, block.version))
+        chara.unknown_blockdata.remove(name)
+    return chara
+
+
+@st.cache_resource
+def get_scene_load_lock():
+    """キャラクターのローダーを差し替えている間、他の読み込みを待たせるロック。"""
+    return threading.Lock()
+
+
+def load_scene_deferred(file_like):
+    """キャラクターのブロックデータを遅延させてシーンを読み込む。
+
+    kkloader はヘッダーからキャラクターのクラスを引くため、その対応表を
+    読み込みの間だけ DeferredCharaLoader に差し替える。
+    """
+    with get_scene_load_lock():
+        dispatch = HoneycomeSceneObjectLoader._CHARA_DATA_DISPATCH
+        HoneycomeSceneObjectLoader._CHARA_DATA_DISPATCH = {
+            header: DeferredCharaLoader(chara_class)
+            for header, chara_class in dispatch.items()
+        }
+        try:
+            return HoneycomeSceneData.load(file_like)
+        finally:
+            HoneycomeSceneObjectLoader._CHARA_DATA_DISPATCH = dispatch
+
+
+@st.cache_resource(max_entries=SCENE_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_scene_snapshot(scene_sha256, _file_bytes):
+    """アップロードされたシーンを SHA-256 ごとに1回だけ読み込み、pickle して返す。
+
+    データビューア・アイテム変換・キャラ統一は同一ソースのこの関数を持つため、
+    キャッシュキーが一致し、どのページで読み込んだシーンも共有される。
+    """
+    scene = load_scene_deferred(io.BytesIO(_file_bytes))
+    return pickle.dumps(scene, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_scene(file_bytes):
+    """キャッシュ済みのシーンから、書き換えてもキャッシュに影響しない複製を返す。"""
+    scene_sha256 = hashlib.sha256(file_bytes).hexdigest()
+    return pickle.loads(load_scene_snapshot(scene_sha256, file_bytes))
+
+
+# オブジェクト索引の列と型。1行が1オブジェクトで、並びは hs.walk() と同じ
+OBJECT_INDEX_DTYPES = {
+    "key": object,
+    "path": object,
+    "type": "int8",
+    "parent": "int32",
+    "depth": "int16",
+    "child_count": "int32",
+    "name": object,
+    "active": bool,
+    "group": "int32",
+    "category": "int32",
+    "no": "int32",
+    "title": "int32",
+    "header": object,
+}
+
+
+def describe_character(chara):
+    """キャラクターのヘッダーと表示名 (Parameter の姓名) を返す。"""
+    header = getattr(chara, "header", "Unknown")
+    if isinstance(header, bytes):
+        try:
+            header = header.decode("utf-8")
+        except UnicodeDecodeError:
+            header = "(corrupted)"
+
+    name = "Unknown"
+    if "Parameter" in chara.blockdata:
+        param = chara["Parameter"]
+        lastname = param.data.get("lastname", "")
+        firstname = param.data.get("firstname", "")
+        if lastname or firstname:
+            name = f"{lastname} {firstname}".strip()
+    return header, name
+
+
+def build_object_index(hs):
+    """シーンの全オブジェクトを1回だけ走査し、列ごとの索引 (DataFrame) にする。
+
+    - key: walk() が返すキー / path: hs.objects からのたどり方 (resolve_object 用)
+    - parent: 親の行番号 (トップレベルは -1) / depth: 階層の深さ
+    - name: フォルダ・ルート・カメラなどの名前。キャラクターは表示名
+    - group, category, no, title: アイテムの ID (アイテム以外は -1)
+    - header: キャラクターのヘッダー (キャラクター以外は None)
+    """
+    columns = {name: [] for name in OBJECT_INDEX_DTYPES}
+
+    def add(key, path, obj, parent, depth):
+        row = len(columns["key"])
+        obj_type = obj.get("type")
+        data = obj.get("data", {})
+        child = data.get("child")
+        if obj_type == 0:
+            # キャラクターの子は Dict[int, List[ObjectInfo]]
+            children = [
+                ((child_key, idx), child_obj)
+                for child_key, child_list in (child or {}).items()
+                for idx, child_obj in enumerate(child_list)
+            ]
+        else:
+            children = list(enumerate(child or []))
+
+        name = data.get("name", "")
+        header = None
+        if obj_type == 0 and data.get("character"):
+            header, name = describe_character(data["character"])
+        is_item = obj_type == 1
+
+        columns["key"].append(key)
+        columns["path"].append(path)
+        columns["type"].append(obj_type)
+        columns["parent"].append(parent)
+        columns["depth"].append(depth)
+        columns["child_count"].append(len(children))
+        columns["name"].append(name)
+        columns["active"].append(bool(data.get("active", False)))
+        for id_name in ("group", "category", "no", "title"):
+            columns[id_name].append(data.get(id_name, -1) if is_item else -1)
+        columns["header"].append(header)
+
+        for child_key, child_obj in children:
+            add(child_key, path + (child_key,), child_obj, row, depth + 1)
+
+    for key, obj in hs.objects.items():
+        add(key, (key,), obj, -1, 0)
+
+    return pd.DataFrame(
+        {
+            name: pd.Series(values, dtype=dtype)
+            for (name, dtype), values in zip(
+                OBJECT_INDEX_DTYPES.items(), columns.values()
+            )
+        }
+    )
+
+
+@st.cache_data(max_entries=SCENE_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_object_index(scene_sha256, _hs):
+    """シーンの索引を SHA-256 ごとに1回だけ作る。
+
+    データビューアとアイテム変換は同一ソースのこの関数を持ち、索引を共有する。
+    """
+    return build_object_index(_hs)
+
+
+def resolve_object(hs, path):
+    """索引の path をたどり、hs の中の実際のオブジェクトを返す。"""
+    obj = hs.objects[path[0]]
+    for step in path[1:]:
+        child = obj["data"]["child"]
+        obj = child[step[0]][step[1]] if obj["type"] == 0 else child[step]
+    return obj
+
+
+def analyze_scene(hs, index):
+    """シーンのオブジェクト索引から統計情報を集計して返す
 
     Object types:
       0: Character (OICharInfo)
@@ -423,105 +736,94 @@ def analyze_scene(hs):
       4: Route (OIRouteInfo)
       5: Camera (OICameraInfo)
     """
+    characters = index[(index["type"] == 0) & index["header"].notna()]
+    items = index[index["type"] == 1]
+    folders = index[(index["type"] == 3) & (index["name"] != "")]
+    routes = index[index["type"] == 4]
+    cameras = index[index["type"] == 5]
+
     stats = {
-        "total_objects": 0,
-        "type_counts": Counter(),
-        "max_depth": 0,
+        "total_objects": len(index),
+        "type_counts": Counter(
+            {int(t): int(c) for t, c in index["type"].value_counts().items()}
+        ),
+        "max_depth": int(index["depth"].max()) if len(index) else 0,
         "characters": [],
-        "character_headers": Counter(),
-        "item_keys": Counter(),  # (group, category, no, title) のセットでカウント
-        "folder_names": [],
-        "routes": [],
-        "cameras": [],
+        "character_headers": Counter(characters["header"]),
+        # (group, category, no, title) のセットごとの個数 (キーの昇順)
+        "item_counts": items.groupby(["group", "category", "no", "title"])
+        .size()
+        .reset_index(name="count"),
+        "folder_names": folders[["name", "depth"]].to_dict("records"),
+        "routes": routes[["name", "active"]].to_dict("records"),
+        "cameras": cameras[["name", "active"]].to_dict("records"),
     }
 
-    # walk()メソッドで全オブジェクトを走査（深さ情報付き）
-    for _, obj, depth in hs.walk(include_depth=True):
-        stats["total_objects"] += 1
-        obj_type = obj.get("type")
-        stats["type_counts"][obj_type] += 1
-        stats["max_depth"] = max(stats["max_depth"], depth)
-
-        data = obj.get("data", {})
-
-        # 0: Character (OICharInfo)
-        if obj_type == 0:
-            chara = data.get("character")
-            if chara:
-                header = getattr(chara, "header", "Unknown")
-                if isinstance(header, bytes):
-                    try:
-                        header = header.decode("utf-8")
-                    except UnicodeDecodeError:
-                        header = "(corrupted)"
-
-                # 名前を取得
-                name = "Unknown"
-                if "Parameter" in chara.blockdata:
-                    param = chara["Parameter"]
-                    lastname = param.data.get("lastname", "")
-                    firstname = param.data.get("firstname", "")
-                    if lastname or firstname:
-                        name = f"{lastname} {firstname}".strip()
-
-                # アニメ情報を取得
-                anime_info = data.get("anime_info")
-
-                stats["characters"].append(
-                    {
-                        "name": name,
-                        "header": header,
-                        "data": chara,
-                        "anime_info": anime_info,
-                    }
-                )
-                stats["character_headers"][header] += 1
-
-        # 1: Item (OIItemInfo)
-        elif obj_type == 1:
-            group = data.get("group", -1)
-            category = data.get("category", -1)
-            no = data.get("no", -1)
-            title = data.get("title", -1)
-            stats["item_keys"][(group, category, no, title)] += 1
-
-        # 3: Folder (OIFolderInfo)
-        elif obj_type == 3:
-            folder_name = data.get("name", "")
-            if folder_name:
-                stats["folder_names"].append({"name": folder_name, "depth": depth})
-
-        # 4: Route (OIRouteInfo)
-        elif obj_type == 4:
-            route_info = {
-                "name": data.get("name", ""),
-                "active": data.get("active", False),
-            }
-            stats["routes"].append(route_info)
-
-        # 5: Camera (OICameraInfo)
-        elif obj_type == 5:
-            camera_info = {
-                "name": data.get("name", ""),
-                "active": data.get("active", False),
+    # キャラクター本体とアニメ情報は索引に持たないので、path からたどる
+    for path, name, header in zip(
+        characters["path"], characters["name"], characters["header"]
+    ):
+        data = resolve_object(hs, path)["data"]
+        stats["characters"].append(
+            {
+                "path": path,
+                "name": name,
+                "header": header,
+                "data": data["character"],
+                "anime_info": data.get("anime_info"),
             }
-            stats["cameras"].append(camera_info)
+        )
 
     return stats
 
 
-def get_top_level_folders(hs):
+def get_top_level_folders(index):
     """トップレベルのフォルダ名のリストを取得"""
-    folders = []
+    folders = index[(index["depth"] == 0) & (index["type"] == 3)]
+    return [
+        f"📁 {name or '(unnamed)'} ({child_count})"
+        for name, child_count in zip(folders["name"], folders["child_count"])
+    ]
+
+
+@st.cache_data(max_entries=CHARACTER_CACHE_MAX_ENTRIES, show_spinner=False)
+def export_character(scene_sha256, character_path, _chara, _name, _scene_title):
+    """キャラクター1人分のカードを、シーンとキャラクターごとに1回だけバイト化する。
 
-    for _, obj in hs.objects.items():
-        if obj.get("type") == 3:  # Folder
-            data = obj.get("data", {})
-            folder_name = data.get("name", "(unnamed)")
-            child_count = len(data.get("child", []))
-            folders.append(f"📁 {folder_name} ({child_count})")
+    ダウンロードボタンのコールバックとして別スレッドから呼ばれるため、
+    画面側の hs に触れないよう複製に画像をセットしてから書き出す。
+    """
+    chara = pickle.loads(pickle.dumps(_chara, protocol=pickle.HIGHEST_PROTOCOL))
+    set_character_image(chara, _name, _scene_title)
+    return bytes(chara)
+
+
+def character_filename(character, i):
+    """キャラクターカードのダウンロード時のファイル名"""
+    return f"{character['name'] or 'character'}_{i}.png"
+
+
+def export_characters_zip(scene_sha256, characters, scene_title):
+    """キャラクターを並列にバイト化し、1つの ZIP にまとめて返す。
+
+    characters は (一覧での番号, キャラクター情報) の組のリスト。
+    PNG はすでに圧縮済みなので、ZIP では圧縮しない。
+    """
+
+    def export(entry):
+        _, c = entry
+        return export_character(
+            scene_sha256, c["path"], c["data"], c["name"], scene_title
+        )
 
-    return folders
+    with ThreadPoolExecutor(max_workers=CHARACTER_EXPORT_WORKERS) as executor:
+        cards = list(executor.map(export, characters))
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as archive:
+        for (i, c), card in zip(characters, cards):
+            archive.writestr(character_filename(c, i), card)
+    return output.getvalue()
 
 
 # ページ設定とタイトル
@@ -545,7 +847,9 @@ if uploaded_file is not None:
     try:
         # ファイルを読み込み
         file_bytes = uploaded_file.read()
-        hs = HoneycomeSceneData.load(io.BytesIO(file_bytes))
+        scene_sha256 = hashlib.sha256(file_bytes).hexdigest()
+        hs = load_scene(file_bytes)
+        index = load_object_index(scene_sha256, hs)
 
         st.success(get_text("success_load", lang))
 
@@ -579,7 +883,7 @@ if uploaded_file is not None:
         )
 
         # 分析実行
-        stats = analyze_scene(hs)
+        stats = analyze_scene(hs, index)
 
         # キャラクター情報
         st.subheader(get_text("character_info_title", lang))
@@ -601,29 +905,47 @@ if uploaded_file is not None:
             header_col3.write(f"**{get_text('character_anime', lang)}**")
             header_col4.write(f"**{get_text('character_download', lang)}**")
             # データ行
+            scene_title = hs.title or ""
+            anime_names = get_anime_display_names(
+                [c["anime_info"] for c in stats["characters"]]
+            )
+            exportable = []
             for i, c in enumerate(stats["characters"]):
                 col1, col2, col3, col4 = st.columns([2, 2, 4, 1])
                 col1.write(c["name"])
                 col2.write(c["header"])
                 # アニメ情報を表示
-                anime_display = get_anime_display_name(c.get("anime_info"))
-                col3.write(anime_display if anime_display else "-")
-                # headerに応じた画像をセットしてからバイト化
-                chara = c["data"]
-                try:
-                    set_character_image(chara, c["name"], hs.title or "")
-                except ValueError:
+                col3.write(anime_names[i] if anime_names[i] else "-")
+                # ヘッダーが読めないキャラクターは画像をセットできない
+                if c["header"] == "(corrupted)":
                     col4.error(get_text("error_corrupted_header", lang))
                     continue
-                chara_bytes = bytes(chara)
-                filename = f"{c['name'] or 'character'}_{i}.png"
+                exportable.append((i, c))
+                # バイト化はボタンが押されたときに行う
                 col4.download_button(
                     label="⬇",
-                    data=chara_bytes,
-                    file_name=filename,
+                    data=partial(
+                        export_character,
+                        scene_sha256,
+                        c["path"],
+                        c["data"],
+                        c["name"],
+                        scene_title,
+                    ),
+                    file_name=character_filename(c, i),
                     mime="image/png",
                     key=f"chara_dl_{i}",
                 )
+            if exportable:
+                st.download_button(
+                    label=get_text("character_download_all", lang),
+                    data=partial(
+                        export_characters_zip, scene_sha256, exportable, scene_title
+                    ),
+                    file_name=f"{uploaded_file.name.rsplit('.', 1)[0]}_characters.zip",
+                    mime="application/zip",
+                    key="chara_dl_all",
+                )
         else:
             st.info(get_text("no_characters", lang))
 
@@ -646,42 +968,25 @@ if uploaded_file is not None:
                 cols[i].metric(item["type"], item["count"])
 
         # アイテム統計
-        if stats["item_keys"]:
+        item_counts = stats["item_counts"]
+        if len(item_counts):
             st.subheader(get_text("item_stats_title", lang))
-            total_items = sum(stats["item_keys"].values())
-            unique_items = len(stats["item_keys"])
+            total_items = int(item_counts["count"].sum())
+            unique_items = len(item_counts)
             st.metric(
                 get_text("item_count", lang),
                 f"{total_items} ({get_text('item_unique', lang)}: {unique_items})",
             )
 
             with st.expander(get_text("item_list", lang)):
-                item_df = []
-                for (group, category, no, title), count in sorted(
-                    stats["item_keys"].items()
-                ):
-                    item_info = get_item_info(title, group, category, no)
-                    if item_info:
-                        category_name = item_info["category_name"]
-                        item_name = item_info["item_name"]
-                    else:
-                        category_name = get_item_category_name(title, group, category)
-                        item_name = f"不明 ({no})"
-                    item_df.append(
-                        {
-                            get_text("item_category_col", lang): category_name,
-                            get_text("item_name_col", lang): item_name,
-                            get_text("item_count_col", lang): count,
-                        }
-                    )
-                st.dataframe(item_df, width="stretch")
+                st.dataframe(build_item_table(item_counts, lang), width="stretch")
 
         # 階層構造情報
         st.subheader(get_text("hierarchy_info_title", lang))
         st.metric(get_text("max_depth", lang), stats["max_depth"])
 
         with st.expander(get_text("folder_structure", lang)):
-            folders = get_top_level_folders(hs)
+            folders = get_top_level_folders(index)
             if folders:
                 for folder in folders:
                     st.text(folder)
@@ -0,0 +1,934 @@
+import copy
+import gc
+import hashlib
+import io
+import pickle
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import streamlit as st
+from kkloader import HoneycomeSceneData
+from PIL import Image, ImageOps
+
+TRANSLATIONS = {
+    "ja": {
+        "title": "デジクラ画像ビルダー",
+        "subtitle": "ドット絵などの小さな画像を、平面を並べたデジクラのシーンに変換します。",
+        "qa_title": "Q&A",
+        "qa_content": """
+**Q: どんな画像に向いている？**
+
+A: 色数の少ないドット絵やアイコンに向いています。同じ色が縦横に続く部分は1枚の平面にまとめるので、色数が少ないほど平面数も少なくなります。
+
+**Q: 写真を入れたら平面数がすごいことになった！**
+
+A: 「色数」を減らすか、「平面数から画像を自動で縮小する」をオンにしてみてください。
+
+**Q: 透明な部分はどうなる？**
+
+A: 透明度が半分未満のピクセルは平面を置かずに抜きます。
+""",
+        "upload_label": "画像ファイル (PNG / JPEG)",
+        "upload_info": "画像ファイルを読み込んでください。",
+        "load_error": "画像の読み込みに失敗しました: {error}",
+        "no_pixels": "不透明なピクセルが見つかりませんでした。",
+        "alpha_label": "透明度",
+        "height_label": "縦長サイズ",
+        "palette_size_label": "色数",
+        "palette_size_help": "画像をこの色数以下に減色します。元の色数がこれ以下なら、色はそのまま使います。",
+        "max_side_label": "長辺のピクセル数",
+        "max_side_help": "画像の長辺をこのピクセル数以下に縮小します (ドット絵が崩れないよう最近傍で縮小します)。",
+        "auto_downscale_label": "平面数から画像を自動で縮小する",
+        "auto_downscale_help": "平面数が目安に収まるところまで、長辺のピクセル数を自動で下げます。",
+        "plane_budget_label": "平面数の目安",
+        "downscale_result": "長辺を {side} px に自動調整しました (平面 {count:,} 個 / 目安 {budget:,} 個)",
+        "downscale_over": "最小の {side} px でも平面数が目安を超えます (平面 {count:,} 個 / 目安 {budget:,} 個)",
+        "plane_limit_error": "平面数が上限を超えています ({count:,} 個 / 上限 {limit:,} 個)。色数か長辺のピクセル数を減らしてください。",
+        "advanced_settings": "詳細設定",
+        "plane_size_label": "平面サイズ",
+        "plane_size_help": "1ピクセルに置く平面の大きさです。1未満にすると平面の間に隙間ができます。",
+        "plane_preset_label": "平面プリセット",
+        "plane_preset_map": "平面(マップ)",
+        "plane_preset_character": "平面(キャラ)",
+        "light_influence_label": "ライトの影響度",
+        "input_preview_title": "減色後のプレビュー",
+        "pixel_data": "{width}×{height} ピクセル / {colors} 色",
+        "generate_button": "シーンを生成",
+        "generating": "シーンを生成中...",
+        "success_generate": "生成完了 ({count} planes)",
+        "scene_info_title": "シーン情報",
+        "scene_plane_count": "平面数",
+        "scene_pixel_count": "ピクセル数",
+        "scene_color_count": "色数",
+        "metadata_folder": "メタデータ",
+        "scene_root": "画像",
+        "color_folder": "色_{index}_{hex}",
+        "meta_source": "画像ファイル",
+        "meta_alpha": "透明度",
+        "meta_height": "高さ",
+        "meta_palette_size": "色数",
+        "meta_grid_size": "ピクセル数",
+        "meta_plane_size": "平面サイズ",
+        "meta_plane_preset": "平面プリセット",
+        "meta_light_influence": "ライトの影響度",
+        "download_button": "シーンファイルをダウンロード",
+    },
+    "en": {
+        "title": "Digital Craft Image Builder",
+        "subtitle": "Converts small images such as pixel art into Digital Craft scenes made of planes.",
+        "qa_title": "Q&A",
+        "qa_content": """
+**Q: What kind of images work well?**
+
+A: Pixel art and icons with few colors. Runs of the same color are merged into a single plane both horizontally and vertically, so fewer colors means fewer planes.
+
+**Q: I loaded a photo and got a huge number of planes!**
+
+A: Lower the "Colors" setting, or turn on "Downscale automatically to fit the plane budget".
+
+**Q: What happens to transparent areas?**
+
+A: Pixels that are less than half opaque are left empty.
+""",
+        "upload_label": "Image file (PNG / JPEG)",
+        "upload_info": "Please upload an image file.",
+        "load_error": "Failed to load the image: {error}",
+        "no_pixels": "No opaque pixels were found.",
+        "alpha_label": "Opacity",
+        "height_label": "Height",
+        "palette_size_label": "Colors",
+        "palette_size_help": "Reduces the image to at most this many colors. If the image already has fewer colors, they are used as is.",
+        "max_side_label": "Long side (pixels)",
+        "max_side_help": "Shrinks the image so its long side is at most this many pixels (nearest-neighbor, so pixel art stays crisp).",
+        "auto_downscale_label": "Downscale automatically to fit the plane budget",
+        "auto_downscale_help": "Lowers the long side until the plane count fits the budget.",
+        "plane_budget_label": "Plane budget",
+        "downscale_result": "Long side adjusted to {side} px ({count:,} planes / budget {budget:,})",
+        "downscale_over": "Even the smallest size, {side} px, exceeds the budget ({count:,} planes / budget {budget:,})",
+        "plane_limit_error": "Too many planes ({count:,} / limit {limit:,}). Reduce the colors or the long side.",
+        "advanced_settings": "Advanced Settings",
+        "plane_size_label": "Plane size",
+        "plane_size_help": "Size of the plane placed for each pixel. Values below 1 leave gaps between planes.",
+        "plane_preset_label": "Plane preset",
+        "plane_preset_map": "Plane (Map)",
+        "plane_preset_character": "Plane (Character)",
+        "light_influence_label": "Light influence",
+        "input_preview_title": "Preview after color reduction",
+        "pixel_data": "{width}×{height} pixels / {colors} colors",
+        "generate_button": "Generate Scene",
+        "generating": "Generating scene...",
+        "success_generate": "Generation complete ({count} planes)",
+        "scene_info_title": "Scene Info",
+        "scene_plane_count": "Planes",
+        "scene_pixel_count": "Pixels",
+        "scene_color_count": "Colors",
+        "metadata_folder": "Metadata",
+        "scene_root": "Image",
+        "color_folder": "Color_{index}_{hex}",
+        "meta_source": "Image file",
+        "meta_alpha": "Opacity",
+        "meta_height": "Height",
+        "meta_palette_size": "Colors",
+        "meta_grid_size": "Pixels",
+        "meta_plane_size": "Plane size",
+        "meta_plane_preset": "Plane preset",
+        "meta_light_influence": "Light influence",
+        "download_button": "Download scene file",
+    },
+}
+
+
+def get_text(key: str, lang: str = "ja") -> str:
+    """指定した言語の翻訳文字列を返す。"""
+    return TRANSLATIONS.get(lang, TRANSLATIONS["ja"]).get(key, key)
+
+
+PLANE_PRESETS = {
+    "map": {"category": 0, "no": 215},
+    "character": {"category": 1, "no": 290},
+}
+IMAGE_CACHE_ENTRIES = 16
+
+
+class ImageDotConfig:
+    # 平面モデルの1辺は scale=1 で 0.2 (カリグラファーのドットモードと同じ)
+    SPACING_RATIO = 0.2
+    ALPHA_THRESHOLD = 128
+    DEFAULT_PALETTE_SIZE = 16
+    MIN_PALETTE_SIZE = 2
+    MAX_PALETTE_SIZE = 64
+    DEFAULT_MAX_SIDE = 64
+    MIN_SIDE = 8
+    MAX_SIDE = 256
+    MAX_PLANE_COUNT = 60_000
+    DEFAULT_PLANE_BUDGET = 10_000
+
+
+TEMPLATE_SCENE_META = {
+    "version": "1.0.0",
+    "user_id": "deadbeef-dead-beef-dead-beefdeadbeef",
+    "data_id": "deadbeef-dead-beef-dead-beefdeadbeef",
+    "title": "Template",
+    "unknown_1": 1,
+    "unknown_2": b"#\\d7\xf1l\xf3\xdb?v\xe0X\xf8\x1cJ\xae\xfc\x10I\x96\x15k*P\xbf*u\x91.Yr\xbe",
+    "unknown_tail_1": b"\xee\xaa|\xcfZ\xdc\x97>\x14A\xf6\xfagp'\x84PB\xd3ze_7\xba\xad\xb5\x15\xa8O\xc3F\xd3\x18\x8b\x13&i0\xc9\xa2\x94?\xdcm\\7\x05\xdc",
+    "unknown_tail_2": b"\x9a\xd9\x0e\x878|>=k\x1e\x930S\xe9\xdf\x14e\xf3\x00\xb3b?\xcd\xf5\xa1UW{\x01\x98\xd3ob\xbd\x87\xba\xbf\xa3p\xfd.%\xaf'\xa3\x9d\x10>\x81s\xf2\xc7\x8f\x88\x8b.\x96e%\xc8\x1ba;\x0f[\x1e\xa8\xa2\xdd\xf6(\xea\xeaV\xe9\xa6\x0f\xb8\x15^\xde!X\x8e\xb0\x81\xfb\x87d\x89\x9d\xea\x14R\x988\xb7\xa2s\xba\x0e\xf1x2\xed\xd5U\xf6D\x9bJ\x82\xb9L\x8c\xed\xc3B\xd5\xc25\xe2%Z\xba@sN\x9f/\xac\x15\xedj\xabj\xe7\xed\xc2\xec\xdd\xb83\x11l\xf9?\x95B\xdf\r\x15rb<|V\xe7k~\xf1<Q,*@\tD\x97\x01,s\x1d\x8c\xfe!a\t\xfb6\\:2\xfd7\x00Q\x87\x05\x94*@kk!y\x05\xbf5\xef\x0e's\x03\xf5\t{wTa\xeb\xd65\xbc\xd9\xef\xb1\xabQ\xc2I\xec\x1a5",
+    "unknown_tail_3": b"\xf8\xe8\x14J\x87\xe2\x8f8v\x07q\x1d\xf1?v\xf14(% \xea\xcb\xaex=lAln\x01{C\xfd\xe9\xb4\xe4\x8e\xfd\x96\xd7;\x85\xff-fr\x16\xfe",
+    "unknown_tail_4": b"\xa0\x15a\t\x08\x07J\x0c\xac\xe0C>i\x99\xec\xe0y\xd1[MJ\x05\x0c\xa2\xfc\x96\xf6\xee&\x0c\xe1\x00)r)\xb9\xdf\xaa\xb4nV\x10\x0b\xec\xb6t\xa1\xd3\x95AP\xc2\xf0\x8aBd\x83\xd4\xb4p\xf5B\xce\xb7;k\xed\xf6\xfa\xbc\x1eJF\xcbt1\x87=\xebz\xac\xec^\xf7\x15 8i:QUh\x90!1v",
+    "unknown_tail_5": b"`)g\xf9\x1cN\x99\xfb\xc1\x9e\x80\x19\x0c\x96\x16\xe0)t>,\xc8\xc2\xd4t\x89\x98\x91\xd1\xd1\xc4\xd8\xbc\xdf\x92\xcf*b\x0c\x1d\xbaM\xd1\x8a\xf4\x12\x87!\x18",
+    "unknown_tail_6": b"\xaa\xf3\xff\xfb\xf4S\x80R\xda]7\x99\xdeig\xc6&\xd4\x187\x80\n\x80\xcf\x80\xd6Ch\x9amy\xb3X\x18\x88;\xce\xdb\x11&`\x89\x8c\x1c\xb7\x8a\xd8\xfe\x1e\x17\xa9l\x1f\xe4#\xb7\xf4\xdc\xc6kh\xaf\x9aB",
+    "unknown_tail_7": b"b\xad\xc5\xdc\xeeXz\xb2\x90\xfb\xa5\xfd\x84b\xafE",
+    "unknown_tail_8": b"b\xad\xc5\xdc\xeeXz\xb2\x90\xfb\xa5\xfd\x84b\xafE",
+    "unknown_tail_9": b'\xf4+\x98\x84\xde\xc3-\x15\xb0M<\xe2!"\xd5\xa5',
+    "unknown_tail_10": b"sR?\xa4b\xb8\t\xa6~\xb0\x10\xd3\xa0\xc9u\x16",
+    "frame_filename": "",
+    "unknown_tail_11": b"D\xaa\xee\x9b\xe40^\xf6+\xe7*d\x08H\xe1]",
+    "footer_marker": "【DigitalCraft】",
+    "unknown_tail_extra": b"",
+}
+
+TEMPLATE_FOLDER_KEY = 0
+TEMPLATE_FOLDER_DATA = {
+    "dicKey": 0,
+    "position": {"x": 0.0, "y": 0.0, "z": 0.0},
+    "rotation": {"x": 0.0, "y": 0.0, "z": 0.0},
+    "scale": {"x": 1.0, "y": 1.0, "z": 1.0},
+    "treeState": 1,
+    "visible": True,
+    "name": "Folder",
+    "child": [],
+}
+
+TEMPLATE_PLANE_DATA = {
+    "dicKey": 1,
+    "position": {"x": 0.0, "y": 0.0, "z": 0.0},
+    "rotation": {"x": 0.0, "y": 0.0, "z": 0.0},
+    "scale": {"x": 1.0, "y": 1.0, "z": 1.0},
+    "treeState": 1,
+    "visible": True,
+    "title": 0,
+    "group": 0,
+    "category": 0,
+    "no": 215,
+    "anime_pattern": 0,
+    "anime_speed": 1.0,
+    "colors": [
+        {"r": 1.0, "g": 1.0, "b": 1.0, "a": 1.0},
+        {"r": 1.0, "g": 1.0, "b": 1.0, "a": 1.0},
+        {"r": 1.0, "g": 1.0, "b": 1.0, "a": 1.0},
+        {"r": 0.5, "g": 0.5, "b": 0.5, "a": 1.0},
+        {"r": 1.0, "g": 1.0, "b": 1.0, "a": 1.0},
+        {"r": 1.0, "g": 1.0, "b": 1.0, "a": 1.0},
+        {"r": 1.0, "g": 1.0, "b": 1.0, "a": 1.0},
+        {"r": 1.0, "g": 1.0, "b": 1.0, "a": 1.0},
+    ],
+    "shadow_type": -1,
+    "shadow_switch": False,
+    "shadow_strength": 0.0,
+    "patterns": [
+        {
+            "key": 0,
+            "filepath": "",
+            "clamp": False,
+            "uv": {"x": 0.0, "y": 0.0, "z": 1.0, "w": 1.0},
+            "rot": 0.0,
+        },
+        {
+            "key": 0,
+            "filepath": "",
+            "clamp": False,
+            "uv": {"x": 0.0, "y": 0.0, "z": 1.0, "w": 1.0},
+            "rot": 0.0,
+        },
+        {
+            "key": 0,
+            "filepath": "",
+            "clamp": False,
+            "uv": {"x": 0.0, "y": 0.0, "z": 1.0, "w": 1.0},
+            "rot": 0.0,
+        },
+    ],
+    "alpha": 1.0,
+    "line_color": {"r": 0.0, "g": 0.0, "b": 0.0, "a": 1.0},
+    "line_width": 0.0,
+    "emission_color": {"r": 1.0, "g": 1.0, "b": 1.0, "a": 1.0},
+    "emission_power": 0.0,
+    "light_cancel": 0.0,
+    "panel": {
+        "key": 0,
+        "filepath": "",
+        "clamp": False,
+        "uv": {"x": 0.0, "y": 0.0, "z": 1.0, "w": 1.0},
+        "rot": 0.0,
+    },
+    "enable_fk": False,
+    "bones": {},
+    "enable_dynamic_bone": True,
+    "anime_normalized_time": 0.0,
+    "child": [],
+}
+
+
+def build_template_scene() -> HoneycomeSceneData:
+    """最小構成のテンプレートシーンを組み立てる。"""
+    scene = HoneycomeSceneData()
+    scene.image = None
+    scene.version = TEMPLATE_SCENE_META["version"]
+    scene.dataVersion = TEMPLATE_SCENE_META["version"]
+    scene.user_id = TEMPLATE_SCENE_META["user_id"]
+    scene.data_id = TEMPLATE_SCENE_META["data_id"]
+    scene.title = TEMPLATE_SCENE_META["title"]
+    scene.unknown_1 = TEMPLATE_SCENE_META["unknown_1"]
+    scene.unknown_2 = TEMPLATE_SCENE_META["unknown_2"]
+    scene.unknown_tail_1 = TEMPLATE_SCENE_META["unknown_tail_1"]
+    scene.unknown_tail_2 = TEMPLATE_SCENE_META["unknown_tail_2"]
+    scene.unknown_tail_3 = TEMPLATE_SCENE_META["unknown_tail_3"]
+    scene.unknown_tail_4 = TEMPLATE_SCENE_META["unknown_tail_4"]
+    scene.unknown_tail_5 = TEMPLATE_SCENE_META["unknown_tail_5"]
+    scene.unknown_tail_6 = TEMPLATE_SCENE_META["unknown_tail_6"]
+    scene.unknown_tail_7 = TEMPLATE_SCENE_META["unknown_tail_7"]
+    scene.unknown_tail_8 = TEMPLATE_SCENE_META["unknown_tail_8"]
+    scene.unknown_tail_9 = TEMPLATE_SCENE_META["unknown_tail_9"]
+    scene.unknown_tail_10 = TEMPLATE_SCENE_META["unknown_tail_10"]
+    scene.frame_filename = TEMPLATE_SCENE_META["frame_filename"]
+    scene.unknown_tail_11 = TEMPLATE_SCENE_META["unknown_tail_11"]
+    scene.footer_marker = TEMPLATE_SCENE_META["footer_marker"]
+    scene.unknown_tail_extra = TEMPLATE_SCENE_META["unknown_tail_extra"]
+
+    folder_obj = {"type": 3, "data": copy.deepcopy(TEMPLATE_FOLDER_DATA)}
+    folder_obj["data"]["child"] = [
+        {"type": 1, "data": copy.deepcopy(TEMPLATE_PLANE_DATA)}
+    ]
+    scene.objects = {TEMPLATE_FOLDER_KEY: folder_obj}
+    return scene
+
+
+@st.cache_resource
+def load_template() -> tuple[HoneycomeSceneData, dict[str, Any], int, dict[str, Any]]:
+    """生成に使うテンプレート要素をキャッシュ付きで取得する。"""
+    template_scene = build_template_scene()
+    folder_key = TEMPLATE_FOLDER_KEY
+    folder_obj = template_scene.objects[folder_key]
+    plane_template = folder_obj["data"]["child"][0]
+    return template_scene, plane_template, folder_key, folder_obj
+
+
+def create_plane(
+    template: dict[str, Any],
+    x: float,
+    y: float,
+    z: float,
+    color: dict[str, float],
+    scale: float = 1.0,
+) -> dict[str, Any]:
+    """平面テンプレートを複製し、位置・色・一様スケールを反映する。"""
+    plane = copy.deepcopy(template)
+    plane["data"]["position"]["x"] = x
+    plane["data"]["position"]["y"] = y
+    plane["data"]["position"]["z"] = z
+    plane["data"]["scale"]["x"] = scale
+    plane["data"]["scale"]["y"] = scale
+    plane["data"]["scale"]["z"] = scale
+    plane["data"]["colors"][0] = color
+    plane["data"]["line_width"] = 0.0
+    return plane
+
+
+def build_metadata_folder(
+    folder_obj: dict[str, Any], metadata: dict[str, Any], lang: str
+) -> dict[str, Any]:
+    """生成メタデータを子フォルダとして格納したフォルダを作る。"""
+    info_folder = copy.deepcopy(folder_obj)
+    info_folder["data"]["name"] = get_text("metadata_folder", lang)
+    info_folder["data"]["treeState"] = 1
+    info_folder["data"]["child"] = []
+
+    for key, value in metadata.items():
+        child_folder = copy.deepcopy(folder_obj)
+        child_folder["data"]["name"] = f"{key}={value}"
+        child_folder["data"]["treeState"] = 1
+        child_folder["data"]["child"] = []
+        info_folder["data"]["child"].append(child_folder)
+
+    return info_folder
+
+
+class ImageDotPipeline:
+    """画像をドット(平面)のシーンへ変換する処理をまとめる。
+
+    減色・矩形への結合・配置はすべて NumPy の配列演算で行い、Python のループは
+    最後に平面オブジェクトを作るところだけにする。
+    """
+
+    Config = ImageDotConfig
+
+    @staticmethod
+    def load_image(image_bytes: bytes) -> Image.Image:
+        """画像を読み込み、EXIF の向きを反映した RGBA 画像にする。"""
+        image = Image.open(io.BytesIO(image_bytes))
+        return ImageOps.exif_transpose(image).convert("RGBA")
+
+    @staticmethod
+    def resize_to_long_side(image: Image.Image, long_side: int) -> Image.Image:
+        """長辺が long_side 以下になるよう、ドットが崩れない最近傍で縮小する。"""
+        scale = long_side / max(image.size)
+        if scale >= 1.0:
+            return image
+        size = (
+            max(1, round(image.width * scale)),
+            max(1, round(image.height * scale)),
+        )
+        return image.resize(size, Image.Resampling.NEAREST)
+
+    @staticmethod
+    def quantize_pixels(
+        image: Image.Image, palette_size: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """画像を palette_size 色以下に減色し、(色番号の格子, パレット) を返す。
+
+        透明なピクセルの色番号は -1。元の色数が palette_size 以下なら色はそのまま使う。
+        """
+        rgba = np.asarray(image.convert("RGBA"))
+        opaque = rgba[..., 3] >= ImageDotConfig.ALPHA_THRESHOLD
+        labels = np.full(opaque.shape, -1, dtype=np.int32)
+        if not opaque.any():
+            return labels, np.zeros((0, 3), dtype=np.uint8)
+
+        rgb = rgba[..., :3][opaque]
+        packed = (
+            (rgb[:, 0].astype(np.uint32) << 16)
+            | (rgb[:, 1].astype(np.uint32) << 8)
+            | rgb[:, 2].astype(np.uint32)
+        )
+        unique_colors, inverse = np.unique(packed, return_inverse=True)
+        if len(unique_colors) <= palette_size:
+            palette = np.column_stack(
+                [
+                    (unique_colors >> 16) & 255,
+                    (unique_colors >> 8) & 255,
+                    unique_colors & 255,
+                ]
+            ).astype(np.uint8)
+        else:
+            # 不透明なピクセルだけを1行の画像に並べて減色する
+            strip = Image.fromarray(rgb.reshape(1, -1, 3))
+            quantized = strip.quantize(
+                colors=palette_size, method=Image.Quantize.MEDIANCUT
+            )
+            indices = np.asarray(quantized).reshape(-1)
+            full_palette = np.asarray(quantized.getpalette(), dtype=np.uint8).reshape(
+                -1, 3
+            )
+            used_indices, inverse = np.unique(indices, return_inverse=True)
+            palette = full_palette[used_indices]
+        labels[opaque] = inverse.reshape(-1)
+        return labels, palette
+
+    @staticmethod
+    def extract_rectangles(labels: np.ndarray) -> np.ndarray:
+        """色番号の格子を、同じ色の矩形にまとめる。
+
+        各行で同じ色が続く区間を1本の帯にし、上下の行で同じ位置・同じ色の帯が続く
+        ものを縦に伸ばす (カリグラファーのドットモードの結合と同じ規則)。
+        戻り値は (行の始まり, 行の終わり, 列の始まり, 列の終わり, 色番号) の整数配列。
+        """
+        if labels.size == 0:
+            return np.zeros((0, 5), dtype=np.int32)
+        padded = np.pad(labels, ((0, 0), (1, 1)), constant_values=-1)
+        # 列 j の直前で色が変わる位置 (j = 0..幅)
+        rows, cols = np.nonzero(padded[:, 1:] != padded[:, :-1])
+        same_row = rows[:-1] == rows[1:]
+        run_rows = rows[:-1][same_row]
+        run_starts = cols[:-1][same_row]
+        run_ends = cols[1:][same_row] - 1
+        run_labels = labels[run_rows, run_starts]
+        opaque = run_labels >= 0
+        run_rows = run_rows[opaque]
+        run_starts = run_starts[opaque]
+        run_ends = run_ends[opaque]
+        run_labels = run_labels[opaque]
+        if run_rows.size == 0:
+            return np.zeros((0, 5), dtype=np.int32)
+
+        order = np.lexsort((run_rows, run_labels, run_ends, run_starts))
+        run_rows = run_rows[order]
+        run_starts = run_starts[order]
+        run_ends = run_ends[order]
+        run_labels = run_labels[order]
+        continues = np.zeros(run_rows.size, dtype=bool)
+        continues[1:] = (
+            (run_starts[1:] == run_starts[:-1])
+            & (run_ends[1:] == run_ends[:-1])
+            & (run_labels[1:] == run_labels[:-1])
+            & (run_rows[1:] == run_rows[:-1] + 1)
+        )
+        first = np.flatnonzero(~continues)
+        last = np.append(first[1:] - 1, run_rows.size - 1)
+        rectangles = np.column_stack(
+            [
+                run_rows[first],
+                run_rows[last],
+                run_starts[first],
+                run_ends[first],
+                run_labels[first],
+            ]
+        ).astype(np.int32)
+        # 色ごと・上から順に並べ、フォルダ分けと出力の順序を安定させる
+        order = np.lexsort((rectangles[:, 2], rectangles[:, 0], rectangles[:, 4]))
+        return rectangles[order]
+
+    @staticmethod
+    def build_dot_grid(
+        image_bytes: bytes, long_side: int, palette_size: int
+    ) -> dict[str, Any]:
+        """画像を縮小・減色し、平面に置く矩形まで求める。"""
+        image = ImageDotPipeline.load_image(image_bytes)
+        image = ImageDotPipeline.resize_to_long_side(image, long_side)
+        labels, palette = ImageDotPipeline.quantize_pixels(image, palette_size)
+        return {
+            "labels": labels,
+            "palette": palette,
+            "rectangles": ImageDotPipeline.extract_rectangles(labels),
+            "pixel_count": int(np.count_nonzero(labels >= 0)),
+        }
+
+    @staticmethod
+    def fit_long_side_to_budget(
+        image_hash: str,
+        image_bytes: bytes,
+        palette_size: int,
+        max_side: int,
+        plane_budget: int,
+    ) -> dict[str, Any]:
+        """平面数が目安に収まる最大の長辺ピクセル数を二分探索で求める。"""
+        native_grid = load_dot_grid(image_hash, max_side, palette_size, image_bytes)
+        native_side = max(native_grid["labels"].shape)
+        candidates = list(
+            range(min(ImageDotConfig.MIN_SIDE, native_side), native_side + 1)
+        )
+        plane_counts: dict[int, int] = {native_side: len(native_grid["rectangles"])}
+
+        def probe(side: int) -> int:
+            if side not in plane_counts:
+                grid = load_dot_grid(image_hash, side, palette_size, image_bytes)
+                plane_counts[side] = len(grid["rectangles"])
+            return plane_counts[side]
+
+        # 平面数は長辺に対してほぼ単調に増えるので、収まる最大の候補を二分探索する。
+        low = 0
+        high = len(candidates) - 1
+        best_index = None
+        while low <= high:
+            mid = (low + high) // 2
+            if probe(candidates[mid]) <= plane_budget:
+                best_index = mid
+                low = mid + 1
+            else:
+                high = mid - 1
+
+        side = candidates[best_index if best_index is not None else 0]
+        return {
+            "side": side,
+            "fits": best_index is not None,
+            "plane_count": probe(side),
+        }
+
+    @staticmethod
+    def palette_to_colors(
+        palette: np.ndarray, color_alpha: float
+    ) -> list[dict[str, float]]:
+        """パレットを平面に塗る 0-1 正規化 RGBA 辞書のリストにする。"""
+        return [
+            {
+                "r": float(r) / 255.0,
+                "g": float(g) / 255.0,
+                "b": float(b) / 255.0,
+                "a": color_alpha,
+            }
+            for r, g, b in palette.tolist()
+        ]
+
+    @staticmethod
+    def build_color_folders(
+        grid: dict[str, Any],
+        plane_template: dict[str, Any],
+        folder_obj: dict[str, Any],
+        *,
+        spacing: float,
+        plane_scale: float,
+        color_alpha: float,
+        lang: str,
+    ) -> list[dict[str, Any]]:
+        """矩形を平面にし、色ごとのフォルダにまとめる。
+
+        画像の中心を原点に置き、列を X、行を -Z に対応させる (SVG ビルダーと同じ向き)。
+        """
+        height, width = grid["labels"].shape
+        rectangles = grid["rectangles"]
+        row_start, row_end, col_start, col_end, labels = rectangles.T
+        xs = ((col_start + col_end) / 2.0 - (width - 1) / 2.0) * spacing
+        zs = -((row_start + row_end) / 2.0 - (height - 1) / 2.0) * spacing
+        scale_xs = (col_end - col_start + 1) * plane_scale
+        scale_zs = (row_end - row_start + 1) * plane_scale
+        colors = ImageDotPipeline.palette_to_colors(grid["palette"], color_alpha)
+        bounds = np.searchsorted(labels, np.arange(len(colors) + 1))
+
+        palette = grid["palette"].tolist()
+        folders = []
+        # 大量の辞書を作る間は循環参照の GC が何度も走って遅くなるので止めておく
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for index, color in enumerate(colors):
+                begin, end = int(bounds[index]), int(bounds[index + 1])
+                # 平面を1枚ずつ deepcopy すると遅いので、色ごとに直列化した雛形から複製する
+                plane_blob = pickle.dumps(
+                    create_plane(plane_template, 0.0, 0.0, 0.0, color, plane_scale),
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+                planes = []
+                for x, z, scale_x, scale_z in zip(
+                    xs[begin:end].tolist(),
+                    zs[begin:end].tolist(),
+                    scale_xs[begin:end].tolist(),
+                    scale_zs[begin:end].tolist(),
+                ):
+                    plane = pickle.loads(plane_blob)
+                    data = plane["data"]
+                    data["position"]["x"] = x
+                    data["position"]["z"] = z
+                    data["scale"]["x"] = scale_x
+                    data["scale"]["z"] = scale_z
+                    planes.append(plane)
+
+                color_folder = copy.deepcopy(folder_obj)
+                color_folder["data"]["name"] = get_text("color_folder", lang).format(
+                    index=index + 1, hex="#{:02X}{:02X}{:02X}".format(*palette[index])
+                )
+                color_folder["data"]["treeState"] = 1
+                color_folder["data"]["child"] = planes
+                folders.append(color_folder)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return folders
+
+    @staticmethod
+    def build_preview_image(grid: dict[str, Any]) -> Image.Image:
+        """減色後の格子を、透明部分を抜いた RGBA 画像にする。"""
+        labels = grid["labels"]
+        rgba = np.zeros(labels.shape + (4,), dtype=np.uint8)
+        opaque = labels >= 0
+        rgba[opaque, :3] = grid["palette"][labels[opaque]]
+        rgba[opaque, 3] = 255
+        return Image.fromarray(rgba, mode="RGBA")
+
+    @staticmethod
+    def build_scene_image_bytes(
+        preview: Image.Image, width: int = 1280, height: int = 720
+    ) -> bytes:
+        """シーンに埋め込む不透明な16:9サムネイルPNGを作る。"""
+        canvas = Image.new("RGBA", (width, height), (20, 20, 20, 255))
+        scale = min(width / preview.width, height / preview.height)
+        resized = preview.resize(
+            (
+                max(1, round(preview.width * scale)),
+                max(1, round(preview.height * scale)),
+            ),
+            Image.Resampling.NEAREST,
+        )
+        x = (width - resized.width) // 2
+        y = (height - resized.height) // 2
+        canvas.alpha_composite(resized, (x, y))
+        buf = io.BytesIO()
+        canvas.convert("RGB").save(buf, format="PNG")
+        return buf.getvalue()
+
+    @staticmethod
+    def generate_image_scene(
+        *,
+        grid: dict[str, Any],
+        template_scene: HoneycomeSceneData,
+        plane_template: dict[str, Any],
+        folder_key: int,
+        folder_obj: dict[str, Any],
+        image_height: float,
+        plane_size_factor: float,
+        color_alpha: float,
+        generation_metadata: dict[str, Any],
+        scene_root_name: str,
+        lang: str,
+    ) -> HoneycomeSceneData:
+        """減色・結合済みの格子から、色ごとのフォルダに平面を並べたシーンを作る。"""
+        grid_height = grid["labels"].shape[0]
+        # カリグラファーのドットモードと同じく、平面の間隔 = 1ピクセルの大きさ
+        spacing = image_height / grid_height
+        plane_scale = (spacing / ImageDotConfig.SPACING_RATIO) * plane_size_factor
+        color_folders = ImageDotPipeline.build_color_folders(
+            grid,
+            plane_template,
+            folder_obj,
+            spacing=spacing,
+            plane_scale=plane_scale,
+            color_alpha=color_alpha,
+            lang=lang,
+        )
+
+        scene = copy.deepcopy(template_scene)
+        scene.title = scene_root_name
+        new_folder = copy.deepcopy(folder_obj)
+        new_folder["data"]["name"] = scene_root_name
+        metadata_folder = build_metadata_folder(folder_obj, generation_metadata, lang)
+        new_folder["data"]["child"] = [metadata_folder] + color_folders
+        scene.objects = {folder_key: new_folder}
+        scene.image = ImageDotPipeline.build_scene_image_bytes(
+            ImageDotPipeline.build_preview_image(grid)
+        )
+        return scene
+
+
+@st.cache_resource(max_entries=IMAGE_CACHE_ENTRIES, show_spinner=False)
+def load_dot_grid(
+    image_hash: str, long_side: int, palette_size: int, _image_bytes: bytes
+) -> dict[str, Any]:
+    """縮小・減色・矩形結合の結果を、画像の内容ハッシュと設定ごとに使い回す。"""
+    return ImageDotPipeline.build_dot_grid(_image_bytes, long_side, palette_size)
+
+
+def sanitize_stem(name: str) -> str:
+    """出力ファイル名に使える安全なステム文字列を作る。"""
+    stem = Path(name).stem
+    safe = "".join(ch if ch.isalnum() else "_" for ch in stem)
+    return safe or "image"
+
+
+def render_scene_info(
+    plane_count: int, pixel_count: int, color_count: int, lang: str
+) -> None:
+    """平面数の集計メトリクスを Streamlit 上に表示する。"""
+    st.subheader(get_text("scene_info_title", lang))
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(get_text("scene_plane_count", lang), f"{plane_count}")
+    with col2:
+        st.metric(get_text("scene_pixel_count", lang), f"{pixel_count}")
+    with col3:
+        st.metric(get_text("scene_color_count", lang), f"{color_count}")
+
+
+def main() -> None:
+    """画像ビルダーの Streamlit アプリ本体を実行する。"""
+    st.set_page_config(
+        page_title="Digital Craft Image Builder / デジクラ画像ビルダー",
+        page_icon="🖼️",
+        layout="wide",
+    )
+
+    lang = st.session_state.get("lang", "ja")
+
+    st.title(f"🖼️ {get_text('title', lang)}")
+    st.markdown(get_text("subtitle", lang))
+
+    with st.expander(f"❓ {get_text('qa_title', lang)}", expanded=False):
+        st.markdown(get_text("qa_content", lang).strip())
+
+    uploaded_image = st.file_uploader(
+        get_text("upload_label", lang), type=["png", "jpg", "jpeg"]
+    )
+    if uploaded_image is None:
+        st.info(get_text("upload_info", lang))
+        st.stop()
+
+    image_bytes = uploaded_image.getvalue()
+    image_hash = hashlib.sha256(image_bytes).hexdigest()
+
+    color_alpha = st.slider(
+        get_text("alpha_label", lang),
+        min_value=0.0,
+        max_value=1.0,
+        value=1.0,
+        step=0.05,
+    )
+    image_height = st.slider(
+        get_text("height_label", lang),
+        min_value=0.01,
+        max_value=2.0,
+        value=0.5,
+        step=0.01,
+    )
+    palette_size = st.slider(
+        get_text("palette_size_label", lang),
+        min_value=ImageDotConfig.MIN_PALETTE_SIZE,
+        max_value=ImageDotConfig.MAX_PALETTE_SIZE,
+        value=ImageDotConfig.DEFAULT_PALETTE_SIZE,
+        help=get_text("palette_size_help", lang),
+    )
+    col1, col2 = st.columns(2)
+    with col2:
+        auto_downscale = st.checkbox(
+            get_text("auto_downscale_label", lang),
+            value=False,
+            help=get_text("auto_downscale_help", lang),
+        )
+        plane_budget = ImageDotConfig.DEFAULT_PLANE_BUDGET
+        if auto_downscale:
+            plane_budget = st.number_input(
+                get_text("plane_budget_label", lang),
+                min_value=1_000,
+                max_value=ImageDotConfig.MAX_PLANE_COUNT,
+                value=ImageDotConfig.DEFAULT_PLANE_BUDGET,
+                step=1_000,
+            )
+    with col1:
+        max_side = st.slider(
+            get_text("max_side_label", lang),
+            min_value=ImageDotConfig.MIN_SIDE,
+            max_value=ImageDotConfig.MAX_SIDE,
+            value=ImageDotConfig.DEFAULT_MAX_SIDE,
+            help=get_text("max_side_help", lang),
+        )
+
+    with st.expander(get_text("advanced_settings", lang), expanded=False):
+        plane_size_factor = st.slider(
+            get_text("plane_size_label", lang),
+            min_value=0.5,
+            max_value=1.0,
+            value=1.0,
+            step=0.05,
+            help=get_text("plane_size_help", lang),
+        )
+        plane_preset_key = st.selectbox(
+            get_text("plane_preset_label", lang),
+            options=["map", "character"],
+            format_func=lambda key: get_text(f"plane_preset_{key}", lang),
+            index=0,
+        )
+        light_cancel = st.slider(
+            get_text("light_influence_label", lang),
+            min_value=0.0,
+            max_value=1.0,
+            value=1.0,
+            step=0.05,
+        )
+
+    try:
+        long_side = int(max_side)
+        if auto_downscale:
+            fitted = ImageDotPipeline.fit_long_side_to_budget(
+                image_hash, image_bytes, palette_size, long_side, int(plane_budget)
+            )
+            long_side = fitted["side"]
+            message = get_text(
+                "downscale_result" if fitted["fits"] else "downscale_over", lang
+            ).format(
+                side=fitted["side"],
+                count=fitted["plane_count"],
+                budget=int(plane_budget),
+            )
+            if fitted["fits"]:
+                st.info(message)
+            else:
+                st.warning(message)
+        grid = load_dot_grid(image_hash, long_side, palette_size, image_bytes)
+    except Exception as exc:
+        st.error(get_text("load_error", lang).format(error=exc))
+        st.exception(exc)
+        st.stop()
+
+    if grid["pixel_count"] == 0:
+        st.error(get_text("no_pixels", lang))
+        st.stop()
+
+    grid_height, grid_width = grid["labels"].shape
+    preview = ImageDotPipeline.build_preview_image(grid)
+    st.subheader(get_text("input_preview_title", lang))
+    st.markdown(
+        f"**{get_text('pixel_data', lang).format(width=grid_width, height=grid_height, colors=len(grid['palette']))}**"
+    )
+    preview_scale = max(1, min(12, int(512 / max(grid_width, grid_height))))
+    st.image(
+        preview.resize(
+            (grid_width * preview_scale, grid_height * preview_scale),
+            Image.Resampling.NEAREST,
+        ),
+        width="content",
+    )
+
+    plane_count = len(grid["rectangles"])
+    if plane_count > ImageDotConfig.MAX_PLANE_COUNT:
+        st.error(
+            get_text("plane_limit_error", lang).format(
+                count=plane_count, limit=ImageDotConfig.MAX_PLANE_COUNT
+            )
+        )
+        st.stop()
+
+    if not st.button(
+        get_text("generate_button", lang), type="primary", width="stretch"
+    ):
+        st.stop()
+
+    template_scene, plane_template, folder_key, folder_obj = load_template()
+    plane_settings = PLANE_PRESETS[plane_preset_key]
+    resolved_plane_template = {
+        **plane_template,
+        "data": {
+            **plane_template["data"],
+            "category": plane_settings["category"],
+            "no": plane_settings["no"],
+            "light_cancel": 1.0 - light_cancel,
+        },
+    }
+    generation_metadata = {
+        get_text("meta_source", lang): uploaded_image.name,
+        get_text("meta_alpha", lang): color_alpha,
+        get_text("meta_height", lang): image_height,
+        get_text("meta_palette_size", lang): palette_size,
+        get_text("meta_grid_size", lang): f"{grid_width}x{grid_height}",
+        get_text("meta_plane_size", lang): plane_size_factor,
+        get_text("meta_plane_preset", lang): get_text(
+            f"plane_preset_{plane_preset_key}", lang
+        ),
+        get_text("meta_light_influence", lang): light_cancel,
+    }
+    scene_root_name = (
+        f"{get_text('scene_root', lang)}: {sanitize_stem(uploaded_image.name)}"
+    )
+
+    with st.spinner(get_text("generating", lang)):
+        scene = ImageDotPipeline.generate_image_scene(
+            grid=grid,
+            template_scene=template_scene,
+            plane_template=resolved_plane_template,
+            folder_key=folder_key,
+            folder_obj=folder_obj,
+            image_height=image_height,
+            plane_size_factor=plane_size_factor,
+            color_alpha=color_alpha,
+            generation_metadata=generation_metadata,
+            scene_root_name=scene_root_name,
+            lang=lang,
+        )
+
+    st.success(get_text("success_generate", lang).format(count=plane_count))
+    render_scene_info(
+        plane_count=plane_count,
+        pixel_count=grid["pixel_count"],
+        color_count=len(grid["palette"]),
+        lang=lang,
+    )
+    filename = f"digitalcraft_scene_image_{sanitize_stem(uploaded_image.name)}.png"
+    st.download_button(
+        label=get_text("download_button", lang),
+        data=lambda: bytes(scene),
+        file_name=filename,
+        mime="image/png",
+        type="primary",
+        width="stretch",
+        on_click="ignore",
+    )
+
+
+if __name__ == "__main__":
+    main()
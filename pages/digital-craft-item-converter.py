@@ -1,7 +1,12 @@
+import hashlib
 import io
+import pickle
+import threading
 
+import pandas as pd
 import streamlit as st
 from kkloader import HoneycomeSceneData
+from kkloader.HoneycomeSceneObjectLoader import HoneycomeSceneObjectLoader
 
 # ========================================
 # i18n対応: 多言語辞書
@@ -362,57 +367,247 @@ PLANE_MAP_CHARA_DICT = [
 
 FOLDER_TYPE = 3
 ITEM_TYPE = 1
+# 読み込み済みシーンを保持する件数。古いものから捨てる
+SCENE_CACHE_MAX_ENTRIES = 4
 
 
-def find_top_level_folders(objects):
+# 名前の表示に使うため、遅延読み込みでも最初から解析しておくブロック
+EAGER_CHARACTER_BLOCKS = ("Parameter",)
+
+
+class DeferredCharaLoader:
+    """キャラクターのブロックデータを解析せず、元のバイト列のまま読み込むローダー。
+
+    ヘッダーと画像は通常どおり読み、EAGER_CHARACTER_BLOCKS 以外のブロックは
+    UnknownBlockData として持つ。保存時は元のバイト列がそのまま書き出される。
+
+    EAGER_CHARACTER_BLOCKS から load_scene_deferred までは data-viewer /
+    item-converter / character-converter の3ページに同じ内容で置いている。
+    変更するときは3ページとも揃えること。
     """
-    トップレベル（一番上の階層）のフォルダのみをリストアップする
+
+    def __init__(self, chara_class):
+        self.chara_class = chara_class
+
+    def load(self, data_stream, contains_png=True):
+        chara = self.chara_class()
+        chara.original_file_path = None
+        chara._load_header(data_stream, contains_image=contains_png)
+        # modules を空にすると、すべてのブロックが UnknownBlockData として読まれる
+        modules = chara.modules
+        chara.modules = {}
+        try:
+            chara._load_blockdata(data_stream)
+        finally:
+            chara.modules = modules
+        return decode_deferred_blocks(chara, EAGER_CHARACTER_BLOCKS)
+
+
+def decode_deferred_blocks(chara, names=None):
+    """遅延していたブロックを本来のクラスで解析する。names を省略するとすべて。"""
+    for name in list(getattr(chara, "unknown_blockdata", [])):
+        if name not in chara.modules or (names is not None and name not in names):
+            continue
+        block = getattr(chara, name)
+        setattr(chara, name, chara.modules[name](block.data, block.version))
+        chara.unknown_blockdata.remove(name)
+    return chara
+
+
+@st.cache_resource
+def get_scene_load_lock():
+    """キャラクターのローダーを差し替えている間、他の読み込みを待たせるロック。"""
+    return threading.Lock()
+
+
+def load_scene_deferred(file_like):
+    """キャラクターのブロックデータを遅延させてシーンを読み込む。
+
+    kkloader はヘッダーからキャラクターのクラスを引くため、その対応表を
+    読み込みの間だけ DeferredCharaLoader に差し替える。
+    """
+    with get_scene_load_lock():
+        dispatch = HoneycomeSceneObjectLoader._CHARA_DATA_DISPATCH
+        HoneycomeSceneObjectLoader._CHARA_DATA_DISPATCH = {
+            header: DeferredCharaLoader(chara_class)
+            for header, chara_class in dispatch.items()
+        }
+        try:
+            return HoneycomeSceneData.load(file_like)
+        finally:
+            HoneycomeSceneObjectLoader._CHARA_DATA_DISPATCH = dispatch
+
+
+@st.cache_resource(max_entries=SCENE_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_scene_snapshot(scene_sha256, _file_bytes):
+    """アップロードされたシーンを SHA-256 ごとに1回だけ読み込み、pickle して返す。
+
+    データビューア・アイテム変換・キャラ統一は同一ソースのこの関数を持つため、
+    キャッシュキーが一致し、どのページで読み込んだシーンも共有される。
     """
-    folders = []
+    scene = load_scene_deferred(io.BytesIO(_file_bytes))
+    return pickle.dumps(scene, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_scene(file_bytes):
+    """キャッシュ済みのシーンから、書き換えてもキャッシュに影響しない複製を返す。"""
+    scene_sha256 = hashlib.sha256(file_bytes).hexdigest()
+    return pickle.loads(load_scene_snapshot(scene_sha256, file_bytes))
+
+
+# オブジェクト索引の列と型。1行が1オブジェクトで、並びは hs.walk() と同じ
+OBJECT_INDEX_DTYPES = {
+    "key": object,
+    "path": object,
+    "type": "int8",
+    "parent": "int32",
+    "depth": "int16",
+    "child_count": "int32",
+    "name": object,
+    "active": bool,
+    "group": "int32",
+    "category": "int32",
+    "no": "int32",
+    "title": "int32",
+    "header": object,
+}
+
+
+def describe_character(chara):
+    """キャラクターのヘッダーと表示名 (Parameter の姓名) を返す。"""
+    header = getattr(chara, "header", "Unknown")
+    if isinstance(header, bytes):
+        try:
+            header = header.decode("utf-8")
+        except UnicodeDecodeError:
+            header = "(corrupted)"
+
+    name = "Unknown"
+    if "Parameter" in chara.blockdata:
+        param = chara["Parameter"]
+        lastname = param.data.get("lastname", "")
+        firstname = param.data.get("firstname", "")
+        if lastname or firstname:
+            name = f"{lastname} {firstname}".strip()
+    return header, name
+
+
+def build_object_index(hs):
+    """シーンの全オブジェクトを1回だけ走査し、列ごとの索引 (DataFrame) にする。
+
+    - key: walk() が返すキー / path: hs.objects からのたどり方 (resolve_object 用)
+    - parent: 親の行番号 (トップレベルは -1) / depth: 階層の深さ
+    - name: フォルダ・ルート・カメラなどの名前。キャラクターは表示名
+    - group, category, no, title: アイテムの ID (アイテム以外は -1)
+    - header: キャラクターのヘッダー (キャラクター以外は None)
+    """
+    columns = {name: [] for name in OBJECT_INDEX_DTYPES}
 
-    for key, obj in objects.items():
+    def add(key, path, obj, parent, depth):
+        row = len(columns["key"])
         obj_type = obj.get("type")
         data = obj.get("data", {})
-
-        if obj_type == FOLDER_TYPE:
-            folder_name = data.get("name", "")
-            child_list = data.get("child", [])
-            folders.append(
-                {
-                    "name": folder_name,
-                    "child_count": len(child_list),
-                    "obj": obj,
-                    "key": key,
-                }
+        child = data.get("child")
+        if obj_type == 0:
+            # キャラクターの子は Dict[int, List[ObjectInfo]]
+            children = [
+                ((child_key, idx), child_obj)
+                for child_key, child_list in (child or {}).items()
+                for idx, child_obj in enumerate(child_list)
+            ]
+        else:
+            children = list(enumerate(child or []))
+
+        name = data.get("name", "")
+        header = None
+        if obj_type == 0 and data.get("character"):
+            header, name = describe_character(data["character"])
+        is_item = obj_type == 1
+
+        columns["key"].append(key)
+        columns["path"].append(path)
+        columns["type"].append(obj_type)
+        columns["parent"].append(parent)
+        columns["depth"].append(depth)
+        columns["child_count"].append(len(children))
+        columns["name"].append(name)
+        columns["active"].append(bool(data.get("active", False)))
+        for id_name in ("group", "category", "no", "title"):
+            columns[id_name].append(data.get(id_name, -1) if is_item else -1)
+        columns["header"].append(header)
+
+        for child_key, child_obj in children:
+            add(child_key, path + (child_key,), child_obj, row, depth + 1)
+
+    for key, obj in hs.objects.items():
+        add(key, (key,), obj, -1, 0)
+
+    return pd.DataFrame(
+        {
+            name: pd.Series(values, dtype=dtype)
+            for (name, dtype), values in zip(
+                OBJECT_INDEX_DTYPES.items(), columns.values()
             )
+        }
+    )
 
-    return folders
 
+@st.cache_data(max_entries=SCENE_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_object_index(scene_sha256, _hs):
+    """シーンの索引を SHA-256 ごとに1回だけ作る。
 
-def find_folders_by_pattern(hs, pattern):
+    データビューアとアイテム変換は同一ソースのこの関数を持ち、索引を共有する。
     """
-    指定したパターン（文字列）を含むフォルダをすべて再帰的に検索する
-    walk()メソッドを使用して全オブジェクトを走査する
+    return build_object_index(_hs)
+
+
+def resolve_object(hs, path):
+    """索引の path をたどり、hs の中の実際のオブジェクトを返す。"""
+    obj = hs.objects[path[0]]
+    for step in path[1:]:
+        child = obj["data"]["child"]
+        obj = child[step[0]][step[1]] if obj["type"] == 0 else child[step]
+    return obj
+
+
+def find_top_level_folders(hs, index):
     """
-    matched_folders = []
-
-    for key, obj in hs.walk():
-        if obj.get("type") == FOLDER_TYPE:
-            data = obj.get("data", {})
-            folder_name = data.get("name", "")
-
-            if pattern in folder_name:
-                child_list = data.get("child", [])
-                matched_folders.append(
-                    {
-                        "name": folder_name,
-                        "key": key,
-                        "child_count": len(child_list),
-                        "obj": obj,
-                    }
-                )
+    トップレベル（一番上の階層）のフォルダのみをリストアップする
+    """
+    folders = index[(index["depth"] == 0) & (index["type"] == FOLDER_TYPE)]
+    return [
+        {
+            "name": name,
+            "child_count": child_count,
+            "obj": hs.objects[key],
+            "key": key,
+        }
+        for key, name, child_count in zip(
+            folders["key"], folders["name"], folders["child_count"]
+        )
+    ]
 
-    return matched_folders
+
+def find_folders_by_pattern(hs, index, pattern):
+    """
+    指定したパターン（文字列）を含むフォルダをすべて再帰的に検索する
+    オブジェクト索引の name 列を部分一致で絞り込み、path から実体をたどる
+    """
+    folders = index[
+        (index["type"] == FOLDER_TYPE)
+        & index["name"].str.contains(pattern, regex=False)
+    ]
+    return [
+        {
+            "name": name,
+            "key": key,
+            "child_count": child_count,
+            "obj": resolve_object(hs, path),
+        }
+        for key, path, name, child_count in zip(
+            folders["key"], folders["path"], folders["name"], folders["child_count"]
+        )
+    ]
 
 
 def build_plane_conversion_map(plane_map_chara_dict):
@@ -498,12 +693,13 @@ if uploaded_file is not None:
     try:
         # ファイルを読み込み
         file_bytes = uploaded_file.read()
-        hs = HoneycomeSceneData.load(io.BytesIO(file_bytes))
+        hs = load_scene(file_bytes)
+        index = load_object_index(hashlib.sha256(file_bytes).hexdigest(), hs)
 
         st.success(f"{get_text('success_load', lang)} {uploaded_file.name}")
 
         # トップレベルのフォルダを取得
-        folders = find_top_level_folders(hs.objects)
+        folders = find_top_level_folders(hs, index)
 
         st.subheader(get_text("folder_selection_title", lang))
 
@@ -548,7 +744,7 @@ if uploaded_file is not None:
             )
 
             if pattern:
-                matched = find_folders_by_pattern(hs, pattern)
+                matched = find_folders_by_pattern(hs, index, pattern)
                 if matched:
                     st.info(
                         get_text("matched_folders", lang).format(count=len(matched))
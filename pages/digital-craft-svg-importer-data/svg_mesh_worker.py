@@ -0,0 +1,28 @@
+"""SVG ビルダーの要素単位の並列メッシュ生成で、プロセスプールのワーカーが呼ぶ関数。
+
+ページは Streamlit 上で __main__ として実行されるため、ページ上の関数はそのまま
+pickle できない。ワーカーは import できるこのモジュールの関数を呼び、ページは
+ワーカーの起動時に一度だけ読み込んで、その名前空間をプロセスが終わるまで使い回す。
+"""
+
+import runpy
+from typing import Any
+
+# ページを読み込むときのモジュール名 (__main__ 以外にして main() を動かさない)
+PAGE_RUN_NAME = "svg_mesh_worker_page"
+
+page_namespaces: dict[str, dict[str, Any]] = {}
+
+
+def load_page(page_path: str) -> dict[str, Any]:
+    """ページを読み込み、その名前空間を返す。読み込みはプロセスごとに1回だけ。"""
+    namespace = page_namespaces.get(page_path)
+    if namespace is None:
+        namespace = runpy.run_path(page_path, run_name=PAGE_RUN_NAME)
+        page_namespaces[page_path] = namespace
+    return namespace
+
+
+def call_page_function(page_path: str, name: str, *args: Any) -> Any:
+    """ページ上の関数を名前で呼び出す。"""
+    return load_page(page_path)[name](*args)
@@ -1,8 +1,32 @@
 import copy
+import dataclasses
+import hashlib
+import importlib
 import io
+import json
 import math
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from types import ModuleType
 from typing import Any
+from xml.etree.ElementTree import Element, iterparse
 
 import numpy as np
 import pathops
@@ -11,9 +35,33 @@ import wildmeshing as wildmeshing_lib
 from kkloader import HoneycomeSceneData
 from PIL import Image, ImageDraw
 from scipy.optimize import least_squares
-from svgelements import SVG, Arc, Close, CubicBezier, Move, QuadraticBezier
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from svgelements import (
+    DEFAULT_PPI,
+    REGEX_CSS_COMMENT,
+    REGEX_CSS_STYLE,
+    SVG,
+    Arc,
+    Circle,
+    Close,
+    CubicBezier,
+    Ellipse,
+    Move,
+    Polygon,
+    Polyline,
+    QuadraticBezier,
+    Rect,
+    Shape,
+    SimpleLine,
+    Use,
+)
 from svgelements import Path as SVGPath
 
+try:
+    import resource
+except ImportError:  # Windows には resource モジュールが無い
+    resource = None
+
 DEG2RAD = math.pi / 180.0
 
 TRANSLATIONS = {
@@ -53,6 +101,24 @@ A: すみません、おそらくバグです！[githubのissue](https://github.
         "advanced_settings": "詳細設定",
         "curve_smoothness_label": "曲線のなめらかさ",
         "curve_smoothness_help": "高いほどSVGの曲線を細かく読み込みます。三角形数と生成時間が増える場合があります。",
+        "auto_budget_label": "三角形数から曲線のなめらかさを自動で決める",
+        "auto_budget_help": "代表的な図形で試しに三角形分割し、指定した三角形数に収まる範囲で最もなめらかな設定を選びます",
+        "triangle_budget_label": "三角形数の目安",
+        "budget_result": "曲線のなめらかさを {value} に自動調整しました (予測 {predicted:,} 個 / 実際 {actual:,} 個 / 目安 {budget:,} 個)",
+        "budget_over": "最も粗い設定 {value} でも三角形数が目安を超えます (予測 {predicted:,} 個 / 実際 {actual:,} 個 / 目安 {budget:,} 個)",
+        "occlusion_culling_label": "隠れた部分を除去する",
+        "occlusion_culling_help": "前面の不透明な図形に完全に隠れる部分を、メッシュ生成の前に奥の要素から取り除きます。透明度が 1 未満のときは適用されません",
+        "occlusion_culling_result": "隠れた要素 {dropped} 個を除外し、{trimmed} 個を切り抜きました (頂点 {vertices_before:,} → {vertices_after:,})",
+        "merge_same_color_label": "同じ色の要素をまとめる",
+        "merge_same_color_help": "隣り合う同じ色の要素を一つの領域に結合してから三角形分割します。細かく分かれた SVG でフォルダ数と継ぎ目の三角形を減らせます",
+        "merge_same_color_result": "同じ色の要素 {elements:,} 個を {regions:,} 個の領域にまとめました",
+        "process_workers_label": "並列プロセス数",
+        "process_workers_help": "2 以上にすると、要素ごとの三角形分割と求解を複数のプロセスで並列に行います。要素が多い SVG ほど速くなり、要素が少ない SVG は直列で処理します",
+        "simplify_tolerance_label": "輪郭の簡略化 (許容誤差)",
+        "simplify_tolerance_help": "シーン上の長さで、この誤差以内に収まる細かい頂点を間引いてから三角形分割します。0 で無効です。トレースした SVG の密な折れ線に効果的です",
+        "simplify_contours_result": "輪郭を許容誤差 {tolerance:.4f} で簡略化しました (頂点 {vertices_before:,} → {vertices_after:,})",
+        "meta_simplify_tolerance": "輪郭の簡略化",
+        "geometry_reduction_result": "前処理で三角形が約 {triangles_before:,} 個 → {triangles_after:,} 個になりました (オブジェクト 約 {saved_objects:,} 個 削減)",
         "curve_smoothness_presets": {
             1: "軽量",
             2: "粗い",
@@ -67,11 +133,15 @@ A: すみません、おそらくバグです！[githubのissue](https://github.
         "plane_preset_character": "平面(キャラ)",
         "light_influence_label": "ライトの影響度",
         "parse_error": "SVGの解析に失敗しました: {error}",
+        "generate_error": "シーンの生成に失敗しました: {error}",
         "no_contours": "有効な輪郭が見つかりませんでした。",
         "input_preview_title": "入力SVGプレビュー",
         "generate_button": "シーンを生成",
         "generating": "シーンを生成中...",
+        "mesh_stage_queued": "順番待ち中",
+        "mesh_stage_parse": "SVG を読み込み中",
         "mesh_stage_prepare": "準備中",
+        "mesh_stage_tune": "三角形数の目安に合わせて調整中",
         "mesh_stage_normalize": "SVG輪郭を整形中",
         "mesh_stage_triangulate": "三角形分割中",
         "mesh_stage_solve": "三角形の変形を計算中",
@@ -79,6 +149,13 @@ A: すみません、おそらくバグです！[githubのissue](https://github.
         "mesh_stage_scene": "シーンを組み立て中",
         "mesh_stage_thumbnail": "サムネイルを作成中",
         "mesh_stage_done": "完了",
+        "mesh_stage_serialize": "シーンを書き出し",
+        "job_queue_position": "{position}番目",
+        "job_cancel_button": "生成をキャンセル",
+        "job_cancelling": "キャンセルしています...",
+        "job_cancelled": "生成をキャンセルしました",
+        "job_rejected_session_limit": "前回の生成がまだ実行中です。完了してからもう一度お試しください。",
+        "job_rejected_queue_full": "生成の順番待ちが混み合っています。しばらくしてからもう一度お試しください。",
         "success_generate": "生成完了 ({count} triangles)",
         "scene_info_title": "シーン情報",
         "scene_total_triangles": "総三角形数",
@@ -89,6 +166,17 @@ A: すみません、おそらくバグです！[githubのissue](https://github.
         "reconstruction_info": "再構成誤差(採用): max={max_err:.3e}, rmse={rmse:.3e}, threshold={tol:.3e}",
         "triangulation_title": "三角形分割プレビュー",
         "triangulation_empty": "分割結果がありません。",
+        "performance_title": "パフォーマンス",
+        "performance_wall": "実時間",
+        "performance_triangles_per_second": "三角形/秒",
+        "performance_nfev_per_solve": "評価回数/求解",
+        "performance_peak_memory": "最大メモリ",
+        "performance_stage": "段階",
+        "performance_stage_wall": "実時間 (秒)",
+        "performance_stage_cpu": "CPU時間 (秒)",
+        "performance_stage_share": "割合 (%)",
+        "performance_stage_memory": "最大メモリ (MB)",
+        "performance_help": "各段階は、その段階の最初の進捗報告から次の段階までの時間です。CPU時間は生成スレッドの分だけで、プロセス並列で解いた分は含みません。最大メモリはサーバープロセス全体の最大常駐メモリです。環境変数 KK_MESH_PERF_LOG にファイルパスを設定すると、計測結果を JSON Lines で追記します。",
         "metadata_folder": "メタデータ",
         "scene_root": "SVG",
         "meta_source": "SVGファイル",
@@ -137,6 +225,24 @@ A: Sorry, that is probably a bug. If you report it on [GitHub Issues](https://gi
         "advanced_settings": "Advanced Settings",
         "curve_smoothness_label": "Curve smoothness",
         "curve_smoothness_help": "Higher values load SVG curves more finely. This may increase triangle count and generation time.",
+        "auto_budget_label": "Pick curve smoothness from a triangle budget",
+        "auto_budget_help": "Test-triangulates representative shapes and picks the smoothest setting that stays within the budget",
+        "triangle_budget_label": "Triangle budget",
+        "budget_result": "Curve smoothness set to {value} (predicted {predicted:,} / actual {actual:,} / budget {budget:,})",
+        "budget_over": "Even the coarsest setting {value} exceeds the budget (predicted {predicted:,} / actual {actual:,} / budget {budget:,})",
+        "occlusion_culling_label": "Remove hidden geometry",
+        "occlusion_culling_help": "Before meshing, removes parts of back elements that are completely covered by opaque shapes in front. Not applied when alpha is below 1",
+        "occlusion_culling_result": "Dropped {dropped} hidden elements and trimmed {trimmed} (vertices {vertices_before:,} → {vertices_after:,})",
+        "merge_same_color_label": "Merge same-color elements",
+        "merge_same_color_help": "Joins neighbouring elements of the same color into one region before triangulation. Reduces folders and seam triangles for finely split SVGs",
+        "merge_same_color_result": "Merged {elements:,} same-color elements into {regions:,} regions",
+        "process_workers_label": "Parallel processes",
+        "process_workers_help": "With 2 or more, triangulation and solving run per element across several processes. SVGs with many elements benefit most; SVGs with few elements are processed serially",
+        "simplify_tolerance_label": "Contour simplification (tolerance)",
+        "simplify_tolerance_help": "Thins out vertices that stay within this error, measured in scene units, before triangulation. 0 disables it. Effective for dense polylines in traced SVGs",
+        "simplify_contours_result": "Simplified contours with tolerance {tolerance:.4f} (vertices {vertices_before:,} → {vertices_after:,})",
+        "meta_simplify_tolerance": "Contour simplification",
+        "geometry_reduction_result": "Pre-processing changed triangles from about {triangles_before:,} to {triangles_after:,} (about {saved_objects:,} fewer objects)",
         "curve_smoothness_presets": {
             1: "Lightweight",
             2: "Coarse",
@@ -151,11 +257,15 @@ A: Sorry, that is probably a bug. If you report it on [GitHub Issues](https://gi
         "plane_preset_character": "Plane (Character)",
         "light_influence_label": "Light influence",
         "parse_error": "Failed to parse SVG: {error}",
+        "generate_error": "Failed to generate the scene: {error}",
         "no_contours": "No valid contours were found in the SVG.",
         "input_preview_title": "Input SVG Preview",
         "generate_button": "Generate Scene",
         "generating": "Generating scene...",
+        "mesh_stage_queued": "Waiting in queue",
+        "mesh_stage_parse": "Reading SVG",
         "mesh_stage_prepare": "Preparing",
+        "mesh_stage_tune": "Tuning for the triangle budget",
         "mesh_stage_normalize": "Normalizing SVG contours",
         "mesh_stage_triangulate": "Triangulating",
         "mesh_stage_solve": "Solving triangle transforms",
@@ -163,6 +273,13 @@ A: Sorry, that is probably a bug. If you report it on [GitHub Issues](https://gi
         "mesh_stage_scene": "Building scene",
         "mesh_stage_thumbnail": "Building thumbnail",
         "mesh_stage_done": "Done",
+        "mesh_stage_serialize": "Writing scene",
+        "job_queue_position": "position {position}",
+        "job_cancel_button": "Cancel generation",
+        "job_cancelling": "Cancelling...",
+        "job_cancelled": "Generation was cancelled.",
+        "job_rejected_session_limit": "Your previous generation is still running. Please try again after it finishes.",
+        "job_rejected_queue_full": "The generation queue is full. Please try again in a moment.",
         "success_generate": "Generation complete ({count} triangles)",
         "scene_info_title": "Scene Info",
         "scene_total_triangles": "Total Triangles",
@@ -173,6 +290,17 @@ A: Sorry, that is probably a bug. If you report it on [GitHub Issues](https://gi
         "reconstruction_info": "Reconstruction error (accepted): max={max_err:.3e}, rmse={rmse:.3e}, threshold={tol:.3e}",
         "triangulation_title": "Triangulation Preview",
         "triangulation_empty": "No triangulation result.",
+        "performance_title": "Performance",
+        "performance_wall": "Wall time",
+        "performance_triangles_per_second": "Triangles/s",
+        "performance_nfev_per_solve": "Evaluations/solve",
+        "performance_peak_memory": "Peak memory",
+        "performance_stage": "Stage",
+        "performance_stage_wall": "Wall (s)",
+        "performance_stage_cpu": "CPU (s)",
+        "performance_stage_share": "Share (%)",
+        "performance_stage_memory": "Peak memory (MB)",
+        "performance_help": "Each stage runs from its first progress report until the next stage starts. CPU time covers the generation thread only, so work solved in worker processes is not included. Peak memory is the maximum resident memory of the whole server process. Set the KK_MESH_PERF_LOG environment variable to a file path to append each measurement as JSON Lines.",
         "metadata_folder": "Metadata",
         "scene_root": "SVG",
         "meta_source": "SVG file",
@@ -215,6 +343,21 @@ CURVE_SMOOTHNESS_PRESETS = {
 }
 CURVE_SMOOTHNESS_DEFAULT = 4
 SVG_SCENE_HEIGHT_FACTOR = 0.5
+SVG_PARSE_CACHE_ENTRIES = 8
+SVG_SHAPE_CLASSES = {
+    "circle": Circle,
+    "ellipse": Ellipse,
+    "line": SimpleLine,
+    "polyline": Polyline,
+    "polygon": Polygon,
+    "rect": Rect,
+}
+# 中身を描画しない定義用の要素 (<use> から参照されたときだけ描く)
+SVG_DEFINITION_TAGS = ("defs", "symbol", "clipPath", "mask", "pattern", "marker")
+# 図形として扱わない要素
+SVG_SKIPPED_TAGS = ("style", "text", "tspan", "desc", "title", "image")
+# この要素数ごとに読み込みの進捗を報告する
+SVG_STREAM_PROGRESS_INTERVAL = 200
 
 
 class MeshConfig:
@@ -243,6 +386,67 @@ class MeshConfig:
     TRIWILD_CUT_OUTSIDE = True
     TRIWILD_SKIP_EPS = True
     TRIWILD_MUTE_LOG = True
+    BUDGET_SAMPLE_SIZE = 4
+    TRIANGLE_BUDGET_DEFAULT = 2_000
+    TRIANGLE_BUDGET_MAX = 20_000
+    # 隠面除去・同色結合で、これより小さい面積比の切れ端は見えないものとして捨てる
+    PATHOPS_MIN_AREA_RATIO = 1e-4
+    # PathOps 演算後の輪郭で、全辺長の中央値に対してこれより短い辺は詰める
+    PATHOPS_MIN_EDGE_RATIO = 0.5
+    # 同色結合で色を比べるときの、各チャンネルの段階数
+    MERGE_COLOR_LEVELS = 32
+    SIMPLIFY_TOLERANCE_MAX = 0.005
+    # 求解済み三角形をプロセス間で配列として受け渡すときの列の並び
+    SOLVED_TRANSFORM_FIELDS = ("px", "pz", "alpha", "sx", "sz", "theta", "cx", "cz")
+    TRIANGLE_STATUSES = ("accepted", "solve_failed", "reconstruction_failed")
+    PROCESS_WORKERS_MAX = max(1, min(8, os.cpu_count() or 1))
+    # 要素がこれより少ないと、初回のワーカー起動とページの読み込み (約1秒) を
+    # 並列化で取り返せないため直列で解く
+    PROCESS_MIN_ELEMENTS = 8
+    # 進捗と負荷の偏りをならすため、ワーカー1つあたりに渡す要素の塊の数
+    PROCESS_SHARDS_PER_WORKER = 8
+    # 塊の完了を待つ間に、キャンセルを確かめる間隔 (秒)
+    PROCESS_CANCEL_POLL_INTERVAL = 0.2
+    # 簡略化した輪郭が交差したら、許容誤差を半分にして試し直す回数
+    SIMPLIFY_RETRY_COUNT = 3
+    # 三角形分割プレビューで枠線を描く三角形の上限 (超えたら間引いて描く)
+    PREVIEW_TRIANGLE_LIMIT = 20_000
+    # プレビューの塗りで、一度にピクセルへ展開する区間の総ピクセル数
+    PREVIEW_PIXEL_CHUNK = 2_000_000
+
+
+@dataclasses.dataclass(frozen=True)
+class MeshSettings:
+    """1回のSVG生成で使う曲線サンプリング・分割・ソルバ設定。
+
+    MeshConfig のクラス属性はプロセス全体で共有されるため、ユーザー指定値は
+    このオブジェクトに閉じ込めて解析から solve まで引き回す。
+    """
+
+    curve_sample_error: float = MeshConfig.SVG_CURVE_SAMPLE_ERROR
+    curve_sample_min_depth: int = MeshConfig.SVG_CURVE_SAMPLE_MIN_DEPTH
+    curve_sample_max_depth: int = MeshConfig.SVG_CURVE_SAMPLE_MAX_DEPTH
+    triwild_stop_quality: float = MeshConfig.TRIWILD_STOP_QUALITY
+    triwild_max_its: int = MeshConfig.TRIWILD_MAX_ITS
+    triwild_stage: int = MeshConfig.TRIWILD_STAGE
+    triwild_epsilon: float = MeshConfig.TRIWILD_EPSILON
+    triwild_feature_epsilon: float = MeshConfig.TRIWILD_FEATURE_EPSILON
+    triwild_target_edge_len: float = MeshConfig.TRIWILD_TARGET_EDGE_LEN
+    triwild_edge_length_r: float = MeshConfig.TRIWILD_EDGE_LENGTH_R
+    triwild_flat_feature_angle: float = MeshConfig.TRIWILD_FLAT_FEATURE_ANGLE
+    triwild_cut_outside: bool = MeshConfig.TRIWILD_CUT_OUTSIDE
+    triwild_skip_eps: bool = MeshConfig.TRIWILD_SKIP_EPS
+    triwild_mute_log: bool = MeshConfig.TRIWILD_MUTE_LOG
+    solver_reachable_residual_tol: float = MeshConfig.SOLVER_REACHABLE_RESIDUAL_TOL
+    solver_early_break_residual_tol: float = MeshConfig.SOLVER_EARLY_BREAK_RESIDUAL_TOL
+    solver_max_nfev: int = MeshConfig.SOLVER_MAX_NFEV
+    solver_sx_min: float = MeshConfig.SOLVER_SX_MIN
+    solver_sx_max: float = MeshConfig.SOLVER_SX_MAX
+    solver_child_scale_min: float = MeshConfig.SOLVER_CHILD_SCALE_MIN
+    solver_lm_reg_weight: float = MeshConfig.SOLVER_LM_REG_WEIGHT
+
+
+DEFAULT_MESH_SETTINGS = MeshSettings()
 
 
 TEMPLATE_SCENE_META = {
@@ -443,6 +647,41 @@ def build_metadata_folder(
     return info_folder
 
 
+def collect_color_slots(
+    objects: list[dict[str, Any]], channel: int
+) -> list[tuple[dict[str, Any], int, float | None]]:
+    """オブジェクト木から色の差し替え対象を (data, 色番号, 固定アルファ) で列挙する。"""
+    slots: list[tuple[dict[str, Any], int, float | None]] = []
+    for obj in objects:
+        data = obj["data"]
+        if obj["type"] == HoneycomeSceneData.FOLDER:
+            slots.extend(collect_color_slots(data["child"], channel))
+        elif data.get("child"):
+            # せん断用の親平面は透明、子の三角形は不透明で色を持つ
+            slots.append((data, channel, 0.0))
+            for child in data["child"]:
+                slots.append((child["data"], channel, 1.0))
+        else:
+            slots.append((data, channel, None))
+    return slots
+
+
+def restamp_color_slots(
+    color_slots: list[tuple[dict[str, Any], int, float | None]],
+    colors: list[dict[str, float]],
+) -> None:
+    """形状には触れずに、色スロットへ新しい色を書き込む。"""
+    stamped_colors: dict[tuple[int, float | None], dict[str, float]] = {}
+    for data, channel, alpha in color_slots:
+        stamp_key = (channel, alpha)
+        if stamp_key not in stamped_colors:
+            stamped = dict(colors[channel])
+            if alpha is not None:
+                stamped["a"] = alpha
+            stamped_colors[stamp_key] = stamped
+        data["colors"][0] = stamped_colors[stamp_key]
+
+
 def render_scene_info(
     plane_count: int, raw_plane_count: int, mesh_stats: dict[str, Any], lang: str
 ) -> None:
@@ -460,12 +699,305 @@ def render_scene_info(
         st.metric(get_text("scene_failed", lang), f"{failed}")
 
 
+class MeshJobCancelledError(RuntimeError):
+    pass
+
+
+@st.cache_resource
+def get_perf_log_lock():
+    """計測ログへの追記を直列化するロック。
+
+    再実行やページをまたいでも同じロックを使うため ``st.cache_resource`` で共有する。
+    両ページで同じソースにしておくことで、キャッシュも同じものになる。
+    """
+    return threading.Lock()
+
+
+class MeshPerformanceRecorder:
+    """メッシュ生成ジョブの段階ごとの実時間・CPU時間・最大メモリを記録する。
+
+    進捗報告の段階名を区切りに使い、ある段階の最初の報告から次の段階の最初の報告
+    までをその段階の時間とする。CPU時間はジョブを実行するスレッドの分だけを数える。
+    """
+
+    LOG_PATH_ENV = "KK_MESH_PERF_LOG"
+
+    def __init__(self, job_id: str) -> None:
+        self.job_id = job_id
+        self.started_at = time.time()
+        self.stages: dict[str, dict[str, float | None]] = {}
+        self.current_stage: str | None = None
+        self.stage_started = (0.0, 0.0)
+        self.finished = False
+
+    @staticmethod
+    def peak_rss_mb() -> float | None:
+        """プロセスの最大常駐メモリ (MB) を返す。取得できない環境では None。"""
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux は KB、macOS はバイト単位で返る
+        return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+    def close_stage(self, now: tuple[float, float]) -> None:
+        if self.current_stage is None:
+            return
+        entry = self.stages.setdefault(self.current_stage, {"wall": 0.0, "cpu": 0.0})
+        entry["wall"] += now[0] - self.stage_started[0]
+        entry["cpu"] += now[1] - self.stage_started[1]
+        entry["peak_rss_mb"] = self.peak_rss_mb()
+
+    def mark(self, stage: str) -> None:
+        """段階が変わったら直前の段階を締め、次の段階の計測を始める。"""
+        if stage == self.current_stage or self.finished:
+            return
+        now = (time.perf_counter(), time.thread_time())
+        self.close_stage(now)
+        self.current_stage = stage
+        self.stage_started = now
+
+    def finish(self) -> None:
+        """最後の段階を締める。CPU時間を正しく数えるためジョブのスレッドから呼ぶ。"""
+        if not self.finished:
+            self.close_stage((time.perf_counter(), time.thread_time()))
+            self.finished = True
+
+    def report(self, mesh_stats: dict[str, Any]) -> dict[str, Any]:
+        """段階ごとの計測値に、求解件数から求めた三角形/秒と評価回数/求解を添える。"""
+        solve_wall = sum(
+            values["wall"]
+            for stage, values in self.stages.items()
+            if stage.startswith("solve")
+        )
+        solve_count = int(mesh_stats.get("solve_count", 0))
+        solver_nfev = int(mesh_stats.get("solver_nfev", 0))
+        return {
+            "job_id": self.job_id,
+            "started_at": self.started_at,
+            "wall": sum(values["wall"] for values in self.stages.values()),
+            "cpu": sum(values["cpu"] for values in self.stages.values()),
+            "peak_rss_mb": self.peak_rss_mb(),
+            "solve_count": solve_count,
+            "solver_nfev": solver_nfev,
+            "triangles_per_second": solve_count / solve_wall
+            if solve_count > 0 and solve_wall > 0
+            else None,
+            "nfev_per_solve": solver_nfev / solve_count if solve_count > 0 else None,
+            "stages": [
+                {"stage": stage, **values} for stage, values in self.stages.items()
+            ],
+        }
+
+    @staticmethod
+    def append_log(record: dict[str, Any]) -> None:
+        """環境変数 KK_MESH_PERF_LOG にパスがあれば、記録を JSON Lines で追記する。"""
+        log_path = os.environ.get(MeshPerformanceRecorder.LOG_PATH_ENV)
+        if not log_path:
+            return
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        try:
+            with (
+                get_perf_log_lock(),
+                open(log_path, "a", encoding="utf-8") as log_file,
+            ):
+                log_file.write(line + "\n")
+        except OSError:
+            # 計測ログが書けなくても生成結果の表示やダウンロードは止めない
+            pass
+
+    @staticmethod
+    def serialize_scene(scene: Any, performance: dict[str, Any], page: str) -> bytes:
+        """シーンを bytes へ書き出し、その時間を計測結果とログへ加える。"""
+        started = time.perf_counter()
+        data = bytes(scene)
+        performance["serialize"] = {
+            "wall": time.perf_counter() - started,
+            "bytes": len(data),
+        }
+        MeshPerformanceRecorder.append_log(
+            {
+                "event": "serialize",
+                "page": page,
+                "job_id": performance["job_id"],
+                **performance["serialize"],
+            }
+        )
+        return data
+
+
+class MeshJob:
+    """スケジューラに投入されたメッシュ生成ジョブ1件分の状態。"""
+
+    def __init__(self, job_id: str, session_id: str) -> None:
+        self.job_id = job_id
+        self.session_id = session_id
+        self.future: Future | None = None
+        self.progress: tuple[str, Any, Any, str] = ("prepare", None, None, "")
+        self.cancel_event = threading.Event()
+        self.performance = MeshPerformanceRecorder(job_id)
+
+    def report_progress(
+        self, stage: str, current: Any = None, total: Any = None, note: str = ""
+    ) -> None:
+        # 進捗報告は文字・三角形チャンクの区切りで呼ばれるため、協調的なキャンセル地点を兼ねる。
+        # ワーカースレッドでは最新の進捗を記録するだけにし、描画はセッション側で行う
+        if self.cancel_event.is_set():
+            raise MeshJobCancelledError(self.job_id)
+        self.performance.mark(stage)
+        self.progress = (stage, current, total, note)
+
+
+class MeshJobScheduler:
+    """重いメッシュ生成を上限付きワーカープールでバックグラウンド実行する。
+
+    ページ関数は __main__ 上に定義されプロセスへ渡せないため、スレッドプールで
+    同時実行数を絞り、セッションごとの投入数と待ち行列長で受付を制限する。
+    ジョブはスクリプトの再実行をまたいで継続し、結果は Future 経由で受け取る。
+    """
+
+    MAX_WORKERS = 2
+    MAX_PENDING_JOBS = 8
+    MAX_JOBS_PER_SESSION = 1
+    POLL_INTERVAL = 0.5
+
+    def __init__(
+        self, max_workers: int, max_pending_jobs: int, max_jobs_per_session: int
+    ) -> None:
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="mesh-job"
+        )
+        self.max_pending_jobs = max_pending_jobs
+        self.max_jobs_per_session = max_jobs_per_session
+        self.lock = threading.Lock()
+        self.pending_job_ids: list[str] = []
+        self.active_jobs: dict[str, MeshJob] = {}
+
+    @staticmethod
+    def current_session_id() -> str:
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx is not None else "bare"
+
+    def submit(
+        self, session_id: str, fn, **kwargs: Any
+    ) -> tuple[MeshJob | None, str | None]:
+        """ジョブを待ち行列へ追加し、(ジョブ, 受付できなかった理由) を返す。
+
+        スケジューラは最初に作ったページ実行のものが使い回され、再実行ごとに
+        作り直される例外クラスとは一致しないため、拒否は例外でなく理由の文字列
+        ("session_limit" / "queue_full") で返す。受付できた場合の理由は None。
+        """
+        with self.lock:
+            session_job_count = sum(
+                1 for job in self.active_jobs.values() if job.session_id == session_id
+            )
+            if session_job_count >= self.max_jobs_per_session:
+                return None, "session_limit"
+            if len(self.pending_job_ids) >= self.max_pending_jobs:
+                return None, "queue_full"
+            job = MeshJob(uuid.uuid4().hex, session_id)
+            self.active_jobs[job.job_id] = job
+            self.pending_job_ids.append(job.job_id)
+            job.future = self.executor.submit(self.run_job, job, fn, kwargs)
+        return job, None
+
+    def run_job(self, job: MeshJob, fn, kwargs: dict[str, Any]) -> Any:
+        with self.lock:
+            self.pending_job_ids.remove(job.job_id)
+        try:
+            return fn(progress_callback=job.report_progress, **kwargs)
+        finally:
+            job.performance.finish()
+            with self.lock:
+                self.active_jobs.pop(job.job_id, None)
+
+    def queue_position(self, job: MeshJob) -> int:
+        """待機中なら1始まりの順番、実行開始後は0を返す。"""
+        with self.lock:
+            if job.job_id in self.pending_job_ids:
+                return self.pending_job_ids.index(job.job_id) + 1
+        return 0
+
+    def cancel(self, job: MeshJob) -> None:
+        """ジョブへキャンセルを要求し、まだ実行前であればその場で取り消す。"""
+        job.cancel_event.set()
+        if job.future.cancel():
+            with self.lock:
+                if job.job_id in self.pending_job_ids:
+                    self.pending_job_ids.remove(job.job_id)
+                self.active_jobs.pop(job.job_id, None)
+
+    def report_status(self, job: MeshJob, progress_callback, lang: str = "ja") -> None:
+        """待ち順または最新の進捗を進捗表示へ反映する。"""
+        position = self.queue_position(job)
+        if position > 0:
+            progress_callback(
+                "queued",
+                note=get_text("job_queue_position", lang).format(position=position),
+            )
+        else:
+            progress_callback(*job.progress)
+
+
+@st.cache_resource
+def get_mesh_job_scheduler():
+    """プロセス全体で共有するメッシュ生成スケジューラを返す。
+
+    カリグラファーと SVG ビルダーは同一ソースのこの関数を持つため、
+    キャッシュキーが一致し同じワーカープールを共有する。
+    """
+    return MeshJobScheduler(
+        max_workers=MeshJobScheduler.MAX_WORKERS,
+        max_pending_jobs=MeshJobScheduler.MAX_PENDING_JOBS,
+        max_jobs_per_session=MeshJobScheduler.MAX_JOBS_PER_SESSION,
+    )
+
+
+MESH_WORKER_DIR = Path(__file__).resolve().parent / "digital-craft-svg-importer-data"
+MESH_WORKER_MODULE = "svg_mesh_worker"
+
+
+def import_mesh_worker() -> ModuleType:
+    """プロセスプールのワーカーが呼ぶモジュールを import する。
+
+    ワーカーは親プロセスの sys.path を引き継ぐため、置き場所を sys.path に加えておけば
+    ワーカー側でも同じ名前で import でき、関数を pickle で受け渡せる。
+    """
+    worker_dir = str(MESH_WORKER_DIR)
+    if worker_dir not in sys.path:
+        sys.path.append(worker_dir)
+    return importlib.import_module(MESH_WORKER_MODULE)
+
+
+@st.cache_resource(show_spinner=False)
+def get_mesh_process_pool() -> ProcessPoolExecutor:
+    """要素単位の並列メッシュ生成に使う、プロセス全体で1つのプロセスプールを返す。
+
+    スレッドを持つサーバープロセスからの fork は固まることがあるため、forkserver
+    (使えない環境では spawn) で起動する。ワーカーは起動時に一度だけページを読み込む。
+    ジョブごとに同時に使うワーカー数は process_workers で抑える。
+    """
+    start_method = (
+        "forkserver"
+        if "forkserver" in multiprocessing.get_all_start_methods()
+        else "spawn"
+    )
+    return ProcessPoolExecutor(
+        max_workers=MeshConfig.PROCESS_WORKERS_MAX,
+        mp_context=multiprocessing.get_context(start_method),
+        initializer=import_mesh_worker().load_page,
+        initargs=(str(Path(__file__).resolve()),),
+    )
+
+
 class TriangleSolverOptimized:
-    def __init__(self, source_xz: np.ndarray):
+    def __init__(
+        self, source_xz: np.ndarray, settings: MeshSettings = DEFAULT_MESH_SETTINGS
+    ):
         """ソルバ計算で使うソース三角形の前計算行列を初期化する。"""
         source = np.asarray(source_xz, dtype=np.float64)
         if source.shape != (3, 2):
             raise ValueError("TriangleSolverOptimized requires source_xz shape (3, 2)")
+        self.settings = settings
         self.source_xz = source
         self.src0 = source[0]
 
@@ -647,10 +1179,11 @@ class TriangleSolverOptimized:
         if target.shape != (3, 2):
             raise ValueError("target_xz must be shape (3, 2)")
 
-        sx_min = float(MeshConfig.SOLVER_SX_MIN)
-        sx_max = float(MeshConfig.SOLVER_SX_MAX)
-        c_min = float(MeshConfig.SOLVER_CHILD_SCALE_MIN)
-        reg_weight = float(MeshConfig.SOLVER_LM_REG_WEIGHT)
+        settings = self.settings
+        sx_min = float(settings.solver_sx_min)
+        sx_max = float(settings.solver_sx_max)
+        c_min = float(settings.solver_child_scale_min)
+        reg_weight = float(settings.solver_lm_reg_weight)
         if not (0.0 < sx_min < sx_max < 1.0):
             return {"reachable": False, "residual": float("inf")}
         sx_span = sx_max - sx_min
@@ -737,6 +1270,7 @@ class TriangleSolverOptimized:
 
         best_params: np.ndarray | None = None
         best_residual = float("inf")
+        nfev = 0
         for initial in candidates:
             equations = make_equations(initial)
             try:
@@ -744,7 +1278,7 @@ class TriangleSolverOptimized:
                     equations,
                     x0=initial,
                     method="lm",
-                    max_nfev=MeshConfig.SOLVER_MAX_NFEV,
+                    max_nfev=settings.solver_max_nfev,
                     ftol=1e-12,
                     xtol=1e-12,
                     gtol=1e-12,
@@ -752,16 +1286,17 @@ class TriangleSolverOptimized:
             except (ValueError, RuntimeError, FloatingPointError):
                 continue
 
+            nfev += int(optimized.nfev)
             geom = equations(optimized.x)[:4]
             residual = float(np.sum(geom**2))
             if residual < best_residual:
                 best_residual = residual
                 best_params = optimized.x
-            if residual < MeshConfig.SOLVER_EARLY_BREAK_RESIDUAL_TOL:
+            if residual < settings.solver_early_break_residual_tol:
                 break
 
         if best_params is None:
-            return {"reachable": False, "residual": float("inf")}
+            return {"reachable": False, "residual": float("inf"), "nfev": nfev}
 
         alpha, u, theta, v, w = best_params
         sx, sz, cx, cz = self._from_unconstrained(
@@ -769,7 +1304,7 @@ class TriangleSolverOptimized:
         )
         eff_x, eff_z = self.effective_scale(sx, sz, float(theta))
         if eff_x <= 1e-12 or eff_z <= 1e-12:
-            return {"reachable": False, "residual": float("inf")}
+            return {"reachable": False, "residual": float("inf"), "nfev": nfev}
 
         return {
             "px": float(translation[0]),
@@ -784,7 +1319,8 @@ class TriangleSolverOptimized:
             "child_sx": float(cx / eff_x),
             "child_sz": float(cz / eff_z),
             "residual": best_residual,
-            "reachable": best_residual < MeshConfig.SOLVER_REACHABLE_RESIDUAL_TOL,
+            "reachable": best_residual < settings.solver_reachable_residual_tol,
+            "nfev": nfev,
         }
 
 
@@ -795,12 +1331,33 @@ class MeshPipeline:
         return {
             "curve_smoothness": CURVE_SMOOTHNESS_DEFAULT,
             "edge_length_r": float(MeshConfig.TRIWILD_EDGE_LENGTH_R),
+            "auto_budget": False,
+            "triangle_budget": MeshConfig.TRIANGLE_BUDGET_DEFAULT,
+            "merge_same_color": False,
+            "occlusion_culling": False,
+            "simplify_tolerance": 0.0,
+            "process_workers": 1,
         }
 
     @staticmethod
     def render_advanced_settings(lang: str) -> dict[str, Any]:
         """詳細設定UIを描画し、入力値を設定辞書で返す。"""
         settings: dict[str, Any] = {}
+        settings["auto_budget"] = st.checkbox(
+            get_text("auto_budget_label", lang),
+            value=False,
+            help=get_text("auto_budget_help", lang),
+        )
+        if settings["auto_budget"]:
+            settings["triangle_budget"] = st.number_input(
+                get_text("triangle_budget_label", lang),
+                min_value=100,
+                max_value=MeshConfig.TRIANGLE_BUDGET_MAX,
+                value=MeshConfig.TRIANGLE_BUDGET_DEFAULT,
+                step=100,
+            )
+        else:
+            settings["triangle_budget"] = MeshConfig.TRIANGLE_BUDGET_DEFAULT
         settings["curve_smoothness"] = st.slider(
             get_text("curve_smoothness_label", lang),
             min_value=1,
@@ -809,6 +1366,7 @@ class MeshPipeline:
             step=1,
             format="%d",
             help=get_text("curve_smoothness_help", lang),
+            disabled=settings["auto_budget"],
         )
         curve_labels = get_text("curve_smoothness_presets", lang)
         if isinstance(curve_labels, dict):
@@ -824,24 +1382,78 @@ class MeshPipeline:
             step=0.05,
             help=get_text("mesh_edge_length_r_help", lang),
         )
+        settings["simplify_tolerance"] = st.slider(
+            get_text("simplify_tolerance_label", lang),
+            min_value=0.0,
+            max_value=MeshConfig.SIMPLIFY_TOLERANCE_MAX,
+            value=0.0,
+            step=0.0001,
+            format="%.4f",
+            help=get_text("simplify_tolerance_help", lang),
+        )
+        if MeshConfig.PROCESS_WORKERS_MAX > 1:
+            settings["process_workers"] = st.slider(
+                get_text("process_workers_label", lang),
+                min_value=1,
+                max_value=MeshConfig.PROCESS_WORKERS_MAX,
+                value=1,
+                step=1,
+                help=get_text("process_workers_help", lang),
+            )
+        else:
+            settings["process_workers"] = 1
+        settings["merge_same_color"] = st.checkbox(
+            get_text("merge_same_color_label", lang),
+            value=False,
+            help=get_text("merge_same_color_help", lang),
+        )
+        settings["occlusion_culling"] = st.checkbox(
+            get_text("occlusion_culling_label", lang),
+            value=False,
+            help=get_text("occlusion_culling_help", lang),
+        )
         return settings
 
     @staticmethod
-    def apply_curve_smoothness_settings(curve_smoothness: int) -> None:
-        """SVG曲線のプリセット精度を MeshConfig に反映する。"""
+    def build_mesh_settings(
+        *,
+        curve_smoothness: int = CURVE_SMOOTHNESS_DEFAULT,
+        edge_length_r: float = MeshConfig.TRIWILD_EDGE_LENGTH_R,
+    ) -> MeshSettings:
+        """曲線プリセットと TriWild 設定から、この生成専用の不変設定を作る。"""
         preset = CURVE_SMOOTHNESS_PRESETS.get(
             int(curve_smoothness), CURVE_SMOOTHNESS_PRESETS[CURVE_SMOOTHNESS_DEFAULT]
         )
-        MeshConfig.SVG_CURVE_SAMPLE_ERROR = float(preset["error"])
-        MeshConfig.SVG_CURVE_SAMPLE_MIN_DEPTH = int(preset["min_depth"])
-        MeshConfig.SVG_CURVE_SAMPLE_MAX_DEPTH = int(preset["max_depth"])
+        return dataclasses.replace(
+            DEFAULT_MESH_SETTINGS,
+            curve_sample_error=float(preset["error"]),
+            curve_sample_min_depth=int(preset["min_depth"]),
+            curve_sample_max_depth=int(preset["max_depth"]),
+            triwild_stop_quality=10.0,
+            triwild_edge_length_r=float(edge_length_r),
+            triwild_target_edge_len=-1.0,
+        )
 
     @staticmethod
-    def apply_triwild_settings(*, edge_length_r: float) -> None:
-        """TriWild関連のメッシュ設定を MeshConfig に反映する。"""
-        MeshConfig.TRIWILD_STOP_QUALITY = 10.0
-        MeshConfig.TRIWILD_EDGE_LENGTH_R = float(edge_length_r)
-        MeshConfig.TRIWILD_TARGET_EDGE_LEN = -1.0
+    def stage_labels(lang: str) -> dict[str, str]:
+        """進捗の段階名から表示用ラベルへの対応を返す。"""
+        return {
+            stage: get_text(f"mesh_stage_{stage}", lang)
+            for stage in (
+                "queued",
+                "parse",
+                "tune",
+                "prepare",
+                "normalize",
+                "triangulate",
+                "solve",
+                "preview",
+                "scene",
+                "thumbnail",
+                "done",
+                "serialize",
+            )
+        }
 
     @staticmethod
     def build_progress_callback(lang: str):
@@ -849,17 +1461,11 @@ class MeshPipeline:
         progress_bar = st.progress(0, text=f"{get_text('generating', lang)} 0%")
         progress_status = st.empty()
         progress_state = {"percent": -1, "status": ""}
-        stage_labels = {
-            "prepare": get_text("mesh_stage_prepare", lang),
-            "normalize": get_text("mesh_stage_normalize", lang),
-            "triangulate": get_text("mesh_stage_triangulate", lang),
-            "solve": get_text("mesh_stage_solve", lang),
-            "preview": get_text("mesh_stage_preview", lang),
-            "scene": get_text("mesh_stage_scene", lang),
-            "thumbnail": get_text("mesh_stage_thumbnail", lang),
-            "done": get_text("mesh_stage_done", lang),
-        }
+        stage_labels = MeshPipeline.stage_labels(lang)
         stage_ranges = {
+            "queued": (0, 0),
+            "parse": (0, 100),
+            "tune": (0, 5),
             "prepare": (0, 5),
             "normalize": (5, 10),
             "triangulate": (10, 40),
@@ -904,6 +1510,44 @@ class MeshPipeline:
 
         return svg_progress_callback
 
+    @staticmethod
+    def select_budget_samples(
+        element_keys: list[Any], weights: list[int], sample_size: int
+    ) -> list[Any]:
+        """三角形数の見積もりに使う代表要素を、複雑さ(頂点数)が散らばるように選ぶ。"""
+        first_index: dict[Any, int] = {}
+        for index, key in enumerate(element_keys):
+            if weights[index] > 0 and key not in first_index:
+                first_index[key] = index
+        ordered = sorted(first_index, key=lambda key: weights[first_index[key]])
+        if len(ordered) <= sample_size:
+            return ordered
+        if sample_size <= 1:
+            return [ordered[len(ordered) // 2]]
+        step = (len(ordered) - 1) / (sample_size - 1)
+        return [ordered[round(position * step)] for position in range(sample_size)]
+
+    @staticmethod
+    def predict_triangle_total(
+        element_keys: list[Any], weights: list[int], measured: dict[Any, int]
+    ) -> int:
+        """代表要素の実測三角形数と、頂点数の比から全体の三角形数を見積もる。"""
+        sample_weight = 0.0
+        sample_total = 0
+        for key, count in measured.items():
+            sample_weight += weights[element_keys.index(key)]
+            sample_total += count
+        if sample_weight <= 0.0:
+            return sample_total
+        triangles_per_weight = sample_total / sample_weight
+        predicted = 0.0
+        for index, key in enumerate(element_keys):
+            if key in measured:
+                predicted += measured[key]
+            else:
+                predicted += weights[index] * triangles_per_weight
+        return round(predicted)
+
     @staticmethod
     def polygon_signed_area(points: np.ndarray) -> float:
         """靴紐公式で多角形の符号付き面積を計算する。"""
@@ -1058,6 +1702,67 @@ class MeshPipeline:
                 return simplified_contours
         return valid_contours
 
+    @staticmethod
+    def simplify_ring(ring: np.ndarray, tolerance: float) -> np.ndarray:
+        """閉じた輪郭を Douglas-Peucker 法で間引く。"""
+        count = len(ring)
+        if count <= 3 or tolerance <= 0.0:
+            return ring
+        # 閉路は始点と、始点から最も遠い点の2点で開いた折れ線2本に分けて処理する
+        far_index = int(np.argmax(np.linalg.norm(ring - ring[0], axis=1)))
+        keep = np.zeros(count + 1, dtype=bool)
+        keep[[0, far_index, count]] = True
+        closed = np.vstack([ring, ring[:1]])
+        stack = [(0, far_index), (far_index, count)]
+        while stack:
+            start, end = stack.pop()
+            if end - start < 2:
+                continue
+            a = closed[start]
+            chord = closed[end] - a
+            chord_length = float(np.hypot(chord[0], chord[1]))
+            offsets = closed[start + 1 : end] - a
+            if chord_length <= 1e-12:
+                distances = np.hypot(offsets[:, 0], offsets[:, 1])
+            else:
+                distances = (
+                    np.abs(chord[0] * offsets[:, 1] - chord[1] * offsets[:, 0])
+                    / chord_length
+                )
+            split = int(np.argmax(distances))
+            if float(distances[split]) > tolerance:
+                split += start + 1
+                keep[split] = True
+                stack.append((start, split))
+                stack.append((split, end))
+        return ring[keep[:count]]
+
+    @staticmethod
+    def contours_self_intersect(contours: list[np.ndarray]) -> bool:
+        """輪郭群の辺どうしが (端点の共有を除いて) 交差するかを返す。"""
+
+        def cross(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+            return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+        starts = np.vstack(contours)
+        directions = (
+            np.vstack([np.roll(contour, -1, axis=0) for contour in contours]) - starts
+        )
+        # 行をまとめて処理し、辺数の2乗の配列を一度に作らないようにする
+        chunk = 256
+        for offset in range(0, len(starts), chunk):
+            p = starts[offset : offset + chunk, None, :]
+            d = directions[offset : offset + chunk, None, :]
+            q = starts[None, :, :]
+            e = directions[None, :, :]
+            s1 = cross(e, p - q)
+            s2 = cross(e, p + d - q)
+            s3 = cross(d, q - p)
+            s4 = cross(d, q + e - p)
+            if bool(np.any((s1 * s2 < 0.0) & (s3 * s4 < 0.0))):
+                return True
+        return False
+
     @staticmethod
     def build_triangle_adjacency_order(
         tri_vertices: np.ndarray, tri_indices: np.ndarray
@@ -1155,7 +1860,9 @@ class MeshPipeline:
         return ordered_indices
 
     @staticmethod
-    def triangulate_contours(contours: list[np.ndarray]) -> list[np.ndarray]:
+    def triangulate_contours(
+        contours: list[np.ndarray], settings: MeshSettings = DEFAULT_MESH_SETTINGS
+    ) -> list[np.ndarray]:
         """輪郭群を三角形分割して有効三角形リストを返す。"""
         valid_contours = MeshPipeline.normalize_contours_for_triangulation(contours)
         if not valid_contours:
@@ -1213,18 +1920,18 @@ class MeshPipeline:
                     V=tri_vertices_input,
                     E=tri_segments_input,
                     feature_info=None,
-                    stop_quality=MeshConfig.TRIWILD_STOP_QUALITY,
-                    max_its=MeshConfig.TRIWILD_MAX_ITS,
-                    stage=MeshConfig.TRIWILD_STAGE,
-                    epsilon=MeshConfig.TRIWILD_EPSILON,
-                    feature_epsilon=MeshConfig.TRIWILD_FEATURE_EPSILON,
-                    target_edge_len=MeshConfig.TRIWILD_TARGET_EDGE_LEN,
-                    edge_length_r=MeshConfig.TRIWILD_EDGE_LENGTH_R,
-                    flat_feature_angle=MeshConfig.TRIWILD_FLAT_FEATURE_ANGLE,
-                    cut_outside=MeshConfig.TRIWILD_CUT_OUTSIDE,
-                    skip_eps=MeshConfig.TRIWILD_SKIP_EPS,
+                    stop_quality=settings.triwild_stop_quality,
+                    max_its=settings.triwild_max_its,
+                    stage=settings.triwild_stage,
+                    epsilon=settings.triwild_epsilon,
+                    feature_epsilon=settings.triwild_feature_epsilon,
+                    target_edge_len=settings.triwild_target_edge_len,
+                    edge_length_r=settings.triwild_edge_length_r,
+                    flat_feature_angle=settings.triwild_flat_feature_angle,
+                    cut_outside=settings.triwild_cut_outside,
+                    skip_eps=settings.triwild_skip_eps,
                     hole_pts=tri_holes_input,
-                    mute_log=MeshConfig.TRIWILD_MUTE_LOG,
+                    mute_log=settings.triwild_mute_log,
                 )
             except (ValueError, RuntimeError, FloatingPointError):
                 continue
@@ -1263,33 +1970,38 @@ class MeshPipeline:
         return triangles
 
     @staticmethod
-    def create_sheared_triangle(
-        plane_template: dict[str, Any],
-        triangle_template: dict[str, Any],
+    def solve_sheared_triangle(
         target_triangle: np.ndarray,
-        color: dict[str, float],
         solver: TriangleSolverOptimized,
-        child_y_scale: float = 0.01,
-        y_offset: float = 0.0,
         reconstruction_max_abs_tol: float = MeshConfig.RECONSTRUCTION_MAX_ABS_TOL,
-    ) -> tuple[dict[str, Any] | None, dict[str, Any]]:
-        """目標三角形に一致する親子プレーンオブジェクトを生成する。"""
+    ) -> dict[str, Any]:
+        """三角形を親平面+子三角形のパラメータへ解き、採否の理由も記録する。"""
         solved = solver.solve(target_triangle)
         residual = solved.get("residual", float("inf"))
         if not np.isfinite(float(residual)):
             solved["rejected_reason"] = "solve_non_finite"
-            return None, solved
+            return solved
         if not bool(solved.get("reachable", False)):
             solved["rejected_reason"] = "solve_not_converged"
-            return None, solved
+            return solved
 
         reconstruction = solver.reconstruction_error(target_triangle, solved)  # type: ignore[arg-type]
         solved["reconstruction_max_abs"] = reconstruction["max_abs"]
         solved["reconstruction_rmse"] = reconstruction["rmse"]
         if reconstruction["max_abs"] > reconstruction_max_abs_tol:
             solved["rejected_reason"] = "reconstruction_error"
-            return None, solved
+        return solved
 
+    @staticmethod
+    def build_sheared_triangle_object(
+        plane_template: dict[str, Any],
+        triangle_template: dict[str, Any],
+        solved: dict[str, float],
+        color: dict[str, float],
+        child_y_scale: float = 0.01,
+        y_offset: float = 0.0,
+    ) -> dict[str, Any]:
+        """求解済みのパラメータから親平面+子三角形のオブジェクトを組み立てる。"""
         parent = create_plane(
             plane_template,
             x=float(solved["px"]),
@@ -1315,9 +2027,9 @@ class MeshPipeline:
         child["data"]["rotation"]["x"] = 0.0
         child["data"]["rotation"]["y"] = float(solved["theta"])
         child["data"]["rotation"]["z"] = 0.0
-        child["data"]["scale"]["x"] = float(solved.get("cx", solved["cs"]))
+        child["data"]["scale"]["x"] = float(solved["cx"])
         child["data"]["scale"]["y"] = child_y_scale
-        child["data"]["scale"]["z"] = float(solved.get("cz", solved["cs"]))
+        child["data"]["scale"]["z"] = float(solved["cz"])
         child_color = copy.deepcopy(color)
         child_color["a"] = 1.0
         child["data"]["alpha"] = 1.0
@@ -1327,38 +2039,82 @@ class MeshPipeline:
         child["data"]["child"] = []
 
         parent["data"]["child"] = [child]
-        return parent, solved
+        return parent
 
     @staticmethod
-    def build_mesh_char_folders(
+    def solve_element_triangles(
+        triangles: list[np.ndarray],
+        solver: TriangleSolverOptimized,
+        reconstruction_max_abs_tol: float = MeshConfig.RECONSTRUCTION_MAX_ABS_TOL,
+        on_solved=None,
+    ) -> dict[str, np.ndarray]:
+        """1要素分の三角形を解き、状態・変換・誤差を配列にまとめる。"""
+        count = len(triangles)
+        statuses = np.zeros(count, dtype=np.int8)
+        transforms = np.zeros(
+            (count, len(MeshConfig.SOLVED_TRANSFORM_FIELDS)), dtype=np.float64
+        )
+        errors = np.zeros((count, 2), dtype=np.float64)
+        nfev = np.zeros(count, dtype=np.int64)
+        for triangle_index, triangle in enumerate(triangles):
+            if on_solved is not None:
+                on_solved()
+            solved = MeshPipeline.solve_sheared_triangle(
+                triangle, solver, reconstruction_max_abs_tol
+            )
+            nfev[triangle_index] = int(solved.get("nfev", 0))
+            rejected_reason = solved.get("rejected_reason")
+            if rejected_reason is not None:
+                statuses[triangle_index] = MeshConfig.TRIANGLE_STATUSES.index(
+                    "reconstruction_failed"
+                    if rejected_reason == "reconstruction_error"
+                    else "solve_failed"
+                )
+                continue
+            transforms[triangle_index] = [
+                float(solved[field]) for field in MeshConfig.SOLVED_TRANSFORM_FIELDS
+            ]
+            errors[triangle_index] = (
+                float(solved.get("reconstruction_max_abs", 0.0)),
+                float(solved.get("reconstruction_rmse", 0.0)),
+            )
+        return {
+            "triangles": np.asarray(triangles, dtype=np.float64).reshape(count, 3, 2),
+            "statuses": statuses,
+            "transforms": transforms,
+            "errors": errors,
+            "nfev": nfev,
+        }
+
+    @staticmethod
+    def shard_elements_by_weight(
+        weights: list[int], shard_count: int
+    ) -> list[list[int]]:
+        """要素を重い順に、合計の重みが最も小さい塊へ割り振る。"""
+        shards: list[list[int]] = [[] for _ in range(max(1, shard_count))]
+        loads = [0] * len(shards)
+        for index in sorted(range(len(weights)), key=lambda i: -weights[i]):
+            target = loads.index(min(loads))
+            shards[target].append(index)
+            loads[target] += weights[index]
+        return [sorted(shard) for shard in shards if shard]
+
+    @staticmethod
+    def solve_elements_serially(
         labels: list[str],
         char_mesh_data: list[dict[str, Any]],
-        plane_template: dict[str, Any],
-        triangle_template: dict[str, Any],
-        folder_obj: dict[str, Any],
-        colors: list[dict[str, float]],
-        reconstruction_max_abs_tol: float = MeshConfig.RECONSTRUCTION_MAX_ABS_TOL,
-        y_offset: float = 0.0,
-        y_offsets: list[float] | None = None,
+        reconstruction_max_abs_tol: float,
         progress_callback=None,
-    ) -> tuple[list[dict[str, Any]], int, int, dict[str, float], list[dict[str, Any]]]:
-        """文字単位でメッシュ三角形フォルダと統計情報を構築する。"""
-        solver = TriangleSolverOptimized(MeshConfig.SOURCE_TRIANGLE)
-        char_folders: list[dict[str, Any]] = []
-        triangle_count = 0
-        raw_triangle_count = 0
-        solve_failed_count = 0
-        reconstruction_failed_count = 0
-        accepted_max_abs_errors: list[float] = []
-        accepted_rmse_errors: list[float] = []
-        triangle_status_records: list[dict[str, Any]] = []
-
+        settings: MeshSettings = DEFAULT_MESH_SETTINGS,
+    ) -> list[dict[str, np.ndarray]]:
+        """全要素を分割してから、三角形を1枚ずつ順に解く。"""
+        solver = TriangleSolverOptimized(MeshConfig.SOURCE_TRIANGLE, settings)
         triangles_per_char: list[list[np.ndarray]] = []
         for idx, _ in enumerate(labels):
             contours = char_mesh_data[idx]["contours"]
-            triangles = MeshPipeline.triangulate_contours(contours)
-            triangles_per_char.append(triangles)
-            raw_triangle_count += len(triangles)
+            triangles_per_char.append(
+                MeshPipeline.triangulate_contours(contours, settings)
+            )
             if progress_callback is not None:
                 progress_callback(
                     stage="triangulate",
@@ -1368,25 +2124,15 @@ class MeshPipeline:
                 )
 
         total_triangles = sum(len(triangles) for triangles in triangles_per_char)
-        processed_triangles = 0
         solve_progress_step = (
             max(1, total_triangles // 250) if total_triangles > 0 else 1
         )
+        processed_triangles = 0
+        element_results: list[dict[str, np.ndarray]] = []
+        for label, triangles in zip(labels, triangles_per_char, strict=True):
 
-        for idx, label in enumerate(labels):
-            char_data = char_mesh_data[idx]
-            triangles = triangles_per_char[idx]
-            triangle_objects: list[dict[str, Any]] = []
-            folder_x = float(char_data["folder_x"])
-            current_folder_y_offset = (
-                float(y_offsets[idx])
-                if y_offsets is not None and idx < len(y_offsets)
-                else 0.0
-            )
-            current_triangle_y_offset = (
-                0.0 if y_offsets is not None else float(y_offset)
-            )
-            for triangle in triangles:
+            def report_solved(label: str = label) -> None:
+                nonlocal processed_triangles
                 processed_triangles += 1
                 if progress_callback is not None and (
                     processed_triangles == 1
@@ -1399,58 +2145,280 @@ class MeshPipeline:
                         total=total_triangles,
                         note=label,
                     )
-                triangle_object, solved = MeshPipeline.create_sheared_triangle(
-                    plane_template,
-                    triangle_template,
-                    triangle,
-                    colors[idx],
+
+            element_results.append(
+                MeshPipeline.solve_element_triangles(
+                    triangles,
                     solver,
-                    y_offset=current_triangle_y_offset,
-                    reconstruction_max_abs_tol=reconstruction_max_abs_tol,
+                    reconstruction_max_abs_tol,
+                    on_solved=report_solved,
                 )
-                shifted_triangle = triangle.copy()
-                shifted_triangle[:, 0] += folder_x
-                if triangle_object is None:
-                    rejected_reason = solved.get(
-                        "rejected_reason", "solve_not_converged"
-                    )
-                    if rejected_reason == "reconstruction_error":
-                        reconstruction_failed_count += 1
-                        triangle_status_records.append(
-                            {
-                                "triangle": shifted_triangle,
-                                "status": "reconstruction_failed",
-                                "char_index": idx,
-                                "folder_x": folder_x,
-                            }
-                        )
-                    else:
-                        solve_failed_count += 1
-                        triangle_status_records.append(
-                            {
-                                "triangle": shifted_triangle,
-                                "status": "solve_failed",
-                                "char_index": idx,
-                                "folder_x": folder_x,
-                            }
-                        )
-                    continue
+            )
+        return element_results
 
-                accepted_max_abs_errors.append(
-                    float(solved.get("reconstruction_max_abs", 0.0))
+    @staticmethod
+    def map_shards_in_processes(
+        function_name: str,
+        shard_args: list[tuple[Any, ...]],
+        process_workers: int,
+        cancel_path: Path,
+        on_done,
+        report,
+    ) -> None:
+        """ページ上の関数を塊ごとにプロセスプールで呼び、終わった塊から on_done へ渡す。
+
+        共有プールを1つのジョブで占有しないよう、同時に投入する塊は process_workers 個
+        までにする。完了を待つ間も一定間隔で report を呼び、キャンセルならそこで例外になる。
+        例外で抜けるときは cancel_path を作って実行中の塊を要素の区切りで打ち切らせ、
+        それらが終わってプールが空くまで待つ。
+        """
+        worker = import_mesh_worker()
+        executor = get_mesh_process_pool()
+        page_path = str(Path(__file__).resolve())
+        running: dict[Future, int] = {}
+        next_shard = 0
+        try:
+            while next_shard < len(shard_args) or running:
+                while next_shard < len(shard_args) and len(running) < process_workers:
+                    future = executor.submit(
+                        worker.call_page_function,
+                        page_path,
+                        function_name,
+                        *shard_args[next_shard],
+                    )
+                    running[future] = next_shard
+                    next_shard += 1
+                done, _ = wait(
+                    running,
+                    timeout=MeshConfig.PROCESS_CANCEL_POLL_INTERVAL,
+                    return_when=FIRST_COMPLETED,
                 )
-                accepted_rmse_errors.append(
-                    float(solved.get("reconstruction_rmse", 0.0))
+                for future in done:
+                    on_done(running.pop(future), future.result())
+                report()
+        except BaseException as exc:
+            for future in running:
+                future.cancel()
+            if isinstance(exc, BrokenProcessPool):
+                # ワーカーが異常終了したプールは閉じて捨て、次の生成で作り直す
+                executor.shutdown(wait=False, cancel_futures=True)
+                get_mesh_process_pool.clear()
+            else:
+                cancel_path.touch()
+                wait(running)
+            raise
+
+    @staticmethod
+    def solve_elements_in_processes(
+        labels: list[str],
+        char_mesh_data: list[dict[str, Any]],
+        reconstruction_max_abs_tol: float,
+        process_workers: int,
+        progress_callback=None,
+        settings: MeshSettings = DEFAULT_MESH_SETTINGS,
+    ) -> list[dict[str, np.ndarray]]:
+        """プロセスプールで、全要素を分割してから求解する。
+
+        直列時と同じく triangulate と solve の段階を分けて進捗を報告する。塊は分割では
+        頂点数、求解では三角形数で釣り合うように分ける。
+        """
+        settings_fields = dataclasses.asdict(settings)
+        shard_count = process_workers * MeshConfig.PROCESS_SHARDS_PER_WORKER
+        # ワーカーはこのファイルができたら要素の区切りで処理を打ち切る
+        cancel_path = (
+            Path(tempfile.gettempdir()) / f"kk-svg-mesh-cancel-{uuid.uuid4().hex}"
+        )
+        progress: dict[str, Any] = {
+            "stage": "triangulate",
+            "current": 0,
+            "total": len(labels),
+            "note": "",
+        }
+
+        def report() -> None:
+            if progress_callback is not None:
+                progress_callback(**progress)
+
+        triangles_per_char: list[list[np.ndarray]] = [[] for _ in labels]
+        element_results: list[dict[str, np.ndarray] | None] = [None] * len(labels)
+        try:
+            shards = MeshPipeline.shard_elements_by_weight(
+                [
+                    sum(len(contour) for contour in data["contours"])
+                    for data in char_mesh_data
+                ],
+                shard_count,
+            )
+
+            def on_triangulated(shard_index: int, results: list[Any]) -> None:
+                for index, triangles in results:
+                    triangles_per_char[index] = triangles
+                    progress["current"] += 1
+                    progress["note"] = labels[index]
+
+            report()
+            MeshPipeline.map_shards_in_processes(
+                "triangulate_svg_mesh_shard",
+                [
+                    (
+                        [(index, char_mesh_data[index]["contours"]) for index in shard],
+                        settings_fields,
+                        str(cancel_path),
+                    )
+                    for shard in shards
+                ],
+                process_workers,
+                cancel_path,
+                on_triangulated,
+                report,
+            )
+
+            shards = MeshPipeline.shard_elements_by_weight(
+                [len(triangles) for triangles in triangles_per_char], shard_count
+            )
+
+            def on_solved(shard_index: int, results: list[Any]) -> None:
+                for index, result in results:
+                    element_results[index] = result
+                    progress["current"] += len(triangles_per_char[index])
+                    progress["note"] = labels[index]
+
+            progress.update(
+                stage="solve",
+                current=0,
+                total=sum(len(triangles) for triangles in triangles_per_char),
+                note="",
+            )
+            report()
+            MeshPipeline.map_shards_in_processes(
+                "solve_svg_mesh_shard",
+                [
+                    (
+                        [(index, triangles_per_char[index]) for index in shard],
+                        settings_fields,
+                        reconstruction_max_abs_tol,
+                        str(cancel_path),
+                    )
+                    for shard in shards
+                ],
+                process_workers,
+                cancel_path,
+                on_solved,
+                report,
+            )
+        finally:
+            cancel_path.unlink(missing_ok=True)
+        return element_results  # type: ignore[return-value]
+
+    @staticmethod
+    def build_mesh_char_folders(
+        labels: list[str],
+        char_mesh_data: list[dict[str, Any]],
+        plane_template: dict[str, Any],
+        triangle_template: dict[str, Any],
+        folder_obj: dict[str, Any],
+        colors: list[dict[str, float]],
+        reconstruction_max_abs_tol: float = MeshConfig.RECONSTRUCTION_MAX_ABS_TOL,
+        y_offset: float = 0.0,
+        y_offsets: list[float] | None = None,
+        progress_callback=None,
+        settings: MeshSettings = DEFAULT_MESH_SETTINGS,
+        process_workers: int = 1,
+    ) -> tuple[list[dict[str, Any]], int, int, dict[str, float], list[dict[str, Any]]]:
+        """文字単位でメッシュ三角形フォルダと統計情報を構築する。
+
+        process_workers が2以上で要素が PROCESS_MIN_ELEMENTS 個以上なら要素単位で
+        プロセスプールへ分散し、結果の配列からフォルダを組み立てるため、並びと
+        y オフセットは直列時と同じになる。
+        """
+        element_results: list[dict[str, np.ndarray]] | None = None
+        if process_workers > 1 and len(labels) >= MeshConfig.PROCESS_MIN_ELEMENTS:
+            try:
+                element_results = MeshPipeline.solve_elements_in_processes(
+                    labels,
+                    char_mesh_data,
+                    reconstruction_max_abs_tol,
+                    process_workers,
+                    progress_callback=progress_callback,
+                    settings=settings,
                 )
+            except BrokenProcessPool:
+                # 壊れたプールは破棄済みなので、この生成は直列で続ける
+                pass
+        if element_results is None:
+            element_results = MeshPipeline.solve_elements_serially(
+                labels,
+                char_mesh_data,
+                reconstruction_max_abs_tol,
+                progress_callback=progress_callback,
+                settings=settings,
+            )
+
+        char_folders: list[dict[str, Any]] = []
+        triangle_count = 0
+        raw_triangle_count = 0
+        solve_failed_count = 0
+        reconstruction_failed_count = 0
+        accepted_max_abs_errors: list[float] = []
+        accepted_rmse_errors: list[float] = []
+        triangle_status_records: list[dict[str, Any]] = []
+
+        for idx, label in enumerate(labels):
+            char_data = char_mesh_data[idx]
+            result = element_results[idx]
+            triangle_objects: list[dict[str, Any]] = []
+            folder_x = float(char_data["folder_x"])
+            current_folder_y_offset = (
+                float(y_offsets[idx])
+                if y_offsets is not None and idx < len(y_offsets)
+                else 0.0
+            )
+            current_triangle_y_offset = (
+                0.0 if y_offsets is not None else float(y_offset)
+            )
+            raw_triangle_count += len(result["triangles"])
+            for triangle, status_code, transform, errors in zip(
+                result["triangles"],
+                result["statuses"],
+                result["transforms"],
+                result["errors"],
+                strict=True,
+            ):
+                shifted_triangle = triangle.copy()
+                shifted_triangle[:, 0] += folder_x
+                status = MeshConfig.TRIANGLE_STATUSES[int(status_code)]
                 triangle_status_records.append(
                     {
                         "triangle": shifted_triangle,
-                        "status": "accepted",
+                        "status": status,
                         "char_index": idx,
                         "folder_x": folder_x,
                     }
                 )
-                triangle_objects.append(triangle_object)
+                if status == "reconstruction_failed":
+                    reconstruction_failed_count += 1
+                    continue
+                if status == "solve_failed":
+                    solve_failed_count += 1
+                    continue
+
+                accepted_max_abs_errors.append(float(errors[0]))
+                accepted_rmse_errors.append(float(errors[1]))
+                triangle_objects.append(
+                    MeshPipeline.build_sheared_triangle_object(
+                        plane_template,
+                        triangle_template,
+                        dict(
+                            zip(
+                                MeshConfig.SOLVED_TRANSFORM_FIELDS,
+                                transform,
+                                strict=True,
+                            )
+                        ),
+                        colors[idx],
+                        y_offset=current_triangle_y_offset,
+                    )
+                )
 
             triangle_count += len(triangle_objects)
             char_folder = copy.deepcopy(folder_obj)
@@ -1462,6 +2430,8 @@ class MeshPipeline:
             char_folders.append(char_folder)
 
         mesh_stats = {
+            "solve_count": sum(len(result["nfev"]) for result in element_results),
+            "solver_nfev": int(sum(result["nfev"].sum() for result in element_results)),
             "solve_failed_count": float(solve_failed_count),
             "reconstruction_failed_count": float(reconstruction_failed_count),
             "reconstruction_tol": float(reconstruction_max_abs_tol),
@@ -1481,14 +2451,190 @@ class MeshPipeline:
         )
 
     @staticmethod
-    def build_mesh_triangulation_preview(
-        char_mesh_data: list[dict[str, Any]],
-        triangle_status_records: list[dict[str, Any]],
-        width: int = 900,
-        height: int = 360,
-        padding: int = 24,
-    ) -> Image.Image | None:
-        """輪郭と三角形ステータスのプレビュー画像を生成する。"""
+    def ring_next_indices(lengths: list[int]) -> np.ndarray:
+        """連結した閉路の頂点配列で、各頂点の次の頂点 (末尾は先頭へ戻る) の添字を返す。"""
+        ring_lengths = np.asarray(lengths, dtype=np.int64)
+        ring_ends = np.cumsum(ring_lengths)
+        next_indices = np.arange(int(ring_ends[-1]) if len(ring_ends) else 0) + 1
+        next_indices[ring_ends[ring_lengths > 0] - 1] = (ring_ends - ring_lengths)[
+            ring_lengths > 0
+        ]
+        return next_indices
+
+    @staticmethod
+    def scanline_spans(
+        starts: np.ndarray,
+        ends: np.ndarray,
+        polygon_ids: np.ndarray,
+        shape: tuple[int, int],
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """辺の集合を走査線で区切り、塗る区間を (行, 開始列, 終了列, 多角形 id) で返す。
+
+        同じ polygon_ids を持つ辺どうしは偶奇規則で組にするので、穴は区間から抜ける。
+        座標は画像のピクセル座標で、ピクセル中心が内側にある列 [開始列, 終了列) を塗る。
+        """
+        height, width = shape
+        empty = np.zeros(0, dtype=np.int64)
+        if len(starts) == 0 or height <= 0 or width <= 0:
+            return empty, empty, empty, empty
+        x0, y0 = starts[:, 0], starts[:, 1]
+        x1, y1 = ends[:, 0], ends[:, 1]
+        # 辺が横切る走査線 (ピクセル中心 row + 0.5 が [下端, 上端) に入る行)
+        row_first = np.maximum(np.ceil(np.minimum(y0, y1) - 0.5), 0).astype(np.int64)
+        row_last = np.minimum(np.ceil(np.maximum(y0, y1) - 0.5) - 1, height - 1).astype(
+            np.int64
+        )
+        counts = np.maximum(row_last - row_first + 1, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return empty, empty, empty, empty
+
+        edge_index = np.repeat(np.arange(len(starts)), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = row_first[edge_index] + offsets
+        t = (rows + 0.5 - y0[edge_index]) / (y1[edge_index] - y0[edge_index])
+        xs = x0[edge_index] + t * (x1[edge_index] - x0[edge_index])
+        ids = np.asarray(polygon_ids)[edge_index]
+
+        # (多角形, 行, x) の順を1つの実数キーにまとめて並べる。x は画像の外側を
+        # 丸めても列へ切り詰めた結果が変わらないので、キーの桁が揃う範囲に収める
+        xs = np.clip(xs, -1.0, width + 1.0)
+        order = np.argsort((ids * height + rows) * (width + 3.0) + (xs + 1.0))
+        rows = rows[order]
+        xs = xs[order]
+        ids = ids[order]
+        # 多角形と行が同じ交点を左から2つずつ組にして区間にする
+        group_start = np.ones(total, dtype=bool)
+        group_start[1:] = (ids[1:] != ids[:-1]) | (rows[1:] != rows[:-1])
+        start_index = np.flatnonzero(group_start)
+        position = np.arange(total) - np.repeat(
+            start_index, np.diff(np.append(start_index, total))
+        )
+        left = np.flatnonzero(position % 2 == 0)
+        left = left[left + 1 < total]
+        left = left[~group_start[left + 1]]
+
+        col_start = np.clip(np.ceil(xs[left] - 0.5), 0, width).astype(np.int64)
+        col_end = np.clip(np.ceil(xs[left + 1] - 0.5), 0, width).astype(np.int64)
+        valid = col_end > col_start
+        return rows[left][valid], col_start[valid], col_end[valid], ids[left][valid]
+
+    @staticmethod
+    def scanline_fill_mask(
+        starts: np.ndarray,
+        ends: np.ndarray,
+        polygon_ids: np.ndarray,
+        shape: tuple[int, int],
+    ) -> np.ndarray:
+        """多角形の和集合を塗りつぶした (高さ, 幅) の真偽マスクを返す。"""
+        height, width = shape
+        rows, col_start, col_end, _ = MeshPipeline.scanline_spans(
+            starts, ends, polygon_ids, shape
+        )
+        if len(rows) == 0:
+            return np.zeros((height, width), dtype=bool)
+        # 区間の始まりで +1、終わりで -1 して行方向に累積すると塗る範囲になる
+        stride = width + 1
+        size = height * stride
+        diff = np.bincount(rows * stride + col_start, minlength=size) - np.bincount(
+            rows * stride + col_end, minlength=size
+        )
+        return np.cumsum(diff.reshape(height, stride)[:, :width], axis=1) > 0
+
+    @staticmethod
+    def scanline_top_polygon(
+        starts: np.ndarray,
+        ends: np.ndarray,
+        polygon_ids: np.ndarray,
+        shape: tuple[int, int],
+    ) -> np.ndarray:
+        """各ピクセルを覆う多角形のうち、最も大きい id (最後に描くもの) を返す。
+
+        何も覆わないピクセルは -1。重ね塗りの順序を id の大小で表すので、全多角形を
+        一度に描ける。
+        """
+        height, width = shape
+        top = np.full(height * width, -1, dtype=np.int64)
+        rows, col_start, col_end, ids = MeshPipeline.scanline_spans(
+            starts, ends, polygon_ids, shape
+        )
+        lengths = col_end - col_start
+        # 区間をピクセルへ展開する量が大きくなりすぎないよう、塊に分けて書き込む
+        chunk_ends = np.searchsorted(
+            np.cumsum(lengths),
+            np.arange(
+                MeshConfig.PREVIEW_PIXEL_CHUNK,
+                int(lengths.sum()),
+                MeshConfig.PREVIEW_PIXEL_CHUNK,
+            ),
+        )
+        for chunk in np.split(np.arange(len(rows)), chunk_ends + 1):
+            if len(chunk) == 0:
+                continue
+            chunk_lengths = lengths[chunk]
+            total = int(chunk_lengths.sum())
+            offsets = np.arange(total) - np.repeat(
+                np.cumsum(chunk_lengths) - chunk_lengths, chunk_lengths
+            )
+            pixels = (
+                np.repeat(rows[chunk] * width + col_start[chunk], chunk_lengths)
+                + offsets
+            )
+            np.maximum.at(top, pixels, np.repeat(ids[chunk], chunk_lengths))
+        return top.reshape(height, width)
+
+    @staticmethod
+    def rasterize_line_mask(
+        starts: np.ndarray, ends: np.ndarray, shape: tuple[int, int]
+    ) -> np.ndarray:
+        """線分の集合を幅1ピクセルで描いた (高さ, 幅) の真偽マスクを返す。"""
+        height, width = shape
+        mask = np.zeros((height, width), dtype=bool)
+        if len(starts) == 0:
+            return mask
+        delta = ends - starts
+        counts = np.ceil(np.abs(delta).max(axis=1)).astype(np.int64) + 1
+        total = int(counts.sum())
+        edge_index = np.repeat(np.arange(len(starts)), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        t = offsets / np.maximum(counts[edge_index] - 1, 1)
+        points = starts[edge_index] + delta[edge_index] * t[:, None]
+        cols = np.floor(points[:, 0]).astype(np.int64)
+        rows = np.floor(points[:, 1]).astype(np.int64)
+        inside = (cols >= 0) & (cols < width) & (rows >= 0) & (rows < height)
+        mask[rows[inside], cols[inside]] = True
+        return mask
+
+    @staticmethod
+    def paint_preview_mask(
+        canvas: np.ndarray, mask: np.ndarray, color: tuple[int, int, int, int]
+    ) -> None:
+        """RGBA 画像 (uint8 配列) のマスク部分を色で置き換える (ImageDraw と同じく合成しない)。"""
+        canvas[mask] = color
+
+    @staticmethod
+    def select_preview_triangles(priorities: np.ndarray, limit: int) -> np.ndarray:
+        """枠線を描く三角形を、失敗したものを優先しつつ上限まで間引いて選ぶ。"""
+        if len(priorities) <= limit:
+            return np.arange(len(priorities))
+        failed = np.flatnonzero(priorities > 0)[:limit]
+        accepted = np.flatnonzero(priorities == 0)
+        remaining = limit - len(failed)
+        if remaining <= 0 or len(accepted) == 0:
+            return failed
+        # 要素の並び順に等間隔で拾い、形全体にまんべんなく散らす
+        picks = np.linspace(0, len(accepted) - 1, remaining).astype(np.int64)
+        return np.sort(np.concatenate([failed, accepted[np.unique(picks)]]))
+
+    @staticmethod
+    def build_mesh_triangulation_preview(
+        char_mesh_data: list[dict[str, Any]],
+        triangle_status_records: list[dict[str, Any]],
+        width: int = 900,
+        height: int = 360,
+        padding: int = 24,
+    ) -> Image.Image | None:
+        """輪郭と三角形ステータスのプレビュー画像を生成する。"""
         global_contours: list[np.ndarray] = []
         global_triangles = triangle_status_records or []
 
@@ -1502,11 +2648,12 @@ class MeshPipeline:
         if not global_contours and not global_triangles:
             return None
 
-        points: list[np.ndarray] = []
-        points.extend(global_contours)
-        for record in global_triangles:
-            points.append(record["triangle"])
-        all_points = np.vstack(points)
+        triangles = (
+            np.stack([record["triangle"] for record in global_triangles])
+            if global_triangles
+            else np.zeros((0, 3, 2), dtype=np.float64)
+        )
+        all_points = np.vstack([*global_contours, triangles.reshape(-1, 2)])
 
         min_x = float(np.min(all_points[:, 0]))
         max_x = float(np.max(all_points[:, 0]))
@@ -1532,14 +2679,16 @@ class MeshPipeline:
         plot_offset_x = plot_left + (plot_width - scaled_width) * 0.5
         plot_offset_y = plot_top + (plot_height - scaled_height) * 0.5
 
-        def project(point: np.ndarray) -> tuple[float, float]:
-            """ワールド座標をプレビュー画像座標へ射影する。"""
-            x = plot_offset_x + (point[0] - min_x) * scale
-            y = plot_offset_y + (max_y - point[1]) * scale
-            return float(x), float(y)
+        def project(points: np.ndarray) -> np.ndarray:
+            """ワールド座標の配列をプレビュー画像座標へまとめて射影する。"""
+            projected = np.empty(points.shape, dtype=np.float64)
+            projected[..., 0] = plot_offset_x + (points[..., 0] - min_x) * scale
+            projected[..., 1] = plot_offset_y + (max_y - points[..., 1]) * scale
+            return projected
 
-        image = Image.new("RGBA", (width, height), (18, 20, 24, 255))
-        draw = ImageDraw.Draw(image, "RGBA")
+        shape = (height, width)
+        canvas = np.empty((height, width, 4), dtype=np.uint8)
+        canvas[:] = (18, 20, 24, 255)
 
         status_style: dict[str, dict[str, Any]] = {
             "accepted": {
@@ -1559,28 +2708,68 @@ class MeshPipeline:
             },
         }
 
-        sorted_records = sorted(
-            global_triangles,
-            key=lambda record: status_style.get(
-                record["status"], status_style["accepted"]
-            )["priority"],
+        priorities = np.array(
+            [
+                status_style.get(record["status"], status_style["accepted"])["priority"]
+                for record in global_triangles
+            ],
+            dtype=np.int64,
         )
-        for record in sorted_records:
-            style = status_style.get(record["status"], status_style["accepted"])
-            projected = [project(vertex) for vertex in record["triangle"]]
-            draw.polygon(projected, fill=style["fill"], outline=style["outline"])
-
-        for contour in global_contours:
-            projected = [project(vertex) for vertex in contour]
-            if len(projected) >= 2:
-                draw.line(
-                    projected + [projected[0]], fill=(220, 220, 220, 220), width=1
-                )
+        projected_triangles = project(triangles)
+        # 塗りは全三角形をまとめて走査線で描き、枠線は上限までに間引いて描く
+        outlined = np.zeros(len(triangles), dtype=bool)
+        outlined[
+            MeshPipeline.select_preview_triangles(
+                priorities, MeshConfig.PREVIEW_TRIANGLE_LIMIT
+            )
+        ] = True
+        for style in sorted(status_style.values(), key=lambda item: item["priority"]):
+            selected = priorities == style["priority"]
+            if not selected.any():
+                continue
+            starts = projected_triangles[selected].reshape(-1, 2)
+            ends = np.roll(projected_triangles[selected], -1, axis=1).reshape(-1, 2)
+            polygon_ids = np.repeat(np.arange(int(selected.sum())), 3)
+            MeshPipeline.paint_preview_mask(
+                canvas,
+                MeshPipeline.scanline_fill_mask(starts, ends, polygon_ids, shape),
+                style["fill"],
+            )
+            outline_triangles = projected_triangles[selected & outlined]
+            MeshPipeline.paint_preview_mask(
+                canvas,
+                MeshPipeline.rasterize_line_mask(
+                    outline_triangles.reshape(-1, 2),
+                    np.roll(outline_triangles, -1, axis=1).reshape(-1, 2),
+                    shape,
+                ),
+                style["outline"],
+            )
+
+        if global_contours:
+            projected_contours = project(np.vstack(global_contours))
+            MeshPipeline.paint_preview_mask(
+                canvas,
+                MeshPipeline.rasterize_line_mask(
+                    projected_contours,
+                    projected_contours[
+                        MeshPipeline.ring_next_indices(
+                            [len(contour) for contour in global_contours]
+                        )
+                    ],
+                    shape,
+                ),
+                (220, 220, 220, 220),
+            )
+
+        image = Image.fromarray(canvas, mode="RGBA")
+        draw = ImageDraw.Draw(image, "RGBA")
 
         legend_x = int(plot_right + legend_gap)
         legend_y = padding
         legend_w = max(120, width - legend_x - padding)
-        legend_h = 64
+        outline_count = int(outlined.sum())
+        legend_h = 64 if outline_count == len(triangles) else 82
         draw.rectangle(
             [(legend_x, legend_y), (legend_x + legend_w, legend_y + legend_h)],
             fill=(10, 10, 10, 180),
@@ -1599,6 +2788,12 @@ class MeshPipeline:
                 outline=(230, 230, 230, 230),
             )
             draw.text((legend_x + 28, top - 1), label, fill=(235, 235, 235, 240))
+        if outline_count != len(triangles):
+            draw.text(
+                (legend_x + 8, legend_y + 62),
+                f"outlines: {outline_count:,} / {len(triangles):,}",
+                fill=(200, 200, 200, 240),
+            )
 
         return image
 
@@ -1643,6 +2838,32 @@ class MeshPipeline:
     @staticmethod
     def render_generation_feedback(mesh_stats: dict[str, Any], lang: str) -> None:
         """生成時の失敗警告と誤差サマリを表示する。"""
+        budget_tuning = mesh_stats.get("budget_tuning")
+        if budget_tuning is not None:
+            message = get_text(
+                "budget_result" if budget_tuning["fits"] else "budget_over", lang
+            ).format(
+                value=budget_tuning["value"],
+                predicted=budget_tuning["predicted"],
+                actual=budget_tuning["actual"],
+                budget=budget_tuning["budget"],
+            )
+            if budget_tuning["fits"]:
+                st.info(message)
+            else:
+                st.warning(message)
+        for stats_key in (
+            "merge_same_color",
+            "occlusion_culling",
+            "simplify_contours",
+            "geometry_reduction",
+        ):
+            if stats_key in mesh_stats:
+                st.info(
+                    get_text(f"{stats_key}_result", lang).format(
+                        **mesh_stats[stats_key]
+                    )
+                )
         if int(mesh_stats.get("solve_failed_count", 0)) > 0:
             st.warning(
                 get_text("warn_solver", lang).format(
@@ -1663,6 +2884,25 @@ class MeshPipeline:
             )
         )
 
+    @staticmethod
+    @st.fragment(run_every=MeshJobScheduler.POLL_INTERVAL)
+    def render_job_progress(lang: str) -> None:
+        """バックグラウンド生成の進捗とキャンセルボタンを定期更新で描画する。"""
+        job = st.session_state.get("svg_job")
+        if job is None:
+            return
+        if job.future.done():
+            # 完了したらページ全体を再実行して結果を表示する
+            st.rerun()
+
+        progress_callback = MeshPipeline.build_progress_callback(lang)
+        get_mesh_job_scheduler().report_status(job, progress_callback, lang)
+        if job.cancel_event.is_set():
+            st.caption(get_text("job_cancelling", lang))
+        elif st.button(f"⏹️ {get_text('job_cancel_button', lang)}"):
+            get_mesh_job_scheduler().cancel(job)
+            st.caption(get_text("job_cancelling", lang))
+
     @staticmethod
     def render_triangulation_section(
         triangulation_preview: Image.Image | None, lang: str
@@ -1674,6 +2914,73 @@ class MeshPipeline:
         else:
             st.image(triangulation_preview, width="stretch")
 
+    @staticmethod
+    def render_performance_section(
+        performance: dict[str, Any] | None, lang: str
+    ) -> None:
+        """生成ジョブの段階別の計測結果を折りたたみパネルに表示する。"""
+        if performance is None:
+            return
+        stage_labels = MeshPipeline.stage_labels(lang)
+        stages = list(performance["stages"])
+        if "serialize" in performance:
+            stages.append(
+                {"stage": "serialize", "cpu": None, **performance["serialize"]}
+            )
+        total_wall = max(float(performance["wall"]), 1e-9)
+        with st.expander(f"⏱️ {get_text('performance_title', lang)}", expanded=False):
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric(
+                    get_text("performance_wall", lang), f"{performance['wall']:.2f} s"
+                )
+            with col2:
+                st.metric(
+                    get_text("performance_triangles_per_second", lang),
+                    "-"
+                    if performance["triangles_per_second"] is None
+                    else f"{performance['triangles_per_second']:,.0f}",
+                )
+            with col3:
+                st.metric(
+                    get_text("performance_nfev_per_solve", lang),
+                    "-"
+                    if performance["nfev_per_solve"] is None
+                    else f"{performance['nfev_per_solve']:.1f}",
+                )
+            with col4:
+                st.metric(
+                    get_text("performance_peak_memory", lang),
+                    "-"
+                    if performance["peak_rss_mb"] is None
+                    else f"{performance['peak_rss_mb']:,.0f} MB",
+                )
+            st.dataframe(
+                [
+                    {
+                        get_text("performance_stage", lang): stage_labels.get(
+                            entry["stage"], entry["stage"]
+                        ),
+                        get_text("performance_stage_wall", lang): round(
+                            entry["wall"], 3
+                        ),
+                        get_text("performance_stage_cpu", lang): None
+                        if entry["cpu"] is None
+                        else round(entry["cpu"], 3),
+                        get_text("performance_stage_share", lang): round(
+                            100.0 * entry["wall"] / total_wall, 1
+                        ),
+                        get_text("performance_stage_memory", lang): None
+                        if entry.get("peak_rss_mb") is None
+                        else round(entry["peak_rss_mb"], 1),
+                    }
+                    for entry in stages
+                ],
+                hide_index=True,
+                width="stretch",
+            )
+            st.caption(get_text("performance_help", lang))
+
 
 def point_to_np(point: Any) -> np.ndarray:
     """svgelements の点オブジェクトを NumPy 座標へ変換する。"""
@@ -1800,75 +3107,141 @@ def segment_point_to_np(segment: Any, t: float) -> np.ndarray:
     return point_to_np(segment.point(float(t)))
 
 
-def should_split_svg_curve(
-    segment: Any,
-    start_t: float,
-    end_t: float,
-    start_point: np.ndarray,
-    end_point: np.ndarray,
-    error: float,
-    depth: int,
-) -> bool:
-    """wildmeshing の曲線サンプリングと同じ弦長誤差で分割可否を判定する。"""
-    if depth < MeshConfig.SVG_CURVE_SAMPLE_MIN_DEPTH:
-        return True
-    if depth >= MeshConfig.SVG_CURVE_SAMPLE_MAX_DEPTH:
-        return False
-
-    chord_length = float(np.linalg.norm(end_point - start_point))
-    mid_t = 0.5 * (start_t + end_t)
-    mid_point = segment_point_to_np(segment, mid_t)
-    split_length = float(
-        np.linalg.norm(mid_point - start_point) + np.linalg.norm(end_point - mid_point)
-    )
-    return abs(split_length - chord_length) > error
-
-
-def sample_curve_segment_points(segment: Any, error: float) -> list[np.ndarray]:
-    """曲線セグメントを誤差ベースで再帰分割して終点を含む点列にする。"""
-    points: list[np.ndarray] = []
+def evaluate_curve_segments(segments: list[Any], positions: np.ndarray) -> np.ndarray:
+    """曲線セグメント群を複数のパラメータ t でまとめて評価し (n, m, 2) で返す。
+
+    ベジェ曲線は制御点とバーンスタイン基底の積で一括評価し、円弧は
+    svgelements の NumPy 評価を使う。
+    """
+    points = np.empty((len(segments), len(positions), 2), dtype=np.float64)
+    cubic_indices: list[int] = []
+    quadratic_indices: list[int] = []
+    for index, segment in enumerate(segments):
+        if isinstance(segment, CubicBezier):
+            cubic_indices.append(index)
+        elif isinstance(segment, QuadraticBezier):
+            quadratic_indices.append(index)
+        else:
+            points[index] = np.asarray(segment.npoint(positions), dtype=np.float64)
+
+    t = positions
+    u = 1.0 - positions
+    if cubic_indices:
+        controls = np.asarray(
+            [
+                [
+                    [float(point.x), float(point.y)]
+                    for point in (
+                        segments[index].start,
+                        segments[index].control1,
+                        segments[index].control2,
+                        segments[index].end,
+                    )
+                ]
+                for index in cubic_indices
+            ],
+            dtype=np.float64,
+        )
+        basis = np.stack([u * u * u, 3.0 * u * u * t, 3.0 * u * t * t, t * t * t], 1)
+        points[cubic_indices] = np.einsum("mk,nkd->nmd", basis, controls)
+    if quadratic_indices:
+        controls = np.asarray(
+            [
+                [
+                    [float(point.x), float(point.y)]
+                    for point in (
+                        segments[index].start,
+                        segments[index].control,
+                        segments[index].end,
+                    )
+                ]
+                for index in quadratic_indices
+            ],
+            dtype=np.float64,
+        )
+        basis = np.stack([u * u, 2.0 * u * t, t * t], 1)
+        points[quadratic_indices] = np.einsum("mk,nkd->nmd", basis, controls)
+    return points
 
-    def recurse(
-        start_t: float,
-        end_t: float,
-        start_point: np.ndarray,
-        end_point: np.ndarray,
-        depth: int,
-    ) -> None:
-        if should_split_svg_curve(
-            segment=segment,
-            start_t=start_t,
-            end_t=end_t,
-            start_point=start_point,
-            end_point=end_point,
-            error=error,
-            depth=depth,
-        ):
-            mid_t = 0.5 * (start_t + end_t)
-            mid_point = segment_point_to_np(segment, mid_t)
-            recurse(start_t, mid_t, start_point, mid_point, depth + 1)
-            recurse(mid_t, end_t, mid_point, end_point, depth + 1)
-            return
-        points.append(end_point)
 
-    start_point = segment_point_to_np(segment, 0.0)
-    end_point = segment_point_to_np(segment, 1.0)
-    recurse(0.0, 1.0, start_point, end_point, 0)
-    return points
+def sample_curve_segments_points(
+    segments: list[Any], error: float, min_depth: int, max_depth: int
+) -> list[list[np.ndarray]]:
+    """曲線セグメント群を誤差ベースで二分割し、各セグメントの終点を含む点列を返す。
 
+    分割の判定は wildmeshing の曲線サンプリングと同じ弦長誤差
+    (中点経由の長さと弦長の差が error を超えたら分割) で、min/max 深さも同じ扱い。
+    最大深さの格子点を一度に評価し、深さごとに全セグメントの判定をまとめて行う。
+    """
+    if not segments:
+        return []
+    grid_depth = max(min_depth, max_depth)
+    grid_size = 1 << grid_depth
+    points = evaluate_curve_segments(
+        segments, np.arange(grid_size + 1, dtype=np.float64) / grid_size
+    )
 
-def sample_segment_points(segment: Any) -> list[np.ndarray]:
-    """セグメントをポリライン化して、始点を除くサンプル点列を返す。"""
-    if isinstance(segment, SVG_CURVE_SEGMENT_TYPES):
-        return sample_curve_segment_points(
-            segment,
-            error=MeshConfig.SVG_CURVE_SAMPLE_ERROR,
-        )
-    return [segment_point_to_np(segment, 1.0)]
+    leaf_end_mask = np.zeros((len(segments), grid_size + 1), dtype=bool)
+    active = np.ones((len(segments), 1), dtype=bool)
+    for depth in range(grid_depth + 1):
+        span = grid_size >> depth
+        starts = np.arange(1 << depth) * span
+        ends = starts + span
+        if depth < min_depth:
+            split = active
+        elif depth >= max_depth:
+            split = np.zeros_like(active)
+        else:
+            mids = starts + span // 2
+            start_points = points[:, starts]
+            mid_points = points[:, mids]
+            end_points = points[:, ends]
+            chord_length = np.linalg.norm(end_points - start_points, axis=2)
+            split_length = np.linalg.norm(
+                mid_points - start_points, axis=2
+            ) + np.linalg.norm(end_points - mid_points, axis=2)
+            split = active & (np.abs(split_length - chord_length) > error)
+        leaf_end_mask[:, ends] |= active & ~split
+        if not split.any():
+            break
+        active = np.repeat(split, 2, axis=1)
+
+    # 葉区間は [0, 1] を隙間なく覆うので、終点を t の昇順に並べれば再帰順と一致する。
+    return [list(points[index, leaf_end_mask[index]]) for index in range(len(segments))]
+
+
+def sample_path_segment_points(
+    path_obj: SVGPath, settings: MeshSettings = DEFAULT_MESH_SETTINGS
+) -> list[list[np.ndarray]]:
+    """パス内の全セグメントをポリライン化し、セグメント順のサンプル点列を返す。
+
+    曲線セグメントはパス単位でまとめてサンプリングする。
+    """
+    segments = list(path_obj)
+    curve_indices = [
+        index
+        for index, segment in enumerate(segments)
+        if isinstance(segment, SVG_CURVE_SEGMENT_TYPES)
+    ]
+    curve_points = sample_curve_segments_points(
+        [segments[index] for index in curve_indices],
+        error=settings.curve_sample_error,
+        min_depth=settings.curve_sample_min_depth,
+        max_depth=settings.curve_sample_max_depth,
+    )
+    sampled: list[list[np.ndarray]] = [
+        [] if isinstance(segment, Move) else [segment_point_to_np(segment, 1.0)]
+        for segment in segments
+    ]
+    for index, points in zip(curve_indices, curve_points, strict=True):
+        sampled[index] = points
+    return sampled
 
 
 def path_to_contours(
-    path_obj: SVGPath, auto_close_open_paths: bool
+    path_obj: SVGPath,
+    auto_close_open_paths: bool,
+    settings: MeshSettings = DEFAULT_MESH_SETTINGS,
 ) -> list[np.ndarray]:
     """1つの SVG パスを有効な輪郭列へ変換する。"""
     contours: list[np.ndarray] = []
@@ -1901,7 +3274,9 @@ def path_to_contours(
         has_draw_segment = False
         current_closed = False
 
-    for segment in path_obj:
+    for segment, sampled in zip(
+        path_obj, sample_path_segment_points(path_obj, settings), strict=True
+    ):
         if isinstance(segment, Move):
             flush_contour()
             current_points = [point_to_np(segment.end)]
@@ -1916,7 +3291,6 @@ def path_to_contours(
                 if end is not None:
                     current_points = [point_to_np(end)]
 
-        sampled = sample_segment_points(segment)
         if sampled:
             current_points.extend(sampled)
             has_draw_segment = True
@@ -1927,7 +3301,9 @@ def path_to_contours(
     return contours
 
 
-def svg_path_to_pathops_path(path_obj: SVGPath) -> Any | None:
+def svg_path_to_pathops_path(
+    path_obj: SVGPath, settings: MeshSettings = DEFAULT_MESH_SETTINGS
+) -> Any | None:
     """SVGパスをPathOpsの開閉サブパスに変換する。"""
     path = pathops.Path()
     has_path = False
@@ -1964,7 +3340,9 @@ def svg_path_to_pathops_path(path_obj: SVGPath) -> Any | None:
         has_draw_segment = False
         current_closed = False
 
-    for segment in path_obj:
+    for segment, sampled in zip(
+        path_obj, sample_path_segment_points(path_obj, settings), strict=True
+    ):
         if isinstance(segment, Move):
             flush_subpath()
             current_points = [point_to_np(segment.end)]
@@ -1979,7 +3357,6 @@ def svg_path_to_pathops_path(path_obj: SVGPath) -> Any | None:
                 if end is not None:
                     current_points = [point_to_np(end)]
 
-        sampled = sample_segment_points(segment)
         if sampled:
             current_points.extend(sampled)
             has_draw_segment = True
@@ -1996,12 +3373,13 @@ def stroke_path_to_contours(
     linecap: Any,
     linejoin: Any,
     miter_limit: float,
+    settings: MeshSettings = DEFAULT_MESH_SETTINGS,
 ) -> list[np.ndarray]:
     """SVG stroke を輪郭化して有効輪郭列として返す。"""
     if stroke_width <= 1e-9:
         return []
 
-    source_path = svg_path_to_pathops_path(path_obj)
+    source_path = svg_path_to_pathops_path(path_obj, settings)
     if source_path is None:
         return []
 
@@ -2029,14 +3407,304 @@ def stroke_path_to_contours(
         return []
 
 
+def svg_local_tag(elem: Element) -> str:
+    """名前空間を除いた要素名を返す。"""
+    tag = elem.tag if isinstance(elem.tag, str) else ""
+    return tag.rsplit("}", 1)[-1]
+
+
+def svg_use_href(elem: Element) -> str | None:
+    """<use> が参照する id を返す。"""
+    href = elem.get("{http://www.w3.org/1999/xlink}href") or elem.get("href")
+    if href and href.startswith("#"):
+        return href[1:]
+    return None
+
+
+def detach_svg_element(parent: Element, elem: Element) -> None:
+    """読み終えた要素を親から外し、木全体が溜まらないようにする。"""
+    if len(parent) and parent[-1] is elem:
+        del parent[-1]
+    else:
+        parent.remove(elem)
+
+
+def collect_svg_use_targets(svg_bytes: bytes) -> tuple[set[str], bool]:
+    """<use> から参照される id を、要素を溜めずに先読みで集める。
+
+    あわせて、まだ現れていない要素を参照する <use> (前方参照) があるかを返す。
+    """
+    targets: set[str] = set()
+    seen_ids: set[str] = set()
+    has_forward_use = False
+    parents: list[Element] = []
+    for event, elem in iterparse(io.BytesIO(svg_bytes), events=("start", "end")):
+        if event == "start":
+            parents.append(elem)
+            elem_id = elem.get("id")
+            if elem_id is not None:
+                seen_ids.add(elem_id)
+            continue
+        parents.pop()
+        if svg_local_tag(elem) == "use":
+            href = svg_use_href(elem)
+            if href is not None:
+                targets.add(href)
+                if href not in seen_ids:
+                    has_forward_use = True
+        if parents:
+            detach_svg_element(parents[-1], elem)
+    return targets, has_forward_use
+
+
+def resolve_svg_values(
+    tag: str,
+    elem: Element,
+    parent_values: dict[str, Any],
+    styles: dict[str, str],
+) -> dict[str, Any]:
+    """親から継承した値に、属性・CSS・style 属性を重ねた要素の値を作る。
+
+    svgelements の SVG.parse と同じ優先順位 (属性 < CSS < style 属性) で解決する。
+    """
+    values = dict(parent_values)
+    # 子へ継承しない値
+    for key in ("preserveAspectRatio", "viewBox", "id", "class", "clip-path"):
+        values.pop(key, None)
+
+    attributes = dict(elem.attrib)
+    attributes["tag"] = tag
+    style_parts = [styles[key] for key in ("*", tag) if key in styles]
+    if "id" in attributes and f"#{attributes['id']}" in styles:
+        style_parts.append(styles[f"#{attributes['id']}"])
+    for svg_class in attributes.get("class", "").split():
+        for selector in (f".{svg_class}", f"{tag}.{svg_class}"):
+            if selector in styles:
+                style_parts.append(styles[selector])
+    if "style" in attributes:
+        style_parts.append(attributes["style"])
+    for equate in ";".join(style_parts).split(";"):
+        equal_item = equate.split(":")
+        if len(equal_item) == 2:
+            attributes[equal_item[0].strip()] = equal_item[1].strip()
+
+    for paint_key in ("fill", "stroke"):
+        if attributes.get(paint_key) == "currentColor":
+            attributes[paint_key] = attributes.get("color", parent_values["color"])
+    if "transform" in attributes and "transform" in parent_values:
+        attributes["transform"] = (
+            f"{parent_values['transform']} {attributes['transform']}"
+        )
+
+    values.update(attributes)
+    values["attributes"] = attributes
+    return values
+
+
+def iter_svg_shape_elements(svg_bytes: bytes, progress_callback=None) -> Iterator[Any]:
+    """SVG を先頭から読みながら、変換とスタイルを解決した図形を1つずつ返す。
+
+    DOM 全体を作らず、読み終えた要素はその場で木から外すので、メモリは最大の要素と
+    <use> から参照される要素の分に収まる。後ろに現れる要素を参照する <use> があると
+    読み進めながらでは展開できないため、その SVG だけは SVG.parse で DOM 全体を作る。
+    """
+    use_targets, has_forward_use = collect_svg_use_targets(svg_bytes)
+    # 進捗は読み進めたバイト数 (KB) で表す
+    total_kb = max(1, len(svg_bytes) // 1024)
+    if has_forward_use:
+        shape_count = 0
+        for element in SVG.parse(io.BytesIO(svg_bytes)).elements():
+            if isinstance(element, Shape):
+                yield element
+                shape_count += 1
+        if progress_callback is not None:
+            progress_callback(
+                stage="parse",
+                current=total_kb,
+                total=total_kb,
+                note=f"SVG_{shape_count}",
+            )
+        return
+
+    stream = io.BytesIO(svg_bytes)
+    kept: dict[str, Element] = {}
+    styles: dict[str, str] = {}
+    viewport = {"width": None, "height": None}
+    # (この要素の値, 描画しないか) を要素の入れ子に合わせて積む
+    stack: list[tuple[dict[str, Any], bool]] = [
+        ({"color": "black", "fill": "black", "stroke": "none"}, False)
+    ]
+    shape_count = 0
+
+    def enter(tag: str, elem: Element, replay_root: bool = False) -> Any | None:
+        """開始タグを処理し、描画する図形ならその要素オブジェクトを返す。"""
+        parent_values, parent_hidden = stack[-1]
+        hidden = (
+            parent_hidden
+            or str(parent_values.get("display", "")).lower() == "none"
+            or (tag in SVG_DEFINITION_TAGS and not replay_root)
+        )
+        if hidden:
+            stack.append((parent_values, True))
+            return None
+        values = resolve_svg_values(tag, elem, parent_values, styles)
+        if str(values.get("display", "")).lower() == "none":
+            stack.append((values, True))
+            return None
+
+        shape = None
+        if tag == "svg":
+            svg_element = SVG(values)
+            if viewport["width"] is None:
+                viewport["width"] = (
+                    svg_element.viewbox.width
+                    if svg_element.viewbox is not None
+                    else 1000
+                )
+            if viewport["height"] is None:
+                viewport["height"] = (
+                    svg_element.viewbox.height
+                    if svg_element.viewbox is not None
+                    else 1000
+                )
+            svg_element.render(
+                ppi=DEFAULT_PPI,
+                width=viewport["width"],
+                height=viewport["height"],
+                viewbox=svg_element.viewbox,
+            )
+            viewport["height"], viewport["width"] = (
+                svg_element.width,
+                svg_element.height,
+            )
+            if svg_element.viewbox is not None:
+                if svg_element.width == 0 or svg_element.height == 0:
+                    stack.append((values, True))
+                    return None
+                viewport_transform = svg_element.viewbox_transform
+                values["transform"] = (
+                    f"{values['transform']} {viewport_transform}"
+                    if "transform" in values
+                    else viewport_transform
+                )
+                viewport["width"] = svg_element.viewbox.width
+                viewport["height"] = svg_element.viewbox.height
+        elif tag == "use":
+            use_element = Use(values)
+            if "transform" in use_element.values:
+                values["transform"] = use_element.values["transform"]
+            for key in ("x", "y", "width", "height"):
+                values.pop(key, None)
+        elif tag == "path" or tag in SVG_SHAPE_CLASSES:
+            try:
+                if tag == "path":
+                    shape = SVGPath(values, pathd_loaded=True)
+                    shape.parse(values.get("d"))
+                else:
+                    shape = SVG_SHAPE_CLASSES[tag](values)
+            except ValueError:
+                # 途中まで読めたパスは svgelements と同じく使う
+                pass
+            if shape is not None:
+                shape.render(
+                    ppi=DEFAULT_PPI, width=viewport["width"], height=viewport["height"]
+                )
+                shape.reify()
+                if shape.is_degenerate():
+                    shape = None
+        stack.append((values, False))
+        return shape
+
+    def leave(tag: str, elem: Element) -> None:
+        """終了タグを処理する。<style> の CSS はここで読み取る。"""
+        _, hidden = stack.pop()
+        if tag != "style" or hidden:
+            return
+        css_text = re.sub(REGEX_CSS_COMMENT, "", elem.text or "")
+        for key, value in re.findall(REGEX_CSS_STYLE, css_text.strip()):
+            for selector in key.split(","):
+                selector = selector.strip()
+                if selector in styles and not styles[selector].endswith(";"):
+                    styles[selector] += ";"
+                styles[selector] = styles.get(selector, "") + value.strip()
+
+    def replay(elem: Element, replay_root: bool = False) -> Iterator[Any]:
+        """保持しておいた参照先を、<use> の位置で描画し直す。"""
+        tag = svg_local_tag(elem)
+        if tag in SVG_SKIPPED_TAGS:
+            return
+        shape = enter(tag, elem, replay_root=replay_root)
+        if shape is not None:
+            yield shape
+        for child in elem:
+            yield from replay(child)
+        if tag == "use" and not stack[-1][1]:
+            href = svg_use_href(elem)
+            if href in kept:
+                yield from replay(kept[href], replay_root=True)
+        leave(tag, elem)
+
+    parents: list[Element] = []
+    keep_depth = 0
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = svg_local_tag(elem)
+        if event == "start":
+            parents.append(elem)
+            if keep_depth > 0 or elem.get("id") in use_targets:
+                keep_depth += 1
+            if tag in SVG_SKIPPED_TAGS and tag != "style":
+                stack.append((stack[-1][0], True))
+                continue
+            shape = enter(tag, elem)
+            if shape is not None:
+                yield shape
+                shape_count += 1
+                if (
+                    progress_callback is not None
+                    and shape_count % SVG_STREAM_PROGRESS_INTERVAL == 0
+                ):
+                    progress_callback(
+                        stage="parse",
+                        current=stream.tell() // 1024,
+                        total=total_kb,
+                        note=f"SVG_{shape_count}",
+                    )
+            continue
+
+        parents.pop()
+        if tag == "use" and not stack[-1][1]:
+            href = svg_use_href(elem)
+            if href in kept:
+                yield from replay(kept[href], replay_root=True)
+        leave(tag, elem)
+        if keep_depth > 0:
+            keep_depth -= 1
+            if elem.get("id") in use_targets:
+                kept[elem.get("id")] = elem
+            if keep_depth > 0:
+                # 参照される要素の内側は、丸ごと保持するため木から外さない
+                continue
+        if parents:
+            detach_svg_element(parents[-1], elem)
+
+    if progress_callback is not None:
+        progress_callback(
+            stage="parse",
+            current=total_kb,
+            total=total_kb,
+            note=f"SVG_{shape_count}",
+        )
+
+
 def svg_bytes_to_contours(
     svg_bytes: bytes,
     auto_close_open_paths: bool,
+    settings: MeshSettings = DEFAULT_MESH_SETTINGS,
+    progress_callback=None,
 ) -> list[tuple[list[np.ndarray], dict[str, float] | None]]:
-    """SVG バイト列から要素ごとの輪郭と色を抽出する。"""
-    svg = SVG.parse(io.BytesIO(svg_bytes))
+    """SVG バイト列から要素ごとの輪郭と色を、要素を読み進めながら抽出する。"""
     groups: list[tuple[list[np.ndarray], dict[str, float] | None]] = []
-    for element in svg.elements():
+    for element in iter_svg_shape_elements(svg_bytes, progress_callback):
         try:
             path_obj = SVGPath(element)
         except Exception:
@@ -2047,6 +3715,7 @@ def svg_bytes_to_contours(
             fill_contours = path_to_contours(
                 path_obj=path_obj,
                 auto_close_open_paths=auto_close_open_paths,
+                settings=settings,
             )
             if fill_contours:
                 groups.append(
@@ -2061,6 +3730,7 @@ def svg_bytes_to_contours(
                 linecap=linecap,
                 linejoin=linejoin,
                 miter_limit=miter_limit,
+                settings=settings,
             )
             if stroke_contours:
                 groups.append(
@@ -2072,12 +3742,71 @@ def svg_bytes_to_contours(
     return groups
 
 
+def triangulate_svg_mesh_shard(
+    shard: list[tuple[int, list[np.ndarray]]],
+    settings_fields: dict[str, Any],
+    cancel_path: str,
+) -> list[tuple[int, list[np.ndarray]]]:
+    """プロセスプールのワーカーで、要素の塊を三角形分割する。
+
+    受け渡しは組み込み型と NumPy 配列だけにし、オブジェクトの組み立ては親プロセスで行う。
+    cancel_path のファイルができていたら、要素の区切りで打ち切って途中までを返す。
+    """
+    settings = MeshSettings(**settings_fields)
+    results: list[tuple[int, list[np.ndarray]]] = []
+    for index, contours in shard:
+        if os.path.exists(cancel_path):
+            break
+        results.append((index, MeshPipeline.triangulate_contours(contours, settings)))
+    return results
+
+
+def solve_svg_mesh_shard(
+    shard: list[tuple[int, list[np.ndarray]]],
+    settings_fields: dict[str, Any],
+    reconstruction_max_abs_tol: float,
+    cancel_path: str,
+) -> list[tuple[int, dict[str, np.ndarray]]]:
+    """プロセスプールのワーカーで、分割済みの要素の塊を解く。
+
+    cancel_path のファイルができていたら、要素の区切りで打ち切って途中までを返す。
+    """
+    settings = MeshSettings(**settings_fields)
+    solver = TriangleSolverOptimized(MeshConfig.SOURCE_TRIANGLE, settings)
+    results: list[tuple[int, dict[str, np.ndarray]]] = []
+    for index, triangles in shard:
+        if os.path.exists(cancel_path):
+            break
+        results.append(
+            (
+                index,
+                MeshPipeline.solve_element_triangles(
+                    triangles, solver, reconstruction_max_abs_tol
+                ),
+            )
+        )
+    return results
+
+
 def build_svg_mesh_data(
     colored_groups: list[tuple[list[np.ndarray], dict[str, float] | None]],
     target_height: float,
+    reference_groups: (
+        list[tuple[list[np.ndarray], dict[str, float] | None]] | None
+    ) = None,
 ) -> list[dict[str, Any]]:
-    """要素ごとの輪郭と色を高さ基準で正規化したメッシュ入力へ変換する。"""
-    all_contours = [c for group, _ in colored_groups for c in group]
+    """要素ごとの輪郭と色を高さ基準で正規化したメッシュ入力へ変換する。
+
+    reference_groups を渡すと、その輪郭の範囲で正規化する (隠面除去後も元の SVG と
+    同じ大きさ・位置に置くため)。
+    """
+    all_contours = [
+        c
+        for group, _ in (
+            colored_groups if reference_groups is None else reference_groups
+        )
+        for c in group
+    ]
     all_points = np.vstack(all_contours)
     min_x = float(np.min(all_points[:, 0]))
     max_x = float(np.max(all_points[:, 0]))
@@ -2106,6 +3835,41 @@ def build_svg_mesh_data(
     ]
 
 
+def simplify_svg_mesh_data(
+    svg_mesh_data: list[dict[str, Any]], tolerance: float
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """正規化済みの輪郭を、シーン単位の許容誤差で要素ごとに間引く。
+
+    簡略化で輪郭どうしが交差すると穴や重なりの判定が変わるので、そのときは
+    許容誤差を下げて試し直し、それでも交差する要素は元の輪郭のまま残す。
+    """
+    simplified_data: list[dict[str, Any]] = []
+    stats = {"tolerance": tolerance, "vertices_before": 0, "vertices_after": 0}
+    for entry in svg_mesh_data:
+        contours = entry["contours"]
+        simplified_contours = contours
+        element_tolerance = tolerance
+        for _ in range(MeshConfig.SIMPLIFY_RETRY_COUNT):
+            candidate = []
+            for contour in contours:
+                ring = MeshPipeline.simplify_ring(contour, element_tolerance)
+                # 潰れた輪郭は消すと穴の有無が変わるので元のまま残す
+                if (
+                    len(ring) < 3
+                    or abs(MeshPipeline.polygon_signed_area(ring)) <= 1e-12
+                ):
+                    ring = contour
+                candidate.append(ring)
+            if not MeshPipeline.contours_self_intersect(candidate):
+                simplified_contours = candidate
+                break
+            element_tolerance *= 0.5
+        stats["vertices_before"] += sum(len(c) for c in contours)
+        stats["vertices_after"] += sum(len(c) for c in simplified_contours)
+        simplified_data.append({**entry, "contours": simplified_contours})
+    return simplified_data, stats
+
+
 def rgba_dict_to_tuple(
     color: dict[str, float] | None, fallback: tuple[int, int, int, int]
 ) -> tuple[int, int, int, int]:
@@ -2204,12 +3968,6 @@ def build_source_preview(
     origin_x = (draw_width - span_x * scale) * 0.5
     origin_y = (draw_height - span_y * scale) * 0.5
 
-    def project(point: np.ndarray) -> tuple[float, float]:
-        """輪郭座標をソースプレビュー画像座標へ変換する。"""
-        x = origin_x + (point[0] - min_x) * scale
-        y = origin_y + (point[1] - min_y) * scale
-        return float(x), float(y)
-
     if background is None:
         background = choose_preview_background_color(
             colored_groups,
@@ -2219,47 +3977,39 @@ def build_source_preview(
         )
     default_shape_fill = (51, 65, 85, 235)
     fallback_fill = rgba_dict_to_tuple(fallback_color, default_shape_fill)
-    image = Image.new("RGBA", (draw_width, draw_height), background)
-    draw = ImageDraw.Draw(image, "RGBA")
-
-    for group_contours, svg_color in colored_groups:
-        normalized_contours = [
-            MeshPipeline.dedupe_contour_points(np.asarray(contour, dtype=np.float64))
-            for contour in group_contours
-        ]
-        normalized_contours = [
-            contour
-            for contour in normalized_contours
-            if len(contour) >= 3
-            and abs(MeshPipeline.polygon_signed_area(contour)) > 1e-9
-        ]
-        if not normalized_contours:
-            continue
-
-        _, depths = MeshPipeline.build_contour_hierarchy(normalized_contours)
-        draw_order = sorted(
-            range(len(normalized_contours)),
-            key=lambda idx: (
-                depths[idx],
-                -abs(MeshPipeline.polygon_signed_area(normalized_contours[idx])),
-            ),
-        )
-        shape_fill = (
+    shape_fills = np.array(
+        [
             rgba_dict_to_tuple(svg_color, fallback_fill)
             if use_svg_color
             else fallback_fill
-        )
-        if force_opaque_shapes:
-            shape_fill = (*shape_fill[:3], 255)
+            for _, svg_color in colored_groups
+        ],
+        dtype=np.uint8,
+    ).reshape(-1, 4)
+    if force_opaque_shapes:
+        shape_fills[:, 3] = 255
+
+    # 全要素の輪郭をまとめて射影し、後の要素ほど上に来るよう要素番号で重ね塗りする。
+    # 要素内の穴は偶奇規則で抜ける
+    projected = all_points * scale + np.array(
+        [origin_x - min_x * scale, origin_y - min_y * scale]
+    )
+    group_ids = np.repeat(
+        np.arange(len(colored_groups)),
+        [sum(len(c) for c in group) for group, _ in colored_groups],
+    )
+    top_group = MeshPipeline.scanline_top_polygon(
+        projected,
+        projected[MeshPipeline.ring_next_indices([len(c) for c in contours])],
+        group_ids,
+        (draw_height, draw_width),
+    )
+    canvas = np.empty((draw_height, draw_width, 4), dtype=np.uint8)
+    canvas[:] = background
+    covered = top_group >= 0
+    canvas[covered] = shape_fills[top_group[covered]]
 
-        for contour_index in draw_order:
-            contour = normalized_contours[contour_index]
-            projected = [project(p) for p in contour]
-            if len(projected) < 3:
-                continue
-            is_hole = depths[contour_index] % 2 == 1
-            fill = background if is_hole else shape_fill
-            draw.polygon(projected, fill=fill)
+    image = Image.fromarray(canvas, mode="RGBA")
     return image.resize((width, height), Image.Resampling.LANCZOS)
 
 
@@ -2272,6 +4022,285 @@ def make_opaque_image(
     return Image.alpha_composite(base, rgba).convert("RGB")
 
 
+class SVGContourCache:
+    """輪郭抽出結果を新しく使ったものから上限件数まで残す、スレッド間で共有する入れ物。"""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[tuple[str, int], Any] = OrderedDict()
+
+    def get(self, key: tuple[str, int]) -> Any:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple[str, int], entry: Any) -> None:
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+@st.cache_resource
+def get_svg_contour_cache() -> SVGContourCache:
+    """プロセス全体で共有する SVG 輪郭キャッシュを返す。
+
+    読み込み中の進捗表示を st.cache_resource の関数内で描くと、キャッシュ命中時に
+    もう存在しない表示枠へ再生されてしまうため、キャッシュするのは入れ物だけにする。
+    """
+    return SVGContourCache(SVG_PARSE_CACHE_ENTRIES)
+
+
+def load_svg_contours(
+    svg_hash: str, curve_smoothness: int, svg_bytes: bytes, progress_callback=None
+) -> list[tuple[list[np.ndarray], dict[str, float] | None]]:
+    """SVG の輪郭抽出結果を、内容ハッシュと曲線プリセットごとに使い回す。
+
+    輪郭抽出が使うのは曲線サンプリング設定だけなので、TriWild 設定はキーに含めない。
+    返す輪郭は共有されるため、呼び出し側で書き換えないこと。
+    """
+    cache = get_svg_contour_cache()
+    key = (svg_hash, curve_smoothness)
+    source_contours = cache.get(key)
+    if source_contours is None:
+        settings = MeshPipeline.build_mesh_settings(curve_smoothness=curve_smoothness)
+        source_contours = svg_bytes_to_contours(
+            svg_bytes=svg_bytes,
+            auto_close_open_paths=True,
+            settings=settings,
+            progress_callback=progress_callback,
+        )
+        cache.put(key, source_contours)
+    return source_contours
+
+
+@st.cache_resource(max_entries=SVG_PARSE_CACHE_ENTRIES, show_spinner=False)
+def load_source_preview(
+    svg_hash: str,
+    curve_smoothness: int,
+    use_svg_color: bool,
+    color_hex: str,
+    color_alpha: float,
+    _source_contours: list[tuple[list[np.ndarray], dict[str, float] | None]],
+) -> Image.Image | None:
+    """入力プレビューを、輪郭のキーと色の入力ごとに使い回す。"""
+    fallback_color = hex_to_color(color_hex)
+    fallback_color["a"] = color_alpha
+    return build_source_preview(
+        _source_contours, fallback_color=fallback_color, use_svg_color=use_svg_color
+    )
+
+
+def resolve_svg_shape_colors(
+    svg_colors: list[dict[str, float] | None],
+    *,
+    use_svg_color: bool,
+    fallback_color: dict[str, float],
+    color_alpha: float,
+) -> list[dict[str, float]]:
+    """要素ごとの SVG 色とフォールバック色から、各要素に塗る色を決める。"""
+    if not use_svg_color:
+        return [fallback_color] * len(svg_colors)
+    colors = []
+    for svg_color in svg_colors:
+        c = dict(svg_color or fallback_color)
+        c["a"] = color_alpha
+        colors.append(c)
+    return colors
+
+
+def pathops_min_edge_length(
+    colored_groups: list[tuple[list[np.ndarray], dict[str, float] | None]],
+) -> float:
+    """PathOps 演算後の輪郭で詰める辺の長さ (曲線の標本化間隔の目安) を返す。"""
+    edge_lengths = [
+        np.linalg.norm(np.roll(c, -1, axis=0) - c, axis=1)
+        for contours, _ in colored_groups
+        for c in contours
+    ]
+    if not edge_lengths:
+        return 0.0
+    return MeshConfig.PATHOPS_MIN_EDGE_RATIO * float(
+        np.median(np.concatenate(edge_lengths))
+    )
+
+
+def clean_pathops_contours(
+    path: Any, *, min_edge: float, min_area: float
+) -> list[np.ndarray]:
+    """PathOps の演算結果を輪郭へ戻し、短すぎる辺と小さすぎる切れ端を除く。
+
+    切り口の交点が元の頂点に近いと極端に短い辺ができ、分割が遅く細い三角形も
+    増えるので、標本化間隔に比べて短すぎる辺は詰める。
+    """
+    cleaned = [
+        MeshPipeline.dedupe_contour_points(c, eps=min_edge)
+        for c in MeshPipeline.pathops_path_to_contours(path)
+    ]
+    return [
+        c
+        for c in cleaned
+        if len(c) >= 3 and abs(MeshPipeline.polygon_signed_area(c)) > min_area
+    ]
+
+
+def contours_bounds(contours: list[np.ndarray]) -> tuple[float, float, float, float]:
+    """輪郭群を囲む (min_x, min_y, max_x, max_y) を返す。"""
+    points = np.vstack(contours)
+    min_x, min_y = np.min(points, axis=0)
+    max_x, max_y = np.max(points, axis=0)
+    return float(min_x), float(min_y), float(max_x), float(max_y)
+
+
+def bounds_overlap(
+    a: tuple[float, float, float, float], b: tuple[float, float, float, float]
+) -> bool:
+    """2つの外接矩形が重なるかを返す。"""
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def merge_same_color_svg_groups(
+    colored_groups: list[tuple[list[np.ndarray], dict[str, float] | None]],
+    *,
+    use_svg_color: bool,
+) -> tuple[list[tuple[list[np.ndarray], dict[str, float] | None]], dict[str, int]]:
+    """量子化した色が同じ要素を、PathOps の和集合で一つの領域にまとめる。
+
+    描画順に見て、間にある別色の要素と外接矩形が重ならない限り、前にある同色の
+    領域へ合流させる (重なる要素を飛び越すと前後関係が変わるため)。
+    """
+    levels = MeshConfig.MERGE_COLOR_LEVELS - 1
+    clusters: list[dict[str, Any]] = []
+    for contours, svg_color in colored_groups:
+        if use_svg_color and svg_color is not None:
+            key = tuple(round(float(svg_color[ch]) * levels) for ch in "rgba")
+        else:
+            # SVG の色を使わないときや色のない要素は、すべてフォールバック色になる
+            key = None
+        bounds = contours_bounds(contours)
+        target = None
+        for cluster in reversed(clusters):
+            if cluster["key"] == key:
+                target = cluster
+                break
+            if bounds_overlap(cluster["bounds"], bounds):
+                break
+        if target is None:
+            clusters.append(
+                {
+                    "key": key,
+                    "svg_color": svg_color,
+                    "members": [contours],
+                    "bounds": bounds,
+                }
+            )
+            continue
+        target["members"].append(contours)
+        target["bounds"] = (
+            min(target["bounds"][0], bounds[0]),
+            min(target["bounds"][1], bounds[1]),
+            max(target["bounds"][2], bounds[2]),
+            max(target["bounds"][3], bounds[3]),
+        )
+
+    min_edge = pathops_min_edge_length(colored_groups)
+    merged: list[tuple[list[np.ndarray], dict[str, float] | None]] = []
+    for cluster in clusters:
+        members = cluster["members"]
+        if len(members) == 1:
+            merged.append((members[0], cluster["svg_color"]))
+            continue
+        try:
+            # 各要素を偶奇規則から向きの揃った輪郭へ直してから足し合わせると、
+            # 非ゼロ規則での簡約1回で全体の和集合になる
+            union_path = pathops.Path()
+            for contours in members:
+                member_path = MeshPipeline.contours_to_pathops_path(contours)
+                if member_path is None:
+                    continue
+                member_path.fillType = pathops.FillType.EVEN_ODD
+                union_path.addPath(pathops.simplify(member_path))
+            union_path = pathops.simplify(union_path)
+            min_area = abs(union_path.area) * MeshConfig.PATHOPS_MIN_AREA_RATIO
+            union_contours = clean_pathops_contours(
+                union_path, min_edge=min_edge, min_area=min_area
+            )
+        except (ValueError, RuntimeError, pathops.PathOpsError):
+            union_contours = []
+        if union_contours:
+            merged.append((union_contours, cluster["svg_color"]))
+        else:
+            # 和集合が作れないときは結合せず、元の要素のまま残す
+            merged.extend((contours, cluster["svg_color"]) for contours in members)
+
+    return merged, {"elements": len(colored_groups), "regions": len(merged)}
+
+
+def cull_occluded_svg_groups(
+    colored_groups: list[tuple[list[np.ndarray], dict[str, float] | None]],
+    colors: list[dict[str, float]],
+) -> tuple[list[tuple[list[np.ndarray], dict[str, float] | None]], dict[str, int]]:
+    """前面の不透明な要素に完全に隠れる部分を、奥の要素から取り除く。
+
+    描画順の逆 (手前から奥) にたどり、不透明な要素の和集合を覆いとして積み上げ、
+    各要素から覆いを差し引く。すべて隠れた要素は結果から除外する。
+    """
+    stats = {"dropped": 0, "trimmed": 0, "vertices_before": 0, "vertices_after": 0}
+    min_edge = pathops_min_edge_length(colored_groups)
+    coverage = None
+    kept: list[tuple[list[np.ndarray], dict[str, float] | None]] = []
+    for (contours, svg_color), color in zip(
+        reversed(colored_groups), reversed(colors), strict=True
+    ):
+        stats["vertices_before"] += sum(len(c) for c in contours)
+        element_path = MeshPipeline.contours_to_pathops_path(contours)
+        if element_path is None:
+            kept.append((contours, svg_color))
+            stats["vertices_after"] += sum(len(c) for c in contours)
+            continue
+        # 三角形分割は入れ子の偶奇で穴を決めるので、PathOps 側も偶奇規則で揃える
+        element_path.fillType = pathops.FillType.EVEN_ODD
+
+        visible_contours = contours
+        if coverage is not None and bounds_overlap(
+            element_path.bounds, coverage.bounds
+        ):
+            element_area = abs(pathops.simplify(element_path).area)
+            min_area = element_area * MeshConfig.PATHOPS_MIN_AREA_RATIO
+            visible_path = pathops.op(element_path, coverage, pathops.PathOp.DIFFERENCE)
+            if abs(visible_path.area) < element_area - min_area:
+                trimmed_contours = clean_pathops_contours(
+                    visible_path, min_edge=min_edge, min_area=min_area
+                )
+                if not trimmed_contours:
+                    visible_contours = []
+                    stats["dropped"] += 1
+                elif sum(len(c) for c in trimmed_contours) <= sum(
+                    len(c) for c in contours
+                ):
+                    # 背景の四角形に前面の輪郭が穴として写るような、切り抜くと
+                    # かえって頂点が増える場合は元の形のまま残す
+                    visible_contours = trimmed_contours
+                    stats["trimmed"] += 1
+
+        if float(color.get("a", 1.0)) >= 1.0:
+            coverage = (
+                element_path
+                if coverage is None
+                else pathops.op(coverage, element_path, pathops.PathOp.UNION)
+            )
+        if visible_contours:
+            kept.append((visible_contours, svg_color))
+            stats["vertices_after"] += sum(len(c) for c in visible_contours)
+
+    kept.reverse()
+    return kept, stats
+
+
 def build_svg_scene(
     *,
     template_scene: HoneycomeSceneData,
@@ -2287,21 +4316,19 @@ def build_svg_scene(
     scene_root_name: str,
     lang: str,
     progress_callback=None,
+    settings: MeshSettings = DEFAULT_MESH_SETTINGS,
+    process_workers: int = 1,
 ) -> tuple[HoneycomeSceneData, int, int, dict[str, Any], Image.Image | None]:
     """メッシュ生成結果とメタデータをまとめてシーンを構築する。"""
     n = len(svg_mesh_data)
     labels = [f"SVG_{i + 1}" for i in range(n)]
     y_offsets = [-(n - 1 - idx) * 0.001 for idx in range(n)]
-
-    if use_svg_color:
-        colors = []
-        for entry in svg_mesh_data:
-            c = entry.get("svg_color") or fallback_color
-            c = dict(c)
-            c["a"] = color_alpha
-            colors.append(c)
-    else:
-        colors = [fallback_color] * n
+    colors = resolve_svg_shape_colors(
+        [entry.get("svg_color") for entry in svg_mesh_data],
+        use_svg_color=use_svg_color,
+        fallback_color=fallback_color,
+        color_alpha=color_alpha,
+    )
 
     (
         char_folders,
@@ -2318,12 +4345,16 @@ def build_svg_scene(
         colors,
         y_offsets=y_offsets,
         progress_callback=progress_callback,
+        settings=settings,
+        process_workers=process_workers,
     )
 
     scene_children: list[dict[str, Any]] = []
     scene_children.extend(char_folders)
 
     merged_mesh_stats = {
+        "solve_count": int(mesh_stats["solve_count"]),
+        "solver_nfev": int(mesh_stats["solver_nfev"]),
         "solve_failed_count": int(mesh_stats["solve_failed_count"]),
         "reconstruction_failed_count": int(mesh_stats["reconstruction_failed_count"]),
         "reconstruction_tol": float(mesh_stats["reconstruction_tol"]),
@@ -2350,6 +4381,333 @@ def build_svg_scene(
     return scene, plane_count, raw_plane_count, merged_mesh_stats, triangulation_preview
 
 
+def generate_svg_scene(
+    *,
+    template_scene: HoneycomeSceneData,
+    plane_template: dict[str, Any],
+    triangle_template: dict[str, Any],
+    folder_key: int,
+    folder_obj: dict[str, Any],
+    source_contours: list[tuple[list[np.ndarray], dict[str, float] | None]],
+    source_preview: Image.Image | None,
+    text_height: float,
+    use_svg_color: bool,
+    fallback_color: dict[str, float],
+    color_alpha: float,
+    generation_metadata: dict[str, Any],
+    scene_root_name: str,
+    lang: str,
+    progress_callback=None,
+    settings: MeshSettings = DEFAULT_MESH_SETTINGS,
+    merge_same_color: bool = False,
+    occlusion_culling: bool = False,
+    simplify_tolerance: float = 0.0,
+    process_workers: int = 1,
+) -> dict[str, Any]:
+    """正規化からサムネイル埋め込みまでを行う、バックグラウンドジョブ用の生成入口。"""
+    if progress_callback is not None:
+        progress_callback(stage="prepare", current=1, total=1)
+    mesh_groups = source_contours
+    prepass_stats: dict[str, Any] = {}
+    if merge_same_color:
+        mesh_groups, prepass_stats["merge_same_color"] = merge_same_color_svg_groups(
+            mesh_groups, use_svg_color=use_svg_color
+        )
+    if occlusion_culling and color_alpha >= 1.0:
+        mesh_groups, prepass_stats["occlusion_culling"] = cull_occluded_svg_groups(
+            mesh_groups,
+            resolve_svg_shape_colors(
+                [svg_color for _, svg_color in mesh_groups],
+                use_svg_color=use_svg_color,
+                fallback_color=fallback_color,
+                color_alpha=color_alpha,
+            ),
+        )
+    svg_mesh_data = build_svg_mesh_data(
+        mesh_groups,
+        target_height=text_height * SVG_SCENE_HEIGHT_FACTOR,
+        reference_groups=source_contours,
+    )
+    if simplify_tolerance > 0.0:
+        svg_mesh_data, prepass_stats["simplify_contours"] = simplify_svg_mesh_data(
+            svg_mesh_data, simplify_tolerance
+        )
+    if progress_callback is not None:
+        progress_callback(stage="normalize", current=1, total=1)
+    scene, plane_count, raw_plane_count, mesh_stats, triangulation_preview = (
+        build_svg_scene(
+            template_scene=template_scene,
+            plane_template=plane_template,
+            triangle_template=triangle_template,
+            folder_key=folder_key,
+            folder_obj=folder_obj,
+            use_svg_color=use_svg_color,
+            fallback_color=fallback_color,
+            color_alpha=color_alpha,
+            svg_mesh_data=svg_mesh_data,
+            generation_metadata=generation_metadata,
+            scene_root_name=scene_root_name,
+            lang=lang,
+            progress_callback=progress_callback,
+            settings=settings,
+            process_workers=process_workers,
+        )
+    )
+
+    if progress_callback is not None:
+        progress_callback(stage="thumbnail", current=0, total=1)
+    scene.image = build_scene_image_bytes(
+        source_contours,
+        fallback_image=source_preview
+        if source_preview is not None
+        else triangulation_preview,
+        fallback_color=fallback_color,
+        use_svg_color=use_svg_color,
+    )
+    if progress_callback is not None:
+        progress_callback(stage="thumbnail", current=1, total=1)
+        progress_callback(stage="done", current=1, total=1)
+
+    if prepass_stats:
+        # 前処理前の三角形数は、分割し直さず前処理前後の頂点数の比から見積もる
+        vertices_before = sum(
+            len(contour) for contours, _ in source_contours for contour in contours
+        )
+        vertices_after = sum(
+            len(contour) for data in svg_mesh_data for contour in data["contours"]
+        )
+        triangles_before = (
+            round(raw_plane_count * vertices_before / vertices_after)
+            if vertices_after > 0
+            else raw_plane_count
+        )
+        saved_triangles = max(0, triangles_before - raw_plane_count)
+        mesh_stats.update(prepass_stats)
+        mesh_stats["geometry_reduction"] = {
+            "triangles_before": triangles_before,
+            "triangles_after": raw_plane_count,
+            # 三角形1枚は親子2オブジェクト、減った要素はフォルダ1つ分
+            "saved_objects": 2 * saved_triangles
+            + len(source_contours)
+            - len(mesh_groups),
+        }
+
+    shape_folders = scene.objects[folder_key]["data"]["child"][1:]
+    color_slots = [
+        slot
+        for idx, shape_folder in enumerate(shape_folders)
+        for slot in collect_color_slots([shape_folder], idx)
+    ]
+    return {
+        "scene": scene,
+        "plane_count": plane_count,
+        "raw_plane_count": raw_plane_count,
+        "mesh_stats": mesh_stats,
+        "triangulation_preview": triangulation_preview,
+        "color_slots": color_slots,
+        # 隠面除去で要素が減っても塗り直しで対応が崩れないよう、フォルダ順の元色を持つ
+        "svg_colors": [svg_color for _, svg_color in mesh_groups],
+    }
+
+
+def format_curve_smoothness_label(curve_smoothness: int, lang: str) -> str:
+    """曲線のなめらかさを、情報フォルダ用の「値: 説明」形式にする。"""
+    curve_labels = get_text("curve_smoothness_presets", lang)
+    if isinstance(curve_labels, dict):
+        return f"{curve_smoothness}: {curve_labels.get(curve_smoothness, '')}".strip()
+    return str(curve_smoothness)
+
+
+def tune_curve_smoothness_for_budget(
+    svg_bytes: bytes,
+    *,
+    text_height: float,
+    edge_length_r: float,
+    triangle_budget: int,
+    progress_callback=None,
+) -> dict[str, Any]:
+    """三角形数の目安に収まる、最もなめらかな曲線プリセットを探す。
+
+    SVG の読み込み(曲線の平坦化)はプリセットごとに一度だけ行い、
+    三角形分割は代表的な図形だけで試す。選んだプリセットの輪郭もそのまま返す。
+    """
+    candidates = sorted(CURVE_SMOOTHNESS_PRESETS)
+    svg_hash = hashlib.sha256(svg_bytes).hexdigest()
+    parsed: dict[int, dict[str, Any]] = {}
+    sample_keys: list[int] | None = None
+    search_steps = math.ceil(math.log2(len(candidates) + 1))
+
+    def predict(curve_smoothness: int) -> int:
+        nonlocal sample_keys
+        if curve_smoothness in parsed:
+            return parsed[curve_smoothness]["predicted"]
+        settings = MeshPipeline.build_mesh_settings(
+            curve_smoothness=curve_smoothness, edge_length_r=edge_length_r
+        )
+        source_contours = load_svg_contours(svg_hash, curve_smoothness, svg_bytes)
+        svg_mesh_data = build_svg_mesh_data(
+            source_contours, target_height=text_height * SVG_SCENE_HEIGHT_FACTOR
+        )
+        element_keys = list(range(len(svg_mesh_data)))
+        weights = [
+            sum(len(contour) for contour in data["contours"]) for data in svg_mesh_data
+        ]
+        if sample_keys is None:
+            sample_keys = MeshPipeline.select_budget_samples(
+                element_keys, weights, MeshConfig.BUDGET_SAMPLE_SIZE
+            )
+        measured = {
+            key: len(
+                MeshPipeline.triangulate_contours(
+                    svg_mesh_data[key]["contours"], settings
+                )
+            )
+            for key in sample_keys
+        }
+        parsed[curve_smoothness] = {
+            "settings": settings,
+            "source_contours": source_contours,
+            "predicted": MeshPipeline.predict_triangle_total(
+                element_keys, weights, measured
+            ),
+        }
+        if progress_callback is not None:
+            progress_callback(
+                stage="tune",
+                current=len(parsed),
+                total=search_steps,
+                note=str(curve_smoothness),
+            )
+        return parsed[curve_smoothness]["predicted"]
+
+    # 三角形数はなめらかさに対してほぼ単調に増えるので、候補を二分探索する。
+    low = 0
+    high = len(candidates) - 1
+    best_index = None
+    while low <= high:
+        mid = (low + high) // 2
+        if predict(candidates[mid]) <= triangle_budget:
+            best_index = mid
+            low = mid + 1
+        else:
+            high = mid - 1
+
+    value = candidates[best_index if best_index is not None else 0]
+    predict(value)
+    return {
+        "value": value,
+        "predicted": parsed[value]["predicted"],
+        "fits": best_index is not None,
+        "budget": triangle_budget,
+        "probe_count": len(parsed),
+        "settings": parsed[value]["settings"],
+        "source_contours": parsed[value]["source_contours"],
+    }
+
+
+def generate_svg_scene_within_budget(
+    *,
+    svg_bytes: bytes,
+    triangle_budget: int,
+    edge_length_r: float,
+    text_height: float,
+    generation_metadata: dict[str, Any],
+    lang: str,
+    progress_callback=None,
+    **scene_kwargs: Any,
+) -> dict[str, Any]:
+    """曲線のなめらかさを三角形数の目安に合わせて決めてから、一度だけ生成する。"""
+    budget_tuning = tune_curve_smoothness_for_budget(
+        svg_bytes,
+        text_height=text_height,
+        edge_length_r=edge_length_r,
+        triangle_budget=triangle_budget,
+        progress_callback=progress_callback,
+    )
+    result = generate_svg_scene(
+        source_contours=budget_tuning.pop("source_contours"),
+        settings=budget_tuning.pop("settings"),
+        text_height=text_height,
+        generation_metadata={
+            **generation_metadata,
+            get_text("meta_curve_smoothness", lang): format_curve_smoothness_label(
+                budget_tuning["value"], lang
+            ),
+        },
+        lang=lang,
+        progress_callback=progress_callback,
+        **scene_kwargs,
+    )
+    result["mesh_stats"]["budget_tuning"] = {
+        **budget_tuning,
+        "actual": result["plane_count"],
+    }
+    return result
+
+
+def build_scene_image_bytes(
+    source_contours: list[tuple[list[np.ndarray], dict[str, float] | None]],
+    *,
+    fallback_image: Image.Image | None,
+    fallback_color: dict[str, float],
+    use_svg_color: bool,
+) -> bytes:
+    """シーンに埋め込む不透明な16:9サムネイルPNGを作る。"""
+    scene_image = build_source_preview(
+        source_contours,
+        fallback_color=fallback_color,
+        use_svg_color=use_svg_color,
+        force_opaque_shapes=True,
+        width=1280,
+        height=720,
+        padding=64,
+    )
+    if scene_image is None:
+        scene_image = fallback_image
+    if scene_image is None:
+        scene_image = Image.new("RGBA", (1280, 720), (20, 20, 20, 255))
+
+    preview_buf = io.BytesIO()
+    make_opaque_image(scene_image).save(preview_buf, format="PNG")
+    return preview_buf.getvalue()
+
+
+def restamp_svg_result(
+    result: dict[str, Any],
+    *,
+    folder_key: int,
+    folder_obj: dict[str, Any],
+    source_contours: list[tuple[list[np.ndarray], dict[str, float] | None]],
+    source_preview: Image.Image | None,
+    use_svg_color: bool,
+    fallback_color: dict[str, float],
+    color_alpha: float,
+    generation_metadata: dict[str, Any],
+    lang: str,
+) -> dict[str, Any]:
+    """解いた形状はそのままに、色・情報フォルダ・サムネイルだけを更新する。"""
+    colors = resolve_svg_shape_colors(
+        result["svg_colors"],
+        use_svg_color=use_svg_color,
+        fallback_color=fallback_color,
+        color_alpha=color_alpha,
+    )
+    restamp_color_slots(result["color_slots"], colors)
+
+    scene = result["scene"]
+    root_children = scene.objects[folder_key]["data"]["child"]
+    root_children[0] = build_metadata_folder(folder_obj, generation_metadata, lang)
+    scene.image = build_scene_image_bytes(
+        source_contours,
+        fallback_image=source_preview
+        if source_preview is not None
+        else result["triangulation_preview"],
+        fallback_color=fallback_color,
+        use_svg_color=use_svg_color,
+    )
+    return result
+
+
 def sanitize_stem(name: str) -> str:
     """出力ファイル名に使える安全なステム文字列を作る。"""
     stem = Path(name).stem
@@ -2357,6 +4715,43 @@ def sanitize_stem(name: str) -> str:
     return safe or "svg"
 
 
+def render_svg_result(result: dict[str, Any], source_name: str, lang: str) -> None:
+    """生成結果の統計・プレビュー・ダウンロードボタンを表示する。"""
+    plane_count = result["plane_count"]
+    mesh_stats = result["mesh_stats"]
+
+    st.success(get_text("success_generate", lang).format(count=plane_count))
+    MeshPipeline.render_generation_feedback(mesh_stats, lang)
+    render_scene_info(
+        plane_count=plane_count,
+        raw_plane_count=result["raw_plane_count"],
+        mesh_stats=mesh_stats,
+        lang=lang,
+    )
+    MeshPipeline.render_triangulation_section(result["triangulation_preview"], lang)
+    MeshPipeline.render_performance_section(result.get("performance"), lang)
+
+    scene = result["scene"]
+    performance = result.get("performance")
+    filename = f"digitalcraft_scene_svg_{sanitize_stem(source_name)}.png"
+    # 色替えだけの再生成を即座に返せるよう、シリアライズはダウンロード時まで遅らせる
+    st.download_button(
+        label=get_text("download_button", lang),
+        data=lambda: (
+            bytes(scene)
+            if performance is None
+            else MeshPerformanceRecorder.serialize_scene(
+                scene, performance, "svg_importer"
+            )
+        ),
+        file_name=filename,
+        mime="image/png",
+        type="primary",
+        width="stretch",
+        on_click="ignore",
+    )
+
+
 def main() -> None:
     """SVG ビルダーの Streamlit アプリ本体を実行する。"""
     st.set_page_config(
@@ -2379,6 +4774,7 @@ def main() -> None:
         st.stop()
 
     svg_bytes = uploaded_svg.getvalue()
+    svg_hash = hashlib.sha256(svg_bytes).hexdigest()
 
     use_svg_color = st.checkbox(
         get_text("use_svg_color_label", lang),
@@ -2424,161 +4820,211 @@ def main() -> None:
             step=0.05,
         )
 
-    MeshPipeline.apply_curve_smoothness_settings(int(mesh_settings["curve_smoothness"]))
+    generation_settings = MeshPipeline.build_mesh_settings(
+        curve_smoothness=int(mesh_settings["curve_smoothness"]),
+        edge_length_r=float(mesh_settings["edge_length_r"]),
+    )
+
+    # スライダー操作のたびに再解析しないよう、内容ハッシュとプリセットで使い回す
+    # 進捗表示は実際に読み込みが走ったとき (キャッシュ外れ) だけ出す
+    parse_placeholder = st.empty()
+    parse_progress: dict[str, Any] = {}
+
+    def parse_progress_callback(**kwargs: Any) -> None:
+        if "callback" not in parse_progress:
+            with parse_placeholder.container():
+                parse_progress["callback"] = MeshPipeline.build_progress_callback(lang)
+        parse_progress["callback"](**kwargs)
 
     try:
-        source_contours = svg_bytes_to_contours(
-            svg_bytes=svg_bytes,
-            auto_close_open_paths=True,
+        source_contours = load_svg_contours(
+            svg_hash,
+            int(mesh_settings["curve_smoothness"]),
+            svg_bytes,
+            parse_progress_callback,
         )
     except Exception as exc:
         st.error(get_text("parse_error", lang).format(error=exc))
         st.exception(exc)
         st.stop()
+    finally:
+        parse_placeholder.empty()
 
     flat_source_contours = [c for group, _ in source_contours for c in group]
     if not flat_source_contours:
         st.error(get_text("no_contours", lang))
         st.stop()
 
-    preview_fallback_color = hex_to_color(color_hex)
-    preview_fallback_color["a"] = color_alpha
-    source_preview = build_source_preview(
+    source_preview = load_source_preview(
+        svg_hash,
+        int(mesh_settings["curve_smoothness"]),
+        use_svg_color,
+        color_hex,
+        color_alpha,
         source_contours,
-        fallback_color=preview_fallback_color,
-        use_svg_color=use_svg_color,
     )
     if source_preview is not None:
         st.subheader(get_text("input_preview_title", lang))
         st.image(source_preview, width="stretch")
 
-    if not st.button(
-        get_text("generate_button", lang), type="primary", width="stretch"
-    ):
-        st.stop()
-
-    template_scene, plane_template, folder_key, folder_obj = load_template()
-    plane_settings = PLANE_PRESETS[plane_preset_key]
-    triangle_settings = TRIANGLE_PRESETS[plane_preset_key]
-
-    resolved_plane_template = {
-        **plane_template,
-        "data": {
-            **plane_template["data"],
-            "category": plane_settings["category"],
-            "no": plane_settings["no"],
-            "light_cancel": 1.0 - light_cancel,
-        },
-    }
+    if st.button(get_text("generate_button", lang), type="primary", width="stretch"):
+        template_scene, plane_template, folder_key, folder_obj = load_template()
+        plane_settings = PLANE_PRESETS[plane_preset_key]
+        triangle_settings = TRIANGLE_PRESETS[plane_preset_key]
+
+        resolved_plane_template = {
+            **plane_template,
+            "data": {
+                **plane_template["data"],
+                "category": plane_settings["category"],
+                "no": plane_settings["no"],
+                "light_cancel": 1.0 - light_cancel,
+            },
+        }
 
-    triangle_template = {
-        **plane_template,
-        "data": {
-            **plane_template["data"],
-            "category": triangle_settings["category"],
-            "no": triangle_settings["no"],
-            "light_cancel": 1.0 - light_cancel,
-        },
-    }
+        triangle_template = {
+            **plane_template,
+            "data": {
+                **plane_template["data"],
+                "category": triangle_settings["category"],
+                "no": triangle_settings["no"],
+                "light_cancel": 1.0 - light_cancel,
+            },
+        }
 
-    MeshPipeline.apply_triwild_settings(
-        edge_length_r=float(mesh_settings["edge_length_r"]),
-    )
+        color = hex_to_color(color_hex)
+        color["a"] = color_alpha
 
-    color = hex_to_color(color_hex)
-    color["a"] = color_alpha
+        curve_smoothness_label = format_curve_smoothness_label(
+            mesh_settings["curve_smoothness"], lang
+        )
 
-    curve_labels = get_text("curve_smoothness_presets", lang)
-    curve_smoothness_label = str(mesh_settings["curve_smoothness"])
-    if isinstance(curve_labels, dict):
-        curve_smoothness_label = (
-            f"{mesh_settings['curve_smoothness']}: "
-            f"{curve_labels.get(mesh_settings['curve_smoothness'], '')}"
-        ).strip()
-
-    generation_metadata = {
-        get_text("meta_source", lang): uploaded_svg.name,
-        get_text("meta_color", lang): color_hex,
-        get_text("meta_alpha", lang): color_alpha,
-        get_text("meta_height", lang): text_height,
-        get_text("meta_plane_preset", lang): get_text(
-            f"plane_preset_{plane_preset_key}", lang
-        ),
-        get_text("meta_light_influence", lang): light_cancel,
-        get_text("meta_curve_smoothness", lang): curve_smoothness_label,
-        get_text("meta_edge_length_r", lang): mesh_settings["edge_length_r"],
-    }
+        generation_metadata = {
+            get_text("meta_source", lang): uploaded_svg.name,
+            get_text("meta_color", lang): color_hex,
+            get_text("meta_alpha", lang): color_alpha,
+            get_text("meta_height", lang): text_height,
+            get_text("meta_plane_preset", lang): get_text(
+                f"plane_preset_{plane_preset_key}", lang
+            ),
+            get_text("meta_light_influence", lang): light_cancel,
+            get_text("meta_curve_smoothness", lang): curve_smoothness_label,
+            get_text("meta_edge_length_r", lang): mesh_settings["edge_length_r"],
+            get_text("meta_simplify_tolerance", lang): mesh_settings[
+                "simplify_tolerance"
+            ],
+        }
 
-    scene_root_name = (
-        f"{get_text('scene_root', lang)}: {sanitize_stem(uploaded_svg.name)}"
-    )
+        scene_root_name = (
+            f"{get_text('scene_root', lang)}: {sanitize_stem(uploaded_svg.name)}"
+        )
 
-    with st.spinner(get_text("generating", lang)):
-        progress_callback = MeshPipeline.build_progress_callback(lang)
-        progress_callback(stage="prepare", current=1, total=1)
-        svg_mesh_data = build_svg_mesh_data(
-            source_contours, target_height=text_height * SVG_SCENE_HEIGHT_FACTOR
+        # 色以外の入力が前回と同じなら、解いた形状を再利用して色だけ塗り替える
+        geometry_key = (
+            svg_hash,
+            uploaded_svg.name,
+            text_height,
+            plane_preset_key,
+            light_cancel,
+            int(mesh_settings["curve_smoothness"]),
+            float(mesh_settings["edge_length_r"]),
+            mesh_settings["auto_budget"],
+            mesh_settings["triangle_budget"],
+            # 隠面除去は不透明なときだけ効くので、透明度を下げたら作り直す
+            bool(mesh_settings["occlusion_culling"]) and color_alpha >= 1.0,
+            # 同色結合のまとまり方は SVG の色を使うかどうかで変わる
+            bool(mesh_settings["merge_same_color"]),
+            bool(mesh_settings["merge_same_color"]) and use_svg_color,
+            float(mesh_settings["simplify_tolerance"]),
+            lang,
         )
-        progress_callback(stage="normalize", current=1, total=1)
-        scene, plane_count, raw_plane_count, mesh_stats, triangulation_preview = (
-            build_svg_scene(
-                template_scene=template_scene,
-                plane_template=resolved_plane_template,
-                triangle_template=triangle_template,
+        cached = st.session_state.get("svg_geometry_cache")
+        if cached is not None and cached["key"] == geometry_key:
+            result = restamp_svg_result(
+                cached["result"],
                 folder_key=folder_key,
                 folder_obj=folder_obj,
+                source_contours=source_contours,
+                source_preview=source_preview,
                 use_svg_color=use_svg_color,
                 fallback_color=color,
                 color_alpha=color_alpha,
-                svg_mesh_data=svg_mesh_data,
                 generation_metadata=generation_metadata,
-                scene_root_name=scene_root_name,
                 lang=lang,
-                progress_callback=progress_callback,
             )
-        )
-        progress_callback(stage="thumbnail", current=0, total=1)
-        scene_image = build_source_preview(
-            source_contours,
-            fallback_color=color,
-            use_svg_color=use_svg_color,
-            force_opaque_shapes=True,
-            width=1280,
-            height=720,
-            padding=64,
-        )
-        if scene_image is None:
-            scene_image = (
-                source_preview if source_preview is not None else triangulation_preview
+            render_svg_result(result, uploaded_svg.name, lang)
+            st.stop()
+
+        scene_kwargs = {
+            "template_scene": template_scene,
+            "plane_template": resolved_plane_template,
+            "triangle_template": triangle_template,
+            "folder_key": folder_key,
+            "folder_obj": folder_obj,
+            "source_preview": source_preview,
+            "text_height": text_height,
+            "use_svg_color": use_svg_color,
+            "fallback_color": color,
+            "color_alpha": color_alpha,
+            "generation_metadata": generation_metadata,
+            "scene_root_name": scene_root_name,
+            "lang": lang,
+            "merge_same_color": bool(mesh_settings["merge_same_color"]),
+            "occlusion_culling": bool(mesh_settings["occlusion_culling"]),
+            "simplify_tolerance": float(mesh_settings["simplify_tolerance"]),
+            "process_workers": int(mesh_settings["process_workers"]),
+        }
+        if mesh_settings["auto_budget"]:
+            job_fn = generate_svg_scene_within_budget
+            scene_kwargs.update(
+                svg_bytes=svg_bytes,
+                triangle_budget=int(mesh_settings["triangle_budget"]),
+                edge_length_r=float(mesh_settings["edge_length_r"]),
             )
-        if scene_image is None:
-            scene_image = Image.new("RGBA", (1280, 720), (20, 20, 20, 255))
-
-        preview_buf = io.BytesIO()
-        make_opaque_image(scene_image).save(preview_buf, format="PNG")
-        scene.image = preview_buf.getvalue()
-        progress_callback(stage="thumbnail", current=1, total=1)
-        progress_callback(stage="done", current=1, total=1)
+        else:
+            job_fn = generate_svg_scene
+            scene_kwargs.update(
+                source_contours=source_contours, settings=generation_settings
+            )
+        job, rejected_reason = get_mesh_job_scheduler().submit(
+            MeshJobScheduler.current_session_id(), job_fn, **scene_kwargs
+        )
+        if rejected_reason is not None:
+            # 実行中のジョブの進捗表示は下で続ける
+            st.warning(get_text(f"job_rejected_{rejected_reason}", lang))
+        else:
+            st.session_state.svg_job = job
+            st.session_state.svg_job_name = uploaded_svg.name
+            st.session_state.svg_job_geometry_key = geometry_key
 
-    st.success(get_text("success_generate", lang).format(count=plane_count))
-    MeshPipeline.render_generation_feedback(mesh_stats, lang)
-    render_scene_info(
-        plane_count=plane_count,
-        raw_plane_count=raw_plane_count,
-        mesh_stats=mesh_stats,
-        lang=lang,
-    )
-    MeshPipeline.render_triangulation_section(triangulation_preview, lang)
+    # バックグラウンドで実行中・完了した生成ジョブ
+    job = st.session_state.get("svg_job")
+    if job is None:
+        st.stop()
+    if not job.future.done():
+        MeshPipeline.render_job_progress(lang)
+        st.stop()
 
-    filename = f"digitalcraft_scene_svg_{sanitize_stem(uploaded_svg.name)}.png"
-    st.download_button(
-        label=get_text("download_button", lang),
-        data=bytes(scene),
-        file_name=filename,
-        mime="image/png",
-        type="primary",
-        width="stretch",
+    st.session_state.svg_job = None
+    if job.cancel_event.is_set():
+        # キャンセル後に完了していても途中までの結果は使わない
+        st.info(get_text("job_cancelled", lang))
+        st.stop()
+    error = job.future.exception()
+    if error is not None:
+        st.error(get_text("generate_error", lang).format(error=error))
+        st.exception(error)
+        st.stop()
+    result = job.future.result()
+    result["performance"] = job.performance.report(result["mesh_stats"])
+    MeshPerformanceRecorder.append_log(
+        {"event": "generate", "page": "svg_importer", **result["performance"]}
     )
+    st.session_state.svg_geometry_cache = {
+        "key": st.session_state.svg_job_geometry_key,
+        "result": result,
+    }
+    render_svg_result(result, st.session_state.svg_job_name, lang)
 
 
 if __name__ == "__main__":
@@ -18,6 +18,7 @@ NAV_TITLES = {
         "dc_data_viewer": "デジクラシーンデータビューア",
         "dc_item_converter": "デジクラ基本形アイテム変換ツール",
         "dc_svg_importer": "デジクラSVGビルダー",
+        "dc_image_importer": "デジクラ画像ビルダー",
         "chara_data_viewer": "illusion/ILLGAMESキャラ情報表示",
     },
     "en": {
@@ -35,6 +36,7 @@ NAV_TITLES = {
         "dc_data_viewer": "Digital Craft Scene Data Viewer",
         "dc_item_converter": "Digital Craft Primitive Item Converter",
         "dc_svg_importer": "Digital Craft SVG Builder",
+        "dc_image_importer": "Digital Craft Image Builder",
         "chara_data_viewer": "illusion/ILLGAMES Character Data Viewer",
     },
 }
@@ -79,6 +81,9 @@ pg = st.navigation(
                 "pages/digital-craft-item-converter.py", title=t["dc_item_converter"]
             ),
             st.Page("pages/digital-craft-svg-importer.py", title=t["dc_svg_importer"]),
+            st.Page(
+                "pages/digital-craft-image-importer.py", title=t["dc_image_importer"]
+            ),
         ],
         t["sec_common"]: [
             st.Page("pages/chara-data-viewer.py", title=t["chara_data_viewer"]),